@@ -1,28 +1,36 @@
 """
 Quick Ticker Addition Utility
-Usage: python add_ticker.py TICKER [TICKER2 TICKER3 ...]
+Usage: python add_ticker.py [--incremental] TICKER [TICKER2 TICKER3 ...]
 Example: python add_ticker.py BTC-USD ETH-USD DOGE-USD
+
+--incremental only downloads what is missing: bars after the last stored
+date and holes found by the date-gap check.
 """
 
 import sys
-import yfinance as yf
 from app.database import init_db, insert_stock_data
+from app.services.data_providers import get_registry
+from app.services.incremental_download import download_missing
 from datetime import datetime, timedelta
 
-if len(sys.argv) < 2:
+INCREMENTAL = "--incremental" in sys.argv[1:]
+args = [arg for arg in sys.argv[1:] if arg != "--incremental"]
+
+if not args:
     print("[ERROR] No ticker provided")
-    print("\nUsage: python add_ticker.py TICKER [TICKER2 TICKER3 ...]")
+    print("\nUsage: python add_ticker.py [--incremental] TICKER [TICKER2 TICKER3 ...]")
     print("\nExamples:")
     print("   python add_ticker.py BTC-USD")
     print("   python add_ticker.py AAPL GOOGL MSFT")
     print("   python add_ticker.py GC=F SI=F (Gold and Silver futures)")
+    print("   python add_ticker.py --incremental AAPL GOOGL (only missing dates)")
     sys.exit(1)
 
 # Initialize database
 init_db()
 
 # Get tickers from command line
-tickers = sys.argv[1:]
+tickers = args
 
 # Download configuration
 YEARS_OF_DATA = 15
@@ -32,25 +40,38 @@ start_date = end_date - timedelta(days=365 * YEARS_OF_DATA)
 print("=" * 60)
 print(f"Adding {len(tickers)} ticker(s) to database")
 print(f"Date Range: {start_date.date()} to {end_date.date()}")
+if INCREMENTAL:
+    print("Mode: incremental (missing dates only)")
 print("=" * 60)
 
 success = []
 failed = []
 
-for ticker in tickers:
-    ticker = ticker.upper()
-    print(f"\n[DOWNLOAD] {ticker}...", end=" ")
+# Download all tickers in batched requests
+print(f"\n[DOWNLOAD] {', '.join(ticker.upper() for ticker in tickers)}...")
+if INCREMENTAL:
+    frames, errors, _ = download_missing(tickers, start_date, end_date)
+else:
+    frames, errors = get_registry().fetch_history(tickers, start=start_date, end=end_date)
+
+for ticker in dict.fromkeys(ticker.upper() for ticker in tickers):
+    print(f"\n[INSERT] {ticker}...", end=" ")
+
+    if ticker in errors:
+        print(f"[FAIL] {errors[ticker]}")
+        failed.append((ticker, errors[ticker]))
+        continue
+
+    if ticker not in frames:
+        print("[OK] Already up to date")
+        success.append(ticker)
+        continue
 
     try:
-        df = yf.download(ticker, start=start_date, end=end_date, progress=False)
-
-        if df.empty:
-            print(f"[FAIL] No data available")
-            failed.append((ticker, "No data available"))
-        else:
-            insert_stock_data(ticker, df)
-            print(f"[OK] Added {len(df)} records")
-            success.append(ticker)
+        df = frames[ticker]
+        insert_stock_data(ticker, df)
+        print(f"[OK] Added {len(df)} records")
+        success.append(ticker)
 
     except Exception as e:
         print(f"[ERROR] {str(e)}")
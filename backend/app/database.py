@@ -1,6 +1,11 @@
 import sqlite3
 import os
+import json
 from datetime import datetime
+from functools import lru_cache
+
+from app.services.data_quality import RECORD_CATEGORIES, RULES_VERSION, find_session_gaps, validate_data
+from app.services.market_calendar import classify_symbol
 
 DB_FILE = "stock_data.db"
 
@@ -23,6 +28,63 @@ def init_db():
             UNIQUE(ticker, date)
         )
     ''')
+
+    # Record-level data quality issues, written when bars are stored.
+    # Messages keep an {record_index} placeholder filled in per request.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_quality_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            category TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            message TEXT NOT NULL,
+            details TEXT NOT NULL,
+            validated_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_data_quality_results_ticker_date
+        ON data_quality_results (ticker, date)
+    ''')
+
+    # Tickers whose whole stored history has been validated, and by which rules version
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_quality_coverage (
+            ticker TEXT PRIMARY KEY,
+            validated_at TEXT NOT NULL,
+            rules_version INTEGER NOT NULL DEFAULT 1
+        )
+    ''')
+
+    # Per-ticker results of the last universe data quality scan
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_quality_summary (
+            ticker TEXT PRIMARY KEY,
+            rows INTEGER NOT NULL,
+            first_date TEXT,
+            last_date TEXT,
+            is_valid INTEGER NOT NULL,
+            errors INTEGER NOT NULL,
+            warnings INTEGER NOT NULL,
+            info INTEGER NOT NULL,
+            categories TEXT NOT NULL,
+            worst_categories TEXT NOT NULL,
+            scanned_at TEXT NOT NULL,
+            scan_ms REAL
+        )
+    ''')
+
+    # Gap ranges an incremental download already asked the provider for
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS backfill_attempts (
+            ticker TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            attempted_at TEXT NOT NULL,
+            PRIMARY KEY (ticker, start_date, end_date)
+        )
+    ''')
     
     conn.commit()
     conn.close()
@@ -64,10 +126,85 @@ def get_stock_data(ticker: str, days: int = 30):
         for row in rows
     ]
 
+def get_stock_history(ticker: str):
+    """Get every stored bar of a ticker in ascending date order"""
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT date, open, high, low, close, volume
+        FROM stock_prices
+        WHERE ticker = ?
+        ORDER BY date
+    ''', (ticker,))
+    columns = ["date", "open", "high", "low", "close", "volume"]
+    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+def get_date_ranges():
+    """Get the first and last stored date for every ticker"""
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT ticker, MIN(date), MAX(date)
+        FROM stock_prices
+        GROUP BY ticker
+    ''')
+    ranges = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    conn.close()
+    return ranges
+
+def get_backfill_attempts(since: str):
+    """
+    Get gap ranges requested at or after since
+
+    Returns:
+        Set of (ticker, start_date, end_date)
+    """
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT ticker, start_date, end_date FROM backfill_attempts WHERE attempted_at >= ?",
+        (since,)
+    )
+    attempts = {tuple(row) for row in cursor.fetchall()}
+    conn.close()
+    return attempts
+
+def record_backfill_attempts(attempts):
+    """
+    Remember requested gap ranges so later incremental runs skip them
+
+    Args:
+        attempts: Iterable of (ticker, start_date, end_date)
+    """
+    attempted_at = datetime.now().isoformat()
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT OR REPLACE INTO backfill_attempts (ticker, start_date, end_date, attempted_at) VALUES (?, ?, ?, ?)",
+        [(ticker, start, end, attempted_at) for ticker, start, end in attempts]
+    )
+    conn.commit()
+    conn.close()
+
+def get_stock_dates(ticker: str):
+    """Get all stored dates for a ticker in ascending order"""
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT date FROM stock_prices WHERE ticker = ? ORDER BY date",
+        (ticker,)
+    )
+    dates = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return dates
+
 def insert_stock_data(ticker: str, df):
     """Insert stock data from pandas DataFrame"""
     conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
+    new_dates = []
     
     for date, row in df.iterrows():
         try:
@@ -84,10 +221,323 @@ def insert_stock_data(ticker: str, df):
                 float(row['Close'].iloc[0]) if hasattr(row['Close'], 'iloc') else float(row['Close']),
                 int(row['Volume'].iloc[0]) if hasattr(row['Volume'], 'iloc') else int(row['Volume'])
             ))
+            new_dates.append(str(date.date()))
         except sqlite3.IntegrityError:
             # Skip duplicates
             pass
+
+    if new_dates:
+        _revalidate_quality(conn, ticker, min(new_dates), max(new_dates))
     
     conn.commit()
     conn.close()
     print(f"[OK] Inserted {len(df)} records for {ticker}")
+
+def insert_stock_frames(frames):
+    """
+    Insert several tickers' DataFrames in one transaction
+
+    Rows without a close price are skipped and duplicates are ignored.
+
+    Args:
+        frames: Dict of ticker -> DataFrame with Open/High/Low/Close/Volume
+
+    Returns:
+        Dict of ticker -> number of new rows
+    """
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    inserted = {}
+
+    for ticker, df in frames.items():
+        df = df[df['Close'].notna()]
+        rows = zip(
+            [ticker] * len(df),
+            [str(date.date()) for date in df.index],
+            df['Open'].astype(float),
+            df['High'].astype(float),
+            df['Low'].astype(float),
+            df['Close'].astype(float),
+            df['Volume'].fillna(0).astype('int64').tolist()
+        )
+        before = conn.total_changes
+        cursor.executemany('''
+            INSERT OR IGNORE INTO stock_prices
+            (ticker, date, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        inserted[ticker] = conn.total_changes - before
+
+        if inserted[ticker]:
+            _revalidate_quality(conn, ticker, str(df.index.min().date()), str(df.index.max().date()))
+
+    conn.commit()
+    conn.close()
+    return inserted
+
+@lru_cache(maxsize=4096)
+def _lookup_asset_category(ticker: str) -> str:
+    """Cached asset category lookup; raises on database errors so they are not cached"""
+    if os.getenv("DATABASE_URL"):
+        from app.database_pg import get_asset_by_symbol
+        asset = get_asset_by_symbol(ticker)
+        if asset:
+            return asset["category"]
+    return classify_symbol(ticker)
+
+def get_asset_category(ticker: str) -> str:
+    """
+    Get a ticker's asset category (selects its trading calendar)
+
+    Read from the PostgreSQL assets table when DATABASE_URL is set,
+    otherwise guessed from the symbol. If the lookup fails the guess is
+    used for this call only and the lookup is retried next time.
+    """
+    try:
+        return _lookup_asset_category(ticker)
+    except Exception as e:
+        print(f"[WARN] Could not read asset category for {ticker}: {e}")
+        return classify_symbol(ticker)
+
+def _revalidate_quality(conn, ticker: str, first_date: str = None, last_date: str = None):
+    """
+    Recompute stored record-level quality issues after bars were written
+
+    Only bars from first_date to last_date are revalidated, together with the
+    stored neighbour on each side that the gap check needs. A ticker that has
+    never been validated gets its whole history validated instead.
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT 1 FROM data_quality_coverage WHERE ticker = ? AND rules_version = ?",
+        (ticker, RULES_VERSION)
+    )
+    lower = upper = None
+    if first_date and last_date and cursor.fetchone():
+        cursor.execute(
+            "SELECT MAX(date) FROM stock_prices WHERE ticker = ? AND date < ?",
+            (ticker, first_date)
+        )
+        lower = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT MIN(date) FROM stock_prices WHERE ticker = ? AND date > ?",
+            (ticker, last_date)
+        )
+        upper = cursor.fetchone()[0] or last_date
+
+    cursor.execute('''
+        SELECT date, open, high, low, close, volume
+        FROM stock_prices
+        WHERE ticker = ? AND date >= ? AND date <= ?
+        ORDER BY date
+    ''', (ticker, lower or "", upper or "9999-12-31"))
+    columns = ["date", "open", "high", "low", "close", "volume"]
+    records = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    # The lower neighbour keeps its own results, only its gap to the new bars is recomputed
+    cursor.execute(
+        "DELETE FROM data_quality_results WHERE ticker = ? AND date > ? AND date <= ?",
+        (ticker, lower or "", upper or "9999-12-31")
+    )
+
+    validated_at = datetime.now().isoformat()
+    results = []
+    if records:
+        row_categories = [category for category in RECORD_CATEGORIES if category != "date_gaps"]
+        _, issues = validate_data(records, ticker, categories=row_categories)
+        for issue in issues:
+            details = dict(issue["details"])
+            idx = details.pop("record_index")
+            date = records[idx]["date"]
+            if lower and date <= lower:
+                continue
+            results.append((
+                ticker, date, issue["category"], issue["severity"],
+                issue["message"].replace(f"at index {idx}", "at index {record_index}"),
+                json.dumps(details), validated_at
+            ))
+        dates = [record["date"] for record in records]
+        for gap in find_session_gaps(dates, ticker, get_asset_category(ticker)):
+            results.append((
+                ticker, gap["to"], "date_gaps", "warning",
+                f"{gap['missing_sessions']} missing sessions before {gap['to']}",
+                json.dumps(gap), validated_at
+            ))
+
+    cursor.executemany('''
+        INSERT INTO data_quality_results
+        (ticker, date, category, severity, message, details, validated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', results)
+    cursor.execute(
+        "INSERT OR REPLACE INTO data_quality_coverage (ticker, validated_at, rules_version) VALUES (?, ?, ?)",
+        (ticker, validated_at, RULES_VERSION)
+    )
+
+def revalidate_quality(ticker: str, first_date: str = None, last_date: str = None):
+    """
+    Recompute stored quality issues for a ticker (whole history by default)
+
+    Args:
+        ticker: Ticker symbol
+        first_date: First changed date (YYYY-MM-DD)
+        last_date: Last changed date (YYYY-MM-DD)
+    """
+    conn = sqlite3.connect(DB_FILE)
+    _revalidate_quality(conn, ticker, first_date, last_date)
+    conn.commit()
+    conn.close()
+
+def get_quality_results(ticker: str, start_date: str, end_date: str):
+    """
+    Get stored record-level quality issues of a ticker between two dates
+
+    Returns:
+        List of issue dicts (date, category, severity, message, details,
+        validated_at) in the order they were found, or None if the ticker
+        has not been validated yet
+    """
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT 1 FROM data_quality_coverage WHERE ticker = ? AND rules_version = ?",
+        (ticker, RULES_VERSION)
+    )
+    if cursor.fetchone() is None:
+        conn.close()
+        return None
+
+    cursor.execute('''
+        SELECT date, category, severity, message, details, validated_at
+        FROM data_quality_results
+        WHERE ticker = ? AND date BETWEEN ? AND ?
+        ORDER BY id
+    ''', (ticker, start_date, end_date))
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [
+        {
+            "date": row[0],
+            "category": row[1],
+            "severity": row[2],
+            "message": row[3],
+            "details": json.loads(row[4]),
+            "validated_at": row[5]
+        }
+        for row in rows
+    ]
+
+# Sortable columns of the data quality summary
+SUMMARY_SORT_COLUMNS = ["ticker", "errors", "warnings", "info", "rows", "last_date", "scanned_at"]
+
+def save_quality_summaries(summaries):
+    """
+    Store per-ticker data quality scan summaries, replacing earlier scans
+
+    Args:
+        summaries: List of dicts as built by quality_scan.summarize
+    """
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    cursor.executemany('''
+        INSERT OR REPLACE INTO data_quality_summary
+        (ticker, rows, first_date, last_date, is_valid, errors, warnings, info,
+         categories, worst_categories, scanned_at, scan_ms)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (
+            summary["ticker"], summary["rows"], summary["first_date"], summary["last_date"],
+            int(summary["is_valid"]), summary["errors"], summary["warnings"], summary["info"],
+            json.dumps(summary["categories"]), json.dumps(summary["worst_categories"]),
+            summary["scanned_at"], summary["scan_ms"]
+        )
+        for summary in summaries
+    ])
+    conn.commit()
+    conn.close()
+
+def get_quality_summaries(
+    valid: bool = None,
+    category: str = None,
+    min_errors: int = 0,
+    sort: str = "errors",
+    descending: bool = True,
+    limit: int = 100,
+    offset: int = 0
+):
+    """
+    Get data quality scan summaries with filtering and sorting
+
+    Args:
+        valid: Only valid (True) or invalid (False) tickers
+        category: Only tickers with at least one issue of this category
+        min_errors: Only tickers with at least this many errors
+        sort: Column from SUMMARY_SORT_COLUMNS
+        descending: Sort direction
+        limit: Max summaries
+        offset: Summaries to skip
+
+    Returns:
+        Tuple of (summaries, totals over all matching tickers)
+    """
+    if sort not in SUMMARY_SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by {sort}, use one of {SUMMARY_SORT_COLUMNS}")
+
+    conditions, params = ["errors >= ?"], [min_errors]
+    if valid is not None:
+        conditions.append("is_valid = ?")
+        params.append(int(valid))
+    if category:
+        conditions.append("EXISTS (SELECT 1 FROM json_each(categories) WHERE json_each.key = ?)")
+        params.append(category)
+    where = " AND ".join(conditions)
+
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT COUNT(*), COALESCE(SUM(1 - is_valid), 0), COALESCE(SUM(errors), 0),
+               COALESCE(SUM(warnings), 0), COALESCE(SUM(info), 0), MIN(scanned_at)
+        FROM data_quality_summary
+        WHERE {where}
+    ''', params)
+    row = cursor.fetchone()
+    totals = {
+        "tickers": row[0],
+        "invalid": row[1],
+        "errors": row[2],
+        "warnings": row[3],
+        "info": row[4],
+        "oldest_scan": row[5]
+    }
+
+    direction = "DESC" if descending else "ASC"
+    cursor.execute(f'''
+        SELECT ticker, rows, first_date, last_date, is_valid, errors, warnings, info,
+               categories, worst_categories, scanned_at, scan_ms
+        FROM data_quality_summary
+        WHERE {where}
+        ORDER BY {sort} {direction}, ticker
+        LIMIT ? OFFSET ?
+    ''', params + [limit, offset])
+    rows = cursor.fetchall()
+    conn.close()
+
+    summaries = [
+        {
+            "ticker": row[0],
+            "rows": row[1],
+            "first_date": row[2],
+            "last_date": row[3],
+            "is_valid": bool(row[4]),
+            "errors": row[5],
+            "warnings": row[6],
+            "info": row[7],
+            "categories": json.loads(row[8]),
+            "worst_categories": json.loads(row[9]),
+            "scanned_at": row[10],
+            "scan_ms": row[11]
+        }
+        for row in rows
+    ]
+    return summaries, totals
@@ -331,6 +331,91 @@ def create_asset(
             return result['id']
 
 
+def get_existing_symbols(symbols: List[str]) -> List[str]:
+    """Get which of the given symbols already exist in assets"""
+    if not symbols:
+        return []
+    query = "SELECT symbol FROM assets WHERE symbol = ANY(%s)"
+    results = db.execute_query(query, ([symbol.upper() for symbol in symbols],))
+    return [row['symbol'] for row in results]
+
+
+def create_assets_batch(assets: List[Dict]) -> Dict[str, int]:
+    """
+    Create or update many assets in one statement
+
+    Args:
+        assets: List of dicts with symbol, name, category and the optional
+            create_asset metadata fields (description, sector, ..., extra)
+
+    Returns:
+        Dict of symbol -> asset ID
+    """
+    if not assets:
+        return {}
+
+    import json
+
+    rows = [
+        (
+            asset['symbol'].upper(),
+            asset['name'],
+            asset['category'],
+            asset.get('description'),
+            asset.get('sector'),
+            asset.get('industry'),
+            asset.get('market_cap'),
+            asset.get('logo_url'),
+            asset.get('website'),
+            asset.get('exchange'),
+            asset.get('currency', 'USD'),
+            json.dumps(asset.get('extra', {}))
+        )
+        for asset in assets
+    ]
+
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            results = execute_values(
+                cursor,
+                """
+                INSERT INTO assets (
+                    symbol, name, category, status,
+                    description, sector, industry, market_cap,
+                    logo_url, website, exchange, currency, metadata
+                )
+                SELECT
+                    v.symbol, v.name, v.category::asset_category, 'active',
+                    v.description, v.sector, v.industry, v.market_cap::bigint,
+                    v.logo_url, v.website, v.exchange, v.currency, v.metadata::jsonb
+                FROM (VALUES %s) AS v(
+                    symbol, name, category,
+                    description, sector, industry, market_cap,
+                    logo_url, website, exchange, currency, metadata
+                )
+                ON CONFLICT (symbol) DO UPDATE
+                SET
+                    name = EXCLUDED.name,
+                    category = EXCLUDED.category,
+                    description = EXCLUDED.description,
+                    sector = EXCLUDED.sector,
+                    industry = EXCLUDED.industry,
+                    market_cap = EXCLUDED.market_cap,
+                    logo_url = EXCLUDED.logo_url,
+                    website = EXCLUDED.website,
+                    exchange = EXCLUDED.exchange,
+                    currency = EXCLUDED.currency,
+                    metadata = EXCLUDED.metadata,
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING symbol, id
+                """,
+                rows,
+                page_size=1000,
+                fetch=True
+            )
+            return {row['symbol']: row['id'] for row in results}
+
+
 def get_watchlist(watchlist_id: int = 1) -> List[Dict]:
     """Get assets in a watchlist with current prices"""
     query = """
@@ -367,6 +452,19 @@ def get_watchlist(watchlist_id: int = 1) -> List[Dict]:
     return list(results)
 
 
+def get_watchlist_symbols() -> List[Dict]:
+    """Get the distinct symbols (with category) found in any watchlist"""
+    query = """
+        SELECT DISTINCT a.symbol, a.category::text AS category
+        FROM watchlist_items wi
+        JOIN assets a ON wi.asset_id = a.id
+        WHERE a.status = 'active'
+        ORDER BY a.symbol
+    """
+    results = db.execute_query(query)
+    return list(results)
+
+
 def add_to_watchlist(
     asset_id: int,
     watchlist_id: int = 1,
@@ -393,3 +491,80 @@ def remove_from_watchlist(asset_id: int, watchlist_id: int = 1) -> bool:
     """
     rowcount = db.execute_update(query, (watchlist_id, asset_id))
     return rowcount > 0
+
+
+def record_fetch_results(
+    results: List[Tuple[str, Optional[datetime], int, Optional[str]]],
+    source: str = "yfinance",
+    page_size: int = 1000
+) -> int:
+    """
+    Persist per-asset fetch outcomes to asset_data_sources in one transaction
+
+    Args:
+        results: List of (symbol, last successful fetch or None, consecutive error count,
+            data_sources.name that served the fetch or None)
+        source: data_sources.name for results without one
+        page_size: Rows per INSERT statement
+
+    Returns:
+        Number of asset_data_sources rows written
+    """
+    if not results:
+        return 0
+
+    rows = [
+        (symbol.upper(), result_source or source, last_success, errors)
+        for symbol, last_success, errors, result_source in results
+    ]
+    written = 0
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            for start in range(0, len(rows), page_size):
+                # One execute per page so rowcount covers every page
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO asset_data_sources
+                        (asset_id, data_source_id, last_successful_fetch, error_count)
+                    SELECT a.id, ds.id, v.last_success::timestamp, v.error_count
+                    FROM (VALUES %s) AS v(symbol, source, last_success, error_count)
+                    JOIN assets a ON a.symbol = v.symbol
+                    JOIN data_sources ds ON ds.name = v.source
+                    ON CONFLICT (asset_id, data_source_id) DO UPDATE
+                    SET
+                        error_count = EXCLUDED.error_count,
+                        last_successful_fetch = COALESCE(
+                            EXCLUDED.last_successful_fetch,
+                            asset_data_sources.last_successful_fetch
+                        )
+                    """,
+                    rows[start:start + page_size],
+                    page_size=page_size
+                )
+                written += cursor.rowcount
+    return written
+
+
+def get_fetch_error_counts(source: str = "yfinance") -> Dict[str, int]:
+    """Get the consecutive fetch error count per symbol for a data source"""
+    query = """
+        SELECT a.symbol, ads.error_count
+        FROM asset_data_sources ads
+        JOIN assets a ON ads.asset_id = a.id
+        JOIN data_sources ds ON ads.data_source_id = ds.id
+        WHERE ds.name = %s AND ads.error_count > 0
+    """
+    results = db.execute_query(query, (source,))
+    return {row['symbol']: row['error_count'] for row in results}
+
+
+def get_data_sources() -> List[Dict]:
+    """Get all market data sources with their priority and rate limit"""
+    query = """
+        SELECT name, priority, rate_limit_per_hour, is_active
+        FROM data_sources
+        ORDER BY priority DESC, name
+    """
+    results = db.execute_query(query)
+    return list(results)
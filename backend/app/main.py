@@ -1,19 +1,22 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from contextlib import asynccontextmanager
 import logging
 import asyncio
 import json
-from app.database import init_db, get_all_stocks, get_stock_data
+from app.database import init_db, get_all_stocks, get_stock_data, get_stock_history, get_quality_summaries
 # Import PostgreSQL functions when DATABASE_URL is set
 import os
 if os.getenv("DATABASE_URL"):
     from app.database_pg import (
         search_assets, get_asset_by_symbol, get_assets_by_category,
-        get_watchlist, add_to_watchlist, remove_from_watchlist
+        get_watchlist, add_to_watchlist, remove_from_watchlist,
+        get_watchlist_symbols
     )
-from app.services.data_quality import validate_data
+from app.services.data_quality import aggregate_issues
+from app.services.indicators import compute_indicators, parse_indicator_set, to_columns, to_json_columns
+from app.services.quality_results import validate_window
 from app.services.broadcaster import broadcaster
 from app.services.market_updater import market_updater
 
@@ -21,6 +24,20 @@ from app.services.market_updater import market_updater
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def refresh_watchlist_demand():
+    """Feed the tickers found in watchlists to the market updater (requires PostgreSQL)"""
+    if not os.getenv("DATABASE_URL"):
+        return
+
+    try:
+        rows = get_watchlist_symbols()
+        market_updater.set_watchlist_tickers(
+            [row['symbol'] for row in rows],
+            {row['symbol']: row['category'] for row in rows}
+        )
+    except Exception as e:
+        logger.error(f"Failed to load watchlist tickers: {e}")
+
 # Lifespan context manager for startup/shutdown events
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -29,9 +46,10 @@ async def lifespan(app: FastAPI):
     logger.info("Starting up DEPO backend...")
     init_db()
 
-    # Start market updater in background
-    tickers = get_all_stocks()
-    market_updater.set_tickers(tickers)
+    # Start market updater in background. It polls pinned tickers
+    # (MARKET_UPDATER_PINNED), watchlist tickers and tickers with live
+    # WebSocket subscribers.
+    refresh_watchlist_demand()
     asyncio.create_task(market_updater.start())
 
     yield
@@ -72,11 +90,11 @@ async def list_stocks():
 
 # Get stock data for a specific ticker
 @app.get("/api/stocks/{ticker}")
-async def get_ticker_data(ticker: str, days: int = 30):
+async def get_ticker_data(ticker: str, days: int = 30, aggregate: bool = True):
     data = get_stock_data(ticker.upper(), days)
 
-    # Run data quality validation
-    is_valid, issues = validate_data(data, ticker.upper())
+    # Stored record-level issues plus the window rules (anomalies, freshness)
+    is_valid, issues = validate_window(data, ticker.upper())
 
     # Build metadata
     metadata = {
@@ -95,7 +113,8 @@ async def get_ticker_data(ticker: str, days: int = 30):
         "errors": len([i for i in issues if i['severity'] == 'error']),
         "warnings": len([i for i in issues if i['severity'] == 'warning']),
         "info": len([i for i in issues if i['severity'] == 'info']),
-        "issues": issues
+        # Runs of consecutive bad records are merged, capped per category
+        "issues": aggregate_issues(issues) if aggregate else issues
     }
 
     return {
@@ -107,6 +126,47 @@ async def get_ticker_data(ticker: str, days: int = 30):
         "metadata": metadata
     }
 
+# Technical indicators for a ticker
+@app.get("/api/stocks/{ticker}/indicators")
+async def get_ticker_indicators(ticker: str, indicator_set: str = Query(None, alias="set"), days: int = None):
+    """
+    Get technical indicators as columnar arrays
+
+    Indicators are computed over the full stored history so the warm-up of
+    long windows is correct, then the last `days` rows are returned.
+
+    Query params:
+        set: Comma-separated indicators (default: all), e.g. rsi,macd,bollinger.
+             Available: sma20, sma50, sma200, ema20, rsi, macd, bollinger,
+             stochastic, atr, adx, cci, obv, vwap, sar, supertrend, heikin_ashi
+        days: Rows to return (default: full history)
+
+    Example: GET /api/stocks/AAPL/indicators?set=rsi,macd&days=365
+    """
+    try:
+        names = parse_indicator_set(indicator_set)
+    except ValueError as e:
+        return {"status": "error", "message": str(e), "columns": {}}
+
+    try:
+        start_time = datetime.now()
+        columns = to_columns(get_stock_history(ticker.upper()))
+        indicators = compute_indicators(columns, names)
+        tail = None if days is None else max(days, 0)
+        duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+
+        return {
+            "status": "ok",
+            "ticker": ticker.upper(),
+            "indicators": names,
+            "count": len(columns["date"]) if tail is None else min(tail, len(columns["date"])),
+            "columns": to_json_columns({**columns, **indicators}, tail),
+            "duration_ms": round(duration_ms, 2)
+        }
+    except Exception as e:
+        logger.error(f"Indicator error for {ticker}: {e}")
+        return {"status": "error", "message": str(e), "columns": {}}
+
 # Get latest price for a ticker
 @app.get("/api/stocks/{ticker}/latest")
 async def get_latest_price(ticker: str):
@@ -128,6 +188,66 @@ async def get_latest_price(ticker: str):
         "message": "No data found for ticker"
     }
 
+# Universe data quality summaries (filled by scan_quality.py)
+@app.get("/api/data-quality/summary")
+async def data_quality_summary(
+    status: str = None,
+    category: str = None,
+    min_errors: int = 0,
+    sort: str = "errors",
+    order: str = "desc",
+    limit: int = 100,
+    offset: int = 0
+):
+    """
+    Get per-ticker data quality summaries from the last universe scan
+
+    Query params:
+        status: valid or invalid
+        category: Only tickers with issues of this category (e.g. date_gaps)
+        min_errors: Only tickers with at least this many errors
+        sort: ticker, errors, warnings, info, rows, last_date or scanned_at (default errors)
+        order: asc or desc (default desc)
+        limit: Max results (default 100, max 1000)
+        offset: Results to skip
+
+    Example: GET /api/data-quality/summary?status=invalid&category=invalid_ohlc&sort=errors
+    """
+    if status not in (None, "valid", "invalid"):
+        return {
+            "status": "error",
+            "message": "Query parameter 'status' must be 'valid' or 'invalid'",
+            "summaries": []
+        }
+
+    try:
+        start_time = datetime.now()
+        summaries, totals = get_quality_summaries(
+            valid=None if status is None else status == "valid",
+            category=category,
+            min_errors=min_errors,
+            sort=sort,
+            descending=order.lower() != "asc",
+            limit=min(limit, 1000),
+            offset=offset
+        )
+        duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+
+        return {
+            "status": "ok",
+            "summaries": summaries,
+            "count": len(summaries),
+            "totals": totals,
+            "duration_ms": round(duration_ms, 2)
+        }
+    except Exception as e:
+        logger.error(f"Data quality summary error: {e}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "summaries": []
+        }
+
 # Asset search endpoint (requires PostgreSQL)
 @app.get("/api/assets/search")
 async def search_assets_endpoint(q: str, category: str = None, limit: int = 50):
@@ -314,6 +434,7 @@ async def add_to_watchlist_endpoint(asset_id: int, watchlist_id: int = 1, notes:
         success = add_to_watchlist(asset_id, watchlist_id, notes)
 
         if success:
+            refresh_watchlist_demand()
             return {
                 "status": "ok",
                 "message": "Asset added to watchlist",
@@ -356,6 +477,7 @@ async def remove_from_watchlist_endpoint(asset_id: int, watchlist_id: int = 1):
         success = remove_from_watchlist(asset_id, watchlist_id)
 
         if success:
+            refresh_watchlist_demand()
             return {
                 "status": "ok",
                 "message": "Asset removed from watchlist",
@@ -394,6 +516,9 @@ async def websocket_endpoint(websocket: WebSocket, ticker: str):
     channel = f"market:{ticker}"
     pubsub = None
 
+    # Poll this ticker while at least one client is subscribed
+    market_updater.add_subscriber(ticker)
+
     try:
         # Connect to Redis and subscribe
         await broadcaster.connect()
@@ -464,18 +589,19 @@ async def websocket_endpoint(websocket: WebSocket, ticker: str):
     finally:
         # Cleanup
         if pubsub:
-            await broadcaster.unsubscribe(channel)
+            await broadcaster.unsubscribe(channel, pubsub)
         if 'redis_task' in locals():
             redis_task.cancel()
+        market_updater.remove_subscriber(ticker)
         logger.info(f"WebSocket connection closed for {ticker}")
 
 
 # WebSocket health check endpoint
 @app.get("/api/ws/health")
 async def websocket_health():
-    """Check if WebSocket and Redis are available"""
+    """Check if WebSocket and the message broker are available"""
     try:
-        await broadcaster.connect()
+        await broadcaster.ping()
         redis_status = "connected"
     except Exception as e:
         redis_status = f"error: {str(e)}"
@@ -483,6 +609,19 @@ async def websocket_health():
     return {
         "status": "ok",
         "websocket": "available",
+        "broker": broadcaster.backend,
         "redis": redis_status,
-        "market_updater": "running" if market_updater.is_running else "stopped"
+        "market_updater": "running" if market_updater.is_running else "stopped",
+        "last_cycle": market_updater.last_cycle_stats,
+        "polling": market_updater.poll_stats,
+        "publishing": market_updater.publish_counts,
+        "open_circuits": market_updater.breakers.open_circuits(),
+        "coordination": market_updater.coordinator.to_dict(),
+        "demand": {
+            "polled_tickers": len(market_updater.tickers),
+            "subscribed": len(market_updater.subscriber_counts),
+            "watchlist": len(market_updater.watchlist_tickers),
+            "pinned": len(market_updater.pinned_tickers),
+            "remote": len(market_updater.remote_tickers)
+        }
     }
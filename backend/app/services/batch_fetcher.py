@@ -0,0 +1,144 @@
+"""
+Batched multi-symbol fetching from yfinance.
+Groups symbols into chunks, downloads each chunk with one yf.download call
+and splits the wide MultiIndex result into one OHLCV frame per symbol.
+Symbols missing from a batch are retried one at a time. An optional acquire
+callback is called before every yf.download so callers can rate limit each
+HTTP request rather than each batch.
+"""
+import logging
+import os
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+# Symbols per yf.download request
+BATCH_SIZE = int(os.getenv("YFINANCE_BATCH_SIZE", "50"))
+
+
+def chunked(symbols: List[str], size: int) -> Iterator[List[str]]:
+    """Yield successive chunks of at most `size` symbols"""
+    for start in range(0, len(symbols), size):
+        yield symbols[start:start + size]
+
+
+def split_batch_frame(df: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Split a yf.download result into one frame per symbol
+
+    Works for both column layouts yfinance produces: (ticker, field) with
+    group_by="ticker" and (field, ticker) otherwise. A flat frame is taken
+    as the data for a single requested symbol.
+
+    Args:
+        df: Frame returned by yf.download
+        symbols: Symbols requested in that call
+
+    Returns:
+        Dict of symbol -> OHLCV frame, only for symbols with at least one bar
+    """
+    frames = {}
+    if df is None or df.empty:
+        return frames
+
+    if not isinstance(df.columns, pd.MultiIndex):
+        if len(symbols) == 1:
+            frame = df.dropna(how="all")
+            if not frame.empty:
+                frames[symbols[0]] = frame
+        return frames
+
+    # Find which column level holds the ticker symbols
+    level = 0 if set(symbols) & set(df.columns.get_level_values(0)) else 1
+    available = set(df.columns.get_level_values(level))
+
+    for symbol in symbols:
+        if symbol not in available:
+            continue
+        frame = df.xs(symbol, axis=1, level=level).dropna(how="all")
+        if not frame.empty:
+            frames[symbol] = frame
+
+    return frames
+
+
+def download_batch(
+    symbols: List[str],
+    batch_size: int = None,
+    retries: int = 1,
+    acquire: Callable[[], None] = None,
+    **download_kwargs
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """
+    Download data for many symbols with one request per chunk
+
+    Args:
+        symbols: Ticker symbols
+        batch_size: Symbols per request (default YFINANCE_BATCH_SIZE)
+        retries: Per-symbol retries for symbols missing from their batch
+        acquire: Called before each request, blocking until it may be sent
+        **download_kwargs: Passed to yf.download (start, end, period, interval, ...)
+
+    Returns:
+        Tuple of (frames: symbol -> DataFrame, errors: symbol -> error message)
+    """
+    batch_size = batch_size or BATCH_SIZE
+    download_kwargs.setdefault("progress", False)
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+    frames: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+
+    for chunk in chunked(symbols, batch_size):
+        try:
+            if acquire:
+                acquire()
+            df = yf.download(chunk, group_by="ticker", threads=True, **download_kwargs)
+            frames.update(split_batch_frame(df, chunk))
+        except Exception as e:
+            logger.warning(f"Batch download failed for {len(chunk)} symbols: {e}")
+
+    # Fall back to one request per symbol, only for the failures
+    for symbol in symbols:
+        if symbol in frames:
+            continue
+        errors[symbol] = "No data available"
+        for _ in range(retries):
+            try:
+                if acquire:
+                    acquire()
+                df = yf.download(symbol, **download_kwargs)
+                frame = split_batch_frame(df, [symbol]).get(symbol)
+                if frame is not None:
+                    frames[symbol] = frame
+                    errors.pop(symbol)
+                    break
+            except Exception as e:
+                errors[symbol] = str(e)
+
+    logger.info(
+        f"Downloaded {len(frames)}/{len(symbols)} symbols "
+        f"in {-(-len(symbols) // batch_size)} batch request(s)"
+    )
+    return frames, errors
+
+
+def latest_bars(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.Series]:
+    """
+    Get the most recent complete bar for each symbol
+
+    Args:
+        frames: Dict of symbol -> OHLCV frame
+
+    Returns:
+        Dict of symbol -> last row with a Close price (bar time in .name)
+    """
+    bars = {}
+    for symbol, frame in frames.items():
+        valid = frame[frame["Close"].notna()]
+        if not valid.empty:
+            bars[symbol] = valid.iloc[-1]
+    return bars
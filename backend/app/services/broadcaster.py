@@ -1,49 +1,71 @@
 """
 Redis broadcaster for WebSocket pub/sub functionality.
 Handles broadcasting price updates to all connected WebSocket clients.
+The transport is pluggable (see broker.py): Redis by default, or an
+in-process broker when BROKER_BACKEND=memory.
 """
-import redis
 import json
 import logging
-from typing import Dict, Any
+import os
+import time
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
+from app.services.broker import MessageBroker, create_broker
 
 logger = logging.getLogger(__name__)
 
+# Max number of tickers sent to Redis in one pipeline round trip
+PIPELINE_CHUNK_SIZE = int(os.getenv("REDIS_PIPELINE_CHUNK_SIZE", "100"))
+
+# Broker backend: "redis" or "memory" (single-node, no Redis server needed)
+BROKER_BACKEND = os.getenv("BROKER_BACKEND", "redis")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
 class RedisBroadcaster:
     """Redis pub/sub broadcaster for real-time price updates"""
 
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(self, redis_url: str = REDIS_URL, backend: str = BROKER_BACKEND):
         """
         Initialize Redis broadcaster
 
         Args:
             redis_url: Redis connection URL
+            backend: Broker backend ("redis" or "memory")
         """
         self.redis_url = redis_url
-        self.redis_client = None
+        self.backend = backend
+        self.broker: MessageBroker = None
         self.pubsub = None
 
     async def connect(self):
-        """Connect to Redis"""
+        """Connect to the configured broker"""
+        if self.broker:
+            return
+
         try:
-            self.redis_client = redis.from_url(
-                self.redis_url,
-                encoding="utf-8",
-                decode_responses=True
-            )
+            broker = create_broker(self.backend, self.redis_url)
             # Test connection
-            self.redis_client.ping()
-            logger.info(f"Connected to Redis at {self.redis_url}")
+            broker.ping()
+            self.broker = broker
+            if broker.backend == "redis":
+                logger.info(f"Connected to Redis at {self.redis_url}")
+            else:
+                logger.info(f"Using {broker.backend} broker")
         except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
+            logger.error(f"Failed to connect to {self.backend} broker: {e}")
             raise
 
+    async def ping(self) -> bool:
+        """Connect if needed and check the broker is reachable"""
+        await self.connect()
+        return self.broker.ping()
+
     async def disconnect(self):
-        """Disconnect from Redis"""
-        if self.redis_client:
-            self.redis_client.close()
-            logger.info("Disconnected from Redis")
+        """Disconnect from the broker"""
+        if self.broker:
+            self.broker.close()
+            self.broker = None
+            logger.info(f"Disconnected from {self.backend} broker")
 
     async def publish(self, channel: str, message: Dict[str, Any]):
         """
@@ -54,7 +76,7 @@ class RedisBroadcaster:
             message: Message dict to publish
         """
         try:
-            if not self.redis_client:
+            if not self.broker:
                 await self.connect()
 
             # Add timestamp if not present
@@ -65,7 +87,7 @@ class RedisBroadcaster:
             json_message = json.dumps(message)
 
             # Publish to channel
-            subscribers = self.redis_client.publish(channel, json_message)
+            subscribers = self.broker.publish(channel, json_message)
             logger.debug(f"Published to {channel}: {json_message} ({subscribers} subscribers)")
 
             return subscribers
@@ -84,10 +106,10 @@ class RedisBroadcaster:
             PubSub object
         """
         try:
-            if not self.redis_client:
+            if not self.broker:
                 await self.connect()
 
-            self.pubsub = self.redis_client.pubsub()
+            self.pubsub = self.broker.pubsub()
             self.pubsub.subscribe(channel)
             logger.info(f"Subscribed to {channel}")
 
@@ -96,19 +118,21 @@ class RedisBroadcaster:
             logger.error(f"Failed to subscribe to {channel}: {e}")
             raise
 
-    async def unsubscribe(self, channel: str = None):
+    async def unsubscribe(self, channel: str = None, pubsub=None):
         """
         Unsubscribe from Redis channel(s)
 
         Args:
             channel: Channel to unsubscribe from (None = all)
+            pubsub: Subscription returned by subscribe() (default: the latest one)
         """
-        if self.pubsub:
+        pubsub = pubsub or self.pubsub
+        if pubsub:
             if channel:
-                self.pubsub.unsubscribe(channel)
+                pubsub.unsubscribe(channel)
                 logger.info(f"Unsubscribed from {channel}")
             else:
-                self.pubsub.unsubscribe()
+                pubsub.unsubscribe()
                 logger.info("Unsubscribed from all channels")
 
     def listen(self):
@@ -138,13 +162,92 @@ class RedisBroadcaster:
             price_data: Price data dict (open, high, low, close, volume)
         """
         channel = f"market:{ticker}"
-        message = {
+        message = self._price_update_message(ticker, price_data)
+        return await self.publish(channel, message)
+
+    async def publish_price_updates(
+        self,
+        updates: List[Tuple[str, Dict[str, Any]]],
+        ttl: int = 60,
+        chunk_size: int = None,
+        cache_only: List[Tuple[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Publish price updates and cache latest prices using pipelined round trips
+
+        Each chunk of tickers is sent as one non-transactional pipeline holding
+        the PUBLISH to market:{ticker} and the SETEX of latest:{ticker}.
+
+        Args:
+            updates: List of (ticker, price_data) tuples
+            ttl: Time to live for the latest:{ticker} cache entries in seconds
+            chunk_size: Tickers per pipeline (default REDIS_PIPELINE_CHUNK_SIZE)
+            cache_only: (ticker, price_data) tuples whose cache entry is refreshed
+                without publishing (e.g., unchanged prices)
+
+        Returns:
+            Dict with published count, round trips, serialization and broker time (ms)
+        """
+        chunk_size = chunk_size or PIPELINE_CHUNK_SIZE
+        stats = {
+            "published": 0,
+            "failed": 0,
+            "round_trips": 0,
+            "serialize_ms": 0.0,
+            "broker_ms": 0.0,
+        }
+
+        items = [(ticker, price_data, True) for ticker, price_data in updates]
+        items += [(ticker, price_data, False) for ticker, price_data in cache_only or []]
+        if not items:
+            return stats
+
+        if not self.broker:
+            await self.connect()
+
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+
+            serialize_start = time.perf_counter()
+            commands = [
+                (
+                    ticker,
+                    json.dumps(self._price_update_message(ticker, price_data)) if publish else None,
+                    json.dumps(price_data)
+                )
+                for ticker, price_data, publish in chunk
+            ]
+            stats["serialize_ms"] += (time.perf_counter() - serialize_start) * 1000
+
+            broker_start = time.perf_counter()
+            try:
+                pipe = self.broker.pipeline(transaction=False)
+                for ticker, json_message, json_value in commands:
+                    if json_message is not None:
+                        pipe.publish(f"market:{ticker}", json_message)
+                    pipe.setex(f"latest:{ticker}", ttl, json_value)
+                pipe.execute()
+                stats["published"] += sum(1 for command in commands if command[1] is not None)
+            except Exception as e:
+                logger.error(f"Failed to publish pipeline chunk of {len(commands)} tickers: {e}")
+                stats["failed"] += len(commands)
+            finally:
+                stats["round_trips"] += 1
+                stats["broker_ms"] += (time.perf_counter() - broker_start) * 1000
+
+        stats["serialize_ms"] = round(stats["serialize_ms"], 2)
+        stats["broker_ms"] = round(stats["broker_ms"], 2)
+        return stats
+
+    @staticmethod
+    def _price_update_message(ticker: str, price_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the price_update message sent to market:{ticker} subscribers"""
+        return {
             "type": "price_update",
             "ticker": ticker,
             "data": price_data,
             "timestamp": datetime.now().isoformat()
         }
-        return await self.publish(channel, message)
 
     async def cache_set(self, key: str, value: Any, ttl: int = 3600):
         """
@@ -156,11 +259,11 @@ class RedisBroadcaster:
             ttl: Time to live in seconds (default 1 hour)
         """
         try:
-            if not self.redis_client:
+            if not self.broker:
                 await self.connect()
 
             json_value = json.dumps(value)
-            self.redis_client.setex(key, ttl, json_value)
+            self.broker.setex(key, ttl, json_value)
             logger.debug(f"Cached {key} with TTL {ttl}s")
         except Exception as e:
             logger.error(f"Failed to cache {key}: {e}")
@@ -176,10 +279,10 @@ class RedisBroadcaster:
             Cached value or None if not found
         """
         try:
-            if not self.redis_client:
+            if not self.broker:
                 await self.connect()
 
-            value = self.redis_client.get(key)
+            value = self.broker.get(key)
             if value:
                 return json.loads(value)
             return None
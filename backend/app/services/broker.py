@@ -0,0 +1,323 @@
+"""
+Message broker backends for the broadcaster.
+Provides the pub/sub and TTL cache operations used by RedisBroadcaster, and
+the key/lease operations used for updater coordination, either through Redis
+or through an in-process asyncio implementation.
+"""
+import asyncio
+import fnmatch
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class MessageBroker:
+    """
+    Interface for pub/sub and cache backends
+
+    Mirrors the subset of the redis-py client API used by the broadcaster so
+    that Redis can be swapped for another backend without touching callers.
+    """
+
+    backend = "base"
+
+    def ping(self) -> bool:
+        """Check the backend is reachable"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release backend resources"""
+        raise NotImplementedError
+
+    def publish(self, channel: str, message: str) -> int:
+        """Publish a message and return the number of subscribers that received it"""
+        raise NotImplementedError
+
+    def pubsub(self):
+        """Create a subscription object (subscribe/unsubscribe/get_message/listen)"""
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value or None if missing or expired"""
+        raise NotImplementedError
+
+    def setex(self, key: str, ttl: int, value: str):
+        """Cache a value with a time to live in seconds"""
+        raise NotImplementedError
+
+    def pipeline(self, transaction: bool = False):
+        """Create a pipeline that buffers commands until execute()"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ex: int = None, nx: bool = False) -> bool:
+        """Set a value (optionally with TTL, or only if missing); return True if set"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        """Delete a key; return True if it existed"""
+        raise NotImplementedError
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several cached values (None for missing or expired keys)"""
+        raise NotImplementedError
+
+    def scan_iter(self, match: str):
+        """Iterate over the keys matching a glob pattern"""
+        raise NotImplementedError
+
+    def renew_if_owner(self, key: str, owner: str, ttl: int) -> bool:
+        """Extend the TTL of a lease key only if it still holds `owner`"""
+        raise NotImplementedError
+
+    def delete_if_owner(self, key: str, owner: str) -> bool:
+        """Delete a lease key only if it still holds `owner`"""
+        raise NotImplementedError
+
+
+class RedisBroker(MessageBroker):
+    """Broker backed by a Redis server"""
+
+    backend = "redis"
+
+    def __init__(self, redis_url: str):
+        """
+        Initialize Redis broker
+
+        Args:
+            redis_url: Redis connection URL
+        """
+        self.redis_url = redis_url
+        self.client = redis.from_url(
+            redis_url,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        # Compare-and-act lease scripts (atomic on the server)
+        self._renew_script = self.client.register_script(
+            "if redis.call('get', KEYS[1]) == ARGV[1] then "
+            "return redis.call('expire', KEYS[1], ARGV[2]) else return 0 end"
+        )
+        self._release_script = self.client.register_script(
+            "if redis.call('get', KEYS[1]) == ARGV[1] then "
+            "return redis.call('del', KEYS[1]) else return 0 end"
+        )
+
+    def ping(self) -> bool:
+        return self.client.ping()
+
+    def close(self):
+        self.client.close()
+
+    def publish(self, channel: str, message: str) -> int:
+        return self.client.publish(channel, message)
+
+    def pubsub(self):
+        return self.client.pubsub()
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def setex(self, key: str, ttl: int, value: str):
+        return self.client.setex(key, ttl, value)
+
+    def pipeline(self, transaction: bool = False):
+        return self.client.pipeline(transaction=transaction)
+
+    def set(self, key: str, value: str, ex: int = None, nx: bool = False) -> bool:
+        return bool(self.client.set(key, value, ex=ex, nx=nx))
+
+    def delete(self, key: str) -> bool:
+        return bool(self.client.delete(key))
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return self.client.mget(keys) if keys else []
+
+    def scan_iter(self, match: str):
+        return self.client.scan_iter(match=match)
+
+    def renew_if_owner(self, key: str, owner: str, ttl: int) -> bool:
+        return bool(self._renew_script(keys=[key], args=[owner, ttl]))
+
+    def delete_if_owner(self, key: str, owner: str) -> bool:
+        return bool(self._release_script(keys=[key], args=[owner]))
+
+
+class InMemorySubscription:
+    """Subscription to InMemoryBroker channels with a redis-py PubSub compatible API"""
+
+    def __init__(self, broker: "InMemoryBroker"):
+        self.broker = broker
+        self.channels: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def subscribe(self, *channels: str):
+        for channel in channels:
+            self.channels.add(channel)
+            self.broker._subscribers.setdefault(channel, set()).add(self)
+            self.queue.put_nowait({
+                "type": "subscribe",
+                "channel": channel,
+                "data": len(self.channels)
+            })
+
+    def unsubscribe(self, *channels: str):
+        for channel in channels or tuple(self.channels):
+            self.channels.discard(channel)
+            subscribers = self.broker._subscribers.get(channel)
+            if subscribers:
+                subscribers.discard(self)
+                if not subscribers:
+                    del self.broker._subscribers[channel]
+            self.queue.put_nowait({
+                "type": "unsubscribe",
+                "channel": channel,
+                "data": len(self.channels)
+            })
+
+    def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0):
+        """
+        Return the next pending message or None
+
+        Never blocks: the in-memory broker lives on the event loop thread, so
+        callers are expected to poll with an asyncio sleep between calls.
+        """
+        while not self.queue.empty():
+            message = self.queue.get_nowait()
+            if ignore_subscribe_messages and message["type"] != "message":
+                continue
+            return message
+        return None
+
+    def listen(self):
+        """Yield pending messages (non-blocking, see get_message)"""
+        while True:
+            message = self.get_message()
+            if message is None:
+                return
+            yield message
+
+    def close(self):
+        self.unsubscribe()
+
+
+class InMemoryPipeline:
+    """Buffers broker commands and applies them on execute()"""
+
+    def __init__(self, broker: "InMemoryBroker"):
+        self.broker = broker
+        self.commands: List[Tuple[str, tuple]] = []
+
+    def publish(self, channel: str, message: str):
+        self.commands.append(("publish", (channel, message)))
+        return self
+
+    def setex(self, key: str, ttl: int, value: str):
+        self.commands.append(("setex", (key, ttl, value)))
+        return self
+
+    def execute(self) -> List[Any]:
+        results = [getattr(self.broker, name)(*args) for name, args in self.commands]
+        self.commands = []
+        return results
+
+
+class InMemoryBroker(MessageBroker):
+    """
+    In-process broker for single-node deployments and tests
+
+    Same semantics as the Redis backend: fire-and-forget publish delivered to
+    current subscribers only, JSON strings in and out, and lazily expired TTL
+    cache entries. Not shared across processes.
+    """
+
+    backend = "memory"
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[InMemorySubscription]] = {}
+        self._cache: Dict[str, Tuple[str, float]] = {}
+
+    def ping(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+    def publish(self, channel: str, message: str) -> int:
+        subscribers = self._subscribers.get(channel, ())
+        for subscription in subscribers:
+            subscription.queue.put_nowait({
+                "type": "message",
+                "channel": channel,
+                "data": message
+            })
+        return len(subscribers)
+
+    def pubsub(self) -> InMemorySubscription:
+        return InMemorySubscription(self)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        return value
+
+    def setex(self, key: str, ttl: int, value: str):
+        self._cache[key] = (value, time.monotonic() + ttl)
+        return True
+
+    def pipeline(self, transaction: bool = False) -> InMemoryPipeline:
+        return InMemoryPipeline(self)
+
+    def set(self, key: str, value: str, ex: int = None, nx: bool = False) -> bool:
+        if nx and self.get(key) is not None:
+            return False
+        self._cache[key] = (value, time.monotonic() + ex if ex else float("inf"))
+        return True
+
+    def delete(self, key: str) -> bool:
+        return self._cache.pop(key, None) is not None
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [self.get(key) for key in keys]
+
+    def scan_iter(self, match: str):
+        return [key for key in list(self._cache) if fnmatch.fnmatchcase(key, match) and self.get(key) is not None]
+
+    def renew_if_owner(self, key: str, owner: str, ttl: int) -> bool:
+        if self.get(key) != owner:
+            return False
+        self._cache[key] = (owner, time.monotonic() + ttl)
+        return True
+
+    def delete_if_owner(self, key: str, owner: str) -> bool:
+        if self.get(key) != owner:
+            return False
+        del self._cache[key]
+        return True
+
+
+def create_broker(backend: str, redis_url: str) -> MessageBroker:
+    """
+    Create a broker for the configured backend
+
+    Args:
+        backend: "redis" or "memory"
+        redis_url: Redis connection URL (used by the redis backend)
+
+    Returns:
+        MessageBroker instance
+    """
+    backend = (backend or "redis").lower()
+    if backend == "memory":
+        return InMemoryBroker()
+    if backend == "redis":
+        return RedisBroker(redis_url)
+    raise ValueError(f"Unknown broker backend: {backend}")
@@ -0,0 +1,257 @@
+"""
+Parallel, resumable bulk history downloader.
+A bounded worker pool fetches batches of tickers through the provider
+registry while a single writer thread stores the results, so SQLite only
+ever sees one writer. Per-ticker status is kept in a JSON checkpoint file:
+a rerun skips tickers already done, and failed tickers go through retry
+rounds with exponential backoff.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from app.database import insert_stock_frames
+from app.services.batch_fetcher import BATCH_SIZE, chunked
+from app.services.data_providers import ProviderRegistry, get_registry
+from app.services.incremental_download import download_missing
+
+logger = logging.getLogger(__name__)
+
+# Concurrent fetch tasks (each task downloads one batch of tickers)
+DOWNLOAD_WORKERS = int(os.getenv("BULK_DOWNLOAD_WORKERS", "4"))
+
+# Retry rounds for failed tickers and the delay before the first one
+DOWNLOAD_RETRIES = int(os.getenv("BULK_DOWNLOAD_RETRIES", "2"))
+RETRY_DELAY = float(os.getenv("BULK_DOWNLOAD_RETRY_DELAY", "30"))
+
+DEFAULT_CHECKPOINT = "data/download_checkpoint.json"
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class Checkpoint:
+    """Per-ticker download status persisted to a JSON file"""
+
+    def __init__(self, path: str, run: Dict, start: str):
+        """
+        Load the checkpoint, discarding it if it belongs to a different run
+
+        Args:
+            path: JSON file path
+            run: Run parameters (window length, mode); a mismatch starts fresh
+            start: Start date of a fresh run (a resumed run keeps its saved one)
+        """
+        self.path = path
+        self.run = run
+        self.start = start
+        self.tickers: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved.get("run") == run:
+                self.tickers = saved.get("tickers", {})
+                self.start = saved.get("start", start)
+                logger.info(f"Resuming from checkpoint {path} ({len(self.done())} tickers done)")
+            else:
+                logger.info(f"Checkpoint {path} is for a different run, starting fresh")
+
+    def status(self, ticker: str) -> str:
+        return self.tickers.get(ticker, {}).get("status", PENDING)
+
+    def done(self) -> List[str]:
+        return [ticker for ticker, entry in self.tickers.items() if entry["status"] == DONE]
+
+    def update(self, ticker: str, status: str, **fields):
+        with self._lock:
+            entry = self.tickers.setdefault(ticker, {"attempts": 0})
+            entry.update(status=status, updated_at=datetime.now().isoformat(), **fields)
+
+    def save(self):
+        """Write atomically so a crash never leaves a truncated checkpoint"""
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"run": self.run, "start": self.start, "tickers": self.tickers}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+class BulkDownloader:
+    """Downloads many tickers with parallel fetches and a single database writer"""
+
+    def __init__(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        checkpoint_path: str = DEFAULT_CHECKPOINT,
+        workers: int = DOWNLOAD_WORKERS,
+        batch_size: int = BATCH_SIZE,
+        retries: int = DOWNLOAD_RETRIES,
+        retry_delay: float = RETRY_DELAY,
+        incremental: bool = False,
+        registry: ProviderRegistry = None,
+        writer: Callable[[Dict], Dict[str, int]] = insert_stock_frames
+    ):
+        """
+        Initialize bulk downloader
+
+        Args:
+            start_date: Start of the history window
+            end_date: End of the history window
+            checkpoint_path: JSON checkpoint file (resumed if it matches this run)
+            workers: Concurrent fetch tasks
+            batch_size: Tickers per fetch task
+            retries: Retry rounds for failed tickers
+            retry_delay: Seconds before the first retry round (doubles each round)
+            incremental: Only fetch dates missing from the database
+            registry: Market data providers (default: shared registry)
+            writer: Stores a dict of ticker -> frame, returns new rows per ticker
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+        self.workers = workers
+        self.batch_size = batch_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.incremental = incremental
+        self.registry = registry or get_registry()
+        self.writer = writer
+        # Callers derive both dates from now(), so the run is keyed on the window
+        # length and an interrupted download resumes on a later day with the
+        # start date it was begun with; each ticker records the end it reached
+        self.checkpoint = Checkpoint(checkpoint_path, {
+            "days": (end_date.date() - start_date.date()).days,
+            "incremental": incremental,
+        }, start=start_date.date().isoformat())
+        self.start_date = datetime.strptime(self.checkpoint.start, "%Y-%m-%d")
+        # Bounded so fetchers cannot run far ahead of the writer
+        self.write_queue: queue.Queue = queue.Queue(maxsize=workers * 2)
+        self.stats = {"done": 0, "failed": 0, "skipped": 0, "rows": 0}
+
+    def _fetch(self, tickers: List[str]):
+        if self.incremental:
+            frames, errors, _ = download_missing(tickers, self.start_date, self.end_date, registry=self.registry)
+            # Tickers already up to date come back with neither frame nor error
+            for ticker in tickers:
+                if ticker not in frames and ticker not in errors:
+                    frames[ticker] = None
+            return frames, errors
+        return self.registry.fetch_history(tickers, start=self.start_date, end=self.end_date)
+
+    def _write_loop(self):
+        """Single writer: drain the queue in batches, one transaction per batch"""
+        finished = False
+        while not finished:
+            batch = {}
+            item = self.write_queue.get()
+            while True:
+                if item is None:
+                    finished = True
+                    break
+                batch.update(item)
+                try:
+                    item = self.write_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if not batch:
+                continue
+            frames = {ticker: df for ticker, df in batch.items() if df is not None}
+            try:
+                inserted = self.writer(frames) if frames else {}
+            except Exception as e:
+                logger.error(f"Failed to write {len(frames)} tickers: {e}")
+                for ticker in batch:
+                    self._record_failure(ticker, f"write failed: {e}")
+                self.checkpoint.save()
+                continue
+
+            for ticker in batch:
+                rows = inserted.get(ticker, 0)
+                self.checkpoint.update(ticker, DONE, rows=rows, error=None, end=self.end_date.date().isoformat())
+                self.stats["done"] += 1
+                self.stats["rows"] += rows
+            self.checkpoint.save()
+
+    def _record_failure(self, ticker: str, error: str):
+        attempts = self.checkpoint.tickers.get(ticker, {}).get("attempts", 0) + 1
+        self.checkpoint.update(ticker, FAILED, attempts=attempts, error=error)
+
+    def run(self, tickers: List[str]) -> Dict[str, Dict]:
+        """
+        Download tickers, resuming from the checkpoint
+
+        Args:
+            tickers: Ticker symbols
+
+        Returns:
+            Dict of ticker -> checkpoint entry (status, rows, attempts, error)
+        """
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        pending = [ticker for ticker in tickers if self.checkpoint.status(ticker) != DONE]
+        self.stats["skipped"] = len(tickers) - len(pending)
+        started = time.perf_counter()
+        logger.info(
+            f"Bulk download: {len(pending)} tickers to fetch, {self.stats['skipped']} already done, "
+            f"{self.workers} workers x {self.batch_size} tickers"
+        )
+
+        writer = threading.Thread(target=self._write_loop, name="bulk-writer", daemon=True)
+        writer.start()
+
+        try:
+            for attempt in range(self.retries + 1):
+                if not pending:
+                    break
+                if attempt:
+                    delay = self.retry_delay * 2 ** (attempt - 1)
+                    logger.info(f"Retry round {attempt}: {len(pending)} tickers in {delay:.0f}s")
+                    time.sleep(delay)
+
+                failed = []
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-fetch") as pool:
+                    futures = {
+                        pool.submit(self._fetch, chunk): chunk
+                        for chunk in chunked(pending, self.batch_size)
+                    }
+                    for future in as_completed(futures):
+                        chunk = futures[future]
+                        try:
+                            frames, errors = future.result()
+                        except Exception as e:
+                            frames, errors = {}, {ticker: str(e) for ticker in chunk}
+
+                        for ticker, error in errors.items():
+                            self._record_failure(ticker, error)
+                            failed.append(ticker)
+                        if frames:
+                            self.write_queue.put(frames)
+
+                self.checkpoint.save()
+                # Retry queue: only the tickers that failed this round
+                pending = failed
+        finally:
+            self.write_queue.put(None)
+            writer.join()
+
+        self.stats["failed"] = sum(
+            1 for ticker in tickers if self.checkpoint.status(ticker) == FAILED
+        )
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Bulk download finished in {elapsed:.1f}s: {self.stats['done']} done, "
+            f"{self.stats['failed']} failed, {self.stats['skipped']} skipped, {self.stats['rows']} new rows"
+        )
+        return {ticker: self.checkpoint.tickers.get(ticker, {"status": PENDING}) for ticker in tickers}
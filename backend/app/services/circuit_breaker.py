@@ -0,0 +1,180 @@
+"""
+Per-ticker circuit breakers for market data fetching.
+A ticker whose fetches keep failing is taken out of rotation for an
+exponentially growing, jittered delay instead of being retried every cycle.
+Fetch outcomes are buffered and persisted in batches to asset_data_sources.
+A ticker's consecutive failures are kept on its primary data source's row,
+which is also what a restart restores the circuits from.
+"""
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures before a ticker's circuit opens
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+
+# Backoff after the circuit opens: base * 2^(opens - 1), capped, +/- jitter fraction
+BASE_DELAY = float(os.getenv("CIRCUIT_BASE_DELAY", "60"))
+MAX_DELAY = float(os.getenv("CIRCUIT_MAX_DELAY", "3600"))
+JITTER = float(os.getenv("CIRCUIT_JITTER", "0.2"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker for a single ticker"""
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+        jitter: float = JITTER
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.state = CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.retry_at = 0.0
+        self.last_error: Optional[str] = None
+
+    def allow(self, now: float = None) -> bool:
+        """
+        Check whether a fetch may be attempted
+
+        An open circuit lets a single probe through once its backoff expired.
+
+        Args:
+            now: time.monotonic() value (default: current)
+
+        Returns:
+            True if the ticker should be fetched
+        """
+        if self.state == CLOSED:
+            return True
+        now = time.monotonic() if now is None else now
+        if self.state == OPEN and now >= self.retry_at:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def record_success(self):
+        """Close the circuit after a successful fetch"""
+        self.state = CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.last_error = None
+
+    def record_failure(self, error: str = None):
+        """Count a failed fetch and open the circuit once the threshold is reached"""
+        self.failures += 1
+        self.last_error = error
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.opens += 1
+        delay = min(self.max_delay, self.base_delay * 2 ** (self.opens - 1))
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        self.state = OPEN
+        self.retry_at = time.monotonic() + delay
+
+    def to_dict(self) -> Dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(max(0.0, self.retry_at - time.monotonic()), 1) if self.state == OPEN else 0,
+            "last_error": self.last_error,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers for all tickers plus the outcomes waiting to be persisted"""
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        # (ticker, data source name) -> (last successful fetch or None, consecutive error count)
+        self.pending: Dict[Tuple[str, Optional[str]], Tuple[Optional[datetime], int]] = {}
+
+    def get(self, ticker: str) -> CircuitBreaker:
+        if ticker not in self.breakers:
+            self.breakers[ticker] = CircuitBreaker(**self.breaker_options)
+        return self.breakers[ticker]
+
+    def allow(self, ticker: str, now: float = None) -> bool:
+        return self.get(ticker).allow(now)
+
+    def record_success(self, ticker: str, source: str = None, primary: str = None):
+        """
+        Close a ticker's circuit after a fetch
+
+        Args:
+            ticker: Ticker symbol
+            source: Data source that served the fetch
+            primary: Data source carrying the circuit state; reset as well
+                when a fallback served the fetch
+        """
+        breaker = self.get(ticker)
+        breaker.record_success()
+        self.pending[(ticker, source)] = (datetime.now(), 0)
+        if primary is not None and primary != source:
+            last_success = self.pending.get((ticker, primary), (None, 0))[0]
+            self.pending[(ticker, primary)] = (last_success, 0)
+
+    def record_failure(self, ticker: str, error: str = None, source: str = None):
+        breaker = self.get(ticker)
+        was_open = breaker.state == OPEN
+        breaker.record_failure(error)
+        if breaker.state == OPEN and not was_open:
+            logger.warning(
+                f"Circuit opened for {ticker} after {breaker.failures} failures "
+                f"(retry in {breaker.to_dict()['retry_in']}s)"
+            )
+        last_success = self.pending.get((ticker, source), (None, 0))[0]
+        self.pending[(ticker, source)] = (last_success, breaker.failures)
+
+    def restore(self, error_counts: Dict[str, int]):
+        """
+        Seed breakers from persisted consecutive error counts
+
+        Args:
+            error_counts: ticker -> error_count of the primary source from asset_data_sources
+        """
+        for ticker, count in error_counts.items():
+            breaker = self.get(ticker)
+            if count >= breaker.failure_threshold:
+                breaker.failures = count
+                breaker._open()
+
+    def drain_pending(self) -> List[Tuple[str, Optional[datetime], int, Optional[str]]]:
+        """
+        Take the buffered fetch outcomes for persistence
+
+        Returns:
+            List of (ticker, last successful fetch or None, error count, data source name)
+        """
+        rows = [
+            (ticker, success, errors, source)
+            for (ticker, source), (success, errors) in self.pending.items()
+        ]
+        self.pending = {}
+        return rows
+
+    def open_circuits(self) -> Dict[str, Dict]:
+        """Get the state of every ticker whose circuit is not closed"""
+        return {
+            ticker: breaker.to_dict()
+            for ticker, breaker in self.breakers.items()
+            if breaker.state != CLOSED
+        }
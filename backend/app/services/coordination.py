@@ -0,0 +1,205 @@
+"""
+Coordination between market updater processes.
+With several uvicorn workers (or dedicated updater processes) every process
+runs a MarketUpdater. Members announce themselves and their local demand
+(subscribed, watchlist and pinned tickers) in heartbeat keys on the broker,
+so the polling work can be split without fetching or publishing twice:
+- none: every process polls its own demand (single process deployments,
+  the default)
+- leader: the member holding a lease key polls the demand of all members
+- shard: the demand of all members is split across polling members by
+  rendezvous hashing; when a member's heartbeat expires only its tickers move
+Until the broker has answered a first heartbeat a polling member polls its
+own demand as in "none", so a process without a reachable broker still works.
+"""
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Dict, List
+
+from app.services.broker import MessageBroker
+
+logger = logging.getLogger(__name__)
+
+# Coordination mode: "none", "leader" or "shard"
+COORDINATION_MODE = os.getenv("MARKET_UPDATER_COORDINATION", "none")
+
+# Seconds a member (and the leader lease) survives without a heartbeat
+LEASE_TTL = int(os.getenv("MARKET_UPDATER_LEASE_TTL", "15"))
+
+KEY_PREFIX = "market_updater"
+COORDINATION_MODES = ("none", "leader", "shard")
+
+
+def rendezvous_owner(ticker: str, members: List[str]) -> str:
+    """
+    Pick the member responsible for a ticker (highest random weight hashing)
+
+    Every member computes the same owner from the same member list, and
+    removing a member only reassigns the tickers it owned.
+
+    Args:
+        ticker: Ticker symbol
+        members: Member ids of the polling members
+
+    Returns:
+        Owning member id
+    """
+    return max(
+        members,
+        key=lambda member: hashlib.md5(f"{member}:{ticker}".encode()).digest()
+    )
+
+
+class UpdaterCoordinator:
+    """Membership, leadership and ticker ownership of one updater process"""
+
+    def __init__(
+        self,
+        mode: str = COORDINATION_MODE,
+        polls: bool = True,
+        lease_ttl: int = LEASE_TTL,
+        member_id: str = None
+    ):
+        """
+        Initialize coordinator
+
+        Args:
+            mode: "none", "leader" or "shard"
+            polls: Whether this process fetches data (False: only announces demand)
+            lease_ttl: Heartbeat/lease time to live in seconds
+            member_id: Unique member id (default: host:pid:random)
+        """
+        mode = (mode or "none").lower()
+        if mode not in COORDINATION_MODES:
+            raise ValueError(f"Unknown coordination mode: {mode}")
+
+        self.mode = mode
+        self.polls = polls
+        self.lease_ttl = lease_ttl
+        self.heartbeat_interval = max(1.0, lease_ttl / 3)
+        self.member_id = member_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.members: Dict[str, Dict] = {}
+        self.pollers: List[str] = []
+        self.is_leader = False
+        self.last_heartbeat = 0.0
+        # Ownership is only trusted until the last confirmed heartbeat expires
+        self.valid_until = 0.0
+        # False until a heartbeat has reached the broker once
+        self.connected = False
+
+    @property
+    def member_key(self) -> str:
+        return f"{KEY_PREFIX}:members:{self.member_id}"
+
+    @property
+    def leader_key(self) -> str:
+        return f"{KEY_PREFIX}:leader"
+
+    def heartbeat_due(self) -> bool:
+        return self.mode != "none" and time.monotonic() - self.last_heartbeat >= self.heartbeat_interval
+
+    def seconds_until_heartbeat(self) -> float:
+        if self.mode == "none":
+            return float("inf")
+        return max(0.0, self.last_heartbeat + self.heartbeat_interval - time.monotonic())
+
+    def heartbeat(self, broker: MessageBroker, demand: Dict[str, str]) -> bool:
+        """
+        Announce this member, refresh the member list and the leader lease
+
+        Args:
+            broker: Connected broker shared by all members
+            demand: Local ticker -> asset category demand
+
+        Returns:
+            True if the set of polling members or leadership changed
+        """
+        if self.mode == "none":
+            return False
+
+        self.last_heartbeat = time.monotonic()
+        broker.set(
+            self.member_key,
+            json.dumps({"polls": self.polls, "demand": demand}),
+            ex=self.lease_ttl
+        )
+
+        keys = list(broker.scan_iter(f"{KEY_PREFIX}:members:*"))
+        members = {}
+        for key, value in zip(keys, broker.mget(keys)):
+            if value:
+                members[key.split(":", 2)[2]] = json.loads(value)
+        self.members = members
+
+        was_leader = self.is_leader
+        if self.mode == "leader" and self.polls:
+            if self.is_leader:
+                self.is_leader = broker.renew_if_owner(self.leader_key, self.member_id, self.lease_ttl)
+            else:
+                self.is_leader = broker.set(self.leader_key, self.member_id, ex=self.lease_ttl, nx=True)
+            if self.is_leader != was_leader:
+                logger.info(f"Member {self.member_id} {'became' if self.is_leader else 'lost'} market updater leader")
+
+        pollers = sorted(member for member, info in members.items() if info.get("polls"))
+        changed = pollers != self.pollers or self.is_leader != was_leader
+        if changed and self.mode == "shard":
+            logger.info(f"Rebalanced market updater shards across {len(pollers)} member(s)")
+        self.pollers = pollers
+        self.valid_until = self.last_heartbeat + self.lease_ttl
+        if not self.connected:
+            self.connected = True
+            logger.info(f"Member {self.member_id} joined {self.mode} market updater coordination")
+        return changed
+
+    def release(self, broker: MessageBroker):
+        """Leave the group so other members take over immediately"""
+        if self.mode == "none" or broker is None:
+            return
+        broker.delete(self.member_key)
+        if self.is_leader:
+            broker.delete_if_owner(self.leader_key, self.member_id)
+        self.is_leader = False
+        self.valid_until = 0.0
+
+    def demand(self) -> Dict[str, str]:
+        """Union of all members' demand (ticker -> asset category)"""
+        combined: Dict[str, str] = {}
+        for info in self.members.values():
+            combined.update(info.get("demand", {}))
+        return combined
+
+    def owns(self, ticker: str) -> bool:
+        """
+        Check whether this process should poll a ticker
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            True if the ticker is assigned to this member
+        """
+        if self.mode == "none":
+            return self.polls
+        if not self.connected:
+            # Broker never reachable: poll standalone rather than not at all
+            return self.polls
+        if not self.polls or time.monotonic() >= self.valid_until:
+            return False
+        if self.mode == "leader":
+            return self.is_leader
+        return bool(self.pollers) and rendezvous_owner(ticker, self.pollers) == self.member_id
+
+    def to_dict(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "member_id": self.member_id,
+            "polls": self.polls,
+            "is_leader": self.is_leader,
+            "members": len(self.members),
+            "polling_members": len(self.pollers),
+        }
@@ -0,0 +1,364 @@
+"""
+Market data providers.
+Every fetch path (market updater, downloaders, asset seeding) goes through a
+ProviderRegistry that tries providers in data_sources.priority order, fails
+over to the next provider for symbols the previous one could not serve, and
+honours each source's rate_limit_per_hour. Providers charge the limit once
+per request they send to the source (a batched history download is one per
+chunk plus one per single-symbol retry), through their acquire() hook.
+
+Providers:
+- yfinance: Yahoo Finance through batched yf.download calls
+- replay: deterministic local CSV files, for offline runs and load tests
+
+Select providers with MARKET_DATA_PROVIDERS (e.g. "replay" or "yfinance,replay");
+by default the active rows of data_sources are used when DATABASE_URL is set.
+Replay is opt-in: it is inactive in DEFAULT_SOURCES.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from app.services.batch_fetcher import download_batch, latest_bars, split_batch_frame
+from app.services.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Directory of per-symbol CSV files served by the replay provider
+REPLAY_DATA_DIR = os.getenv("REPLAY_DATA_DIR", "data/replay")
+
+# Provider configuration used when data_sources is unavailable
+DEFAULT_SOURCES = [
+    {"name": "yfinance", "priority": 100, "rate_limit_per_hour": 2000, "is_active": True},
+    {"name": "replay", "priority": 0, "rate_limit_per_hour": None, "is_active": False},
+]
+
+# Extra per-second cap on top of rate_limit_per_hour (keeps bursts polite)
+PER_SECOND_LIMITS = {
+    "yfinance": float(os.getenv("YFINANCE_RATE_LIMIT_PER_SEC", "5")),
+}
+
+# Frames keyed by symbol, and error messages keyed by symbol
+Frames = Dict[str, pd.DataFrame]
+Errors = Dict[str, str]
+
+
+class MarketDataProvider:
+    """Interface for market data sources"""
+
+    name = "base"
+
+    def acquire(self):
+        """Wait until a request may be sent to the source (set by ProviderSlot)"""
+
+    def fetch_history(self, symbols: List[str], **kwargs) -> Tuple[Frames, Errors]:
+        """
+        Fetch OHLCV history for several symbols
+
+        Args:
+            symbols: Ticker symbols
+            **kwargs: start, end, period, interval (yf.download semantics)
+
+        Returns:
+            Tuple of (symbol -> OHLCV frame, symbol -> error message)
+        """
+        raise NotImplementedError
+
+    def fetch_latest(self, symbols: List[str]) -> Tuple[Dict[str, pd.Series], Errors]:
+        """
+        Fetch the latest 1-minute bar for several symbols
+
+        Returns:
+            Tuple of (symbol -> bar with Open/High/Low/Close/Volume, bar time in .name,
+            symbol -> error message)
+        """
+        raise NotImplementedError
+
+    def fetch_info(self, symbol: str) -> Dict:
+        """Fetch descriptive metadata for a symbol (yfinance .info keys)"""
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance through batched yf.download calls"""
+
+    name = "yfinance"
+
+    def fetch_history(self, symbols: List[str], **kwargs) -> Tuple[Frames, Errors]:
+        return download_batch(symbols, acquire=self.acquire, **kwargs)
+
+    def fetch_latest(self, symbols: List[str]) -> Tuple[Dict[str, pd.Series], Errors]:
+        self.acquire()
+        df = yf.download(
+            symbols,
+            period="1d",
+            interval="1m",
+            group_by="ticker",
+            threads=False,
+            progress=False
+        )
+        bars = latest_bars(split_batch_frame(df, symbols))
+        errors = {symbol: "No data returned" for symbol in symbols if symbol not in bars}
+        return bars, errors
+
+    def fetch_info(self, symbol: str) -> Dict:
+        self.acquire()
+        return yf.Ticker(symbol).info or {}
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Deterministic provider backed by local files
+
+    History comes from <data_dir>/<SYMBOL>.csv (Date,Open,High,Low,Close,Volume,
+    as written by DataFrame.to_csv or write_replay_files). fetch_latest replays
+    those rows in order, one bar per call per symbol, wrapping at the end, so
+    repeated runs produce identical streams. Metadata comes from
+    <data_dir>/info.json ({symbol: info}) if present.
+    """
+
+    name = "replay"
+
+    def __init__(self, data_dir: str = REPLAY_DATA_DIR):
+        self.data_dir = Path(data_dir)
+        self._frames: Frames = {}
+        self._cursors: Dict[str, int] = {}
+        self._info: Optional[Dict[str, Dict]] = None
+        self._lock = threading.Lock()
+
+    def _load(self, symbol: str) -> Optional[pd.DataFrame]:
+        if symbol not in self._frames:
+            path = self.data_dir / f"{symbol}.csv"
+            if not path.exists():
+                return None
+            self._frames[symbol] = pd.read_csv(path, index_col=0, parse_dates=True).sort_index()
+        return self._frames[symbol]
+
+    def fetch_history(self, symbols: List[str], **kwargs) -> Tuple[Frames, Errors]:
+        self.acquire()
+        start, end = kwargs.get("start"), kwargs.get("end")
+        frames, errors = {}, {}
+        for symbol in symbols:
+            df = self._load(symbol)
+            if df is None:
+                errors[symbol] = f"No replay file for {symbol}"
+                continue
+            # Same window semantics as yf.download: start inclusive, end exclusive
+            if start is not None:
+                df = df[df.index >= pd.Timestamp(start)]
+            if end is not None:
+                df = df[df.index < pd.Timestamp(end)]
+            if df.empty:
+                errors[symbol] = "No data available"
+            else:
+                frames[symbol] = df
+        return frames, errors
+
+    def fetch_latest(self, symbols: List[str]) -> Tuple[Dict[str, pd.Series], Errors]:
+        self.acquire()
+        bars, errors = {}, {}
+        with self._lock:
+            for symbol in symbols:
+                df = self._load(symbol)
+                if df is None or df.empty:
+                    errors[symbol] = f"No replay file for {symbol}"
+                    continue
+                position = self._cursors.get(symbol, 0) % len(df)
+                self._cursors[symbol] = position + 1
+                bars[symbol] = df.iloc[position]
+        return bars, errors
+
+    def fetch_info(self, symbol: str) -> Dict:
+        self.acquire()
+        if self._info is None:
+            path = self.data_dir / "info.json"
+            self._info = json.loads(path.read_text()) if path.exists() else {}
+        return self._info.get(symbol, {})
+
+
+def write_replay_files(frames: Frames, data_dir: str = REPLAY_DATA_DIR):
+    """
+    Save OHLCV frames as replay files (e.g., to record a live download for offline runs)
+
+    Args:
+        frames: symbol -> OHLCV frame
+        data_dir: Target directory
+    """
+    path = Path(data_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    for symbol, df in frames.items():
+        df.to_csv(path / f"{symbol}.csv", index_label="Date")
+
+
+PROVIDER_CLASSES = {
+    YFinanceProvider.name: YFinanceProvider,
+    ReplayProvider.name: ReplayProvider,
+}
+
+
+class ProviderSlot:
+    """
+    A provider with its priority and rate limiters
+
+    The provider's acquire() hook is bound to the slot, so every request it
+    sends waits for a token and is counted.
+    """
+
+    def __init__(self, provider: MarketDataProvider, priority: int, rate_limit_per_hour: Optional[int]):
+        self.provider = provider
+        self.priority = priority
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.limiters: List[TokenBucket] = []
+        if rate_limit_per_hour:
+            # Hourly budget, spendable in bursts of up to a minute's worth
+            self.limiters.append(TokenBucket(rate_limit_per_hour / 3600, max(1.0, rate_limit_per_hour / 60)))
+        if provider.name in PER_SECOND_LIMITS:
+            self.limiters.append(TokenBucket(PER_SECOND_LIMITS[provider.name]))
+        provider.acquire = self.acquire_blocking
+
+    def acquire_blocking(self):
+        for limiter in self.limiters:
+            limiter.acquire_blocking()
+        with self._lock:
+            self.requests += 1
+
+
+class ProviderRegistry:
+    """
+    Priority-ordered providers with automatic failover
+
+    Each call goes to the highest-priority provider, whose requests wait for
+    its rate budget when it is exhausted; only symbols it fails on (errors or
+    missing data) are retried on the next provider. served_by records the
+    provider that last returned data for each symbol.
+    """
+
+    def __init__(self, slots: List[ProviderSlot]):
+        self.slots = sorted(slots, key=lambda slot: slot.priority, reverse=True)
+        self.served_by: Dict[str, str] = {}
+
+    @property
+    def names(self) -> List[str]:
+        return [slot.provider.name for slot in self.slots]
+
+    @property
+    def request_counts(self) -> Dict[str, int]:
+        """Requests sent to each provider's source"""
+        return {slot.provider.name: slot.requests for slot in self.slots}
+
+    def _failover(self, method: str, symbols: List[str], **kwargs) -> Tuple[Dict, Errors]:
+        results: Dict = {}
+        errors: Errors = {}
+        remaining = list(symbols)
+
+        for slot in self.slots:
+            if not remaining:
+                break
+            # The provider waits out a spent budget request by request: failing
+            # over on it would send healthy symbols to providers that may not have them
+            try:
+                found, failed = getattr(slot.provider, method)(remaining, **kwargs)
+            except Exception as e:
+                logger.warning(f"{slot.provider.name}.{method} failed: {e}")
+                found, failed = {}, {symbol: str(e) for symbol in remaining}
+
+            results.update(found)
+            errors.update(failed)
+            for symbol in found:
+                self.served_by[symbol] = slot.provider.name
+            remaining = [symbol for symbol in remaining if symbol not in found]
+
+        for symbol in results:
+            errors.pop(symbol, None)
+        for symbol in remaining:
+            errors.setdefault(symbol, "No provider returned data")
+        return results, errors
+
+    def fetch_history(self, symbols: List[str], **kwargs) -> Tuple[Frames, Errors]:
+        """Fetch OHLCV history with failover (see MarketDataProvider.fetch_history)"""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        return self._failover("fetch_history", symbols, **kwargs)
+
+    def fetch_latest(self, symbols: List[str]) -> Tuple[Dict[str, pd.Series], Errors]:
+        """Fetch latest 1-minute bars with failover (see MarketDataProvider.fetch_latest)"""
+        return self._failover("fetch_latest", list(symbols))
+
+    def fetch_info(self, symbol: str) -> Dict:
+        """Fetch metadata from the first provider that returns any"""
+        for slot in self.slots:
+            try:
+                info = slot.provider.fetch_info(symbol)
+                if info:
+                    return info
+            except Exception as e:
+                logger.warning(f"{slot.provider.name}.fetch_info failed for {symbol}: {e}")
+        return {}
+
+
+def load_source_configs() -> List[Dict]:
+    """
+    Load provider configuration
+
+    Order of precedence: MARKET_DATA_PROVIDERS (comma separated names, in
+    priority order), the data_sources table when DATABASE_URL is set, then
+    DEFAULT_SOURCES.
+    """
+    defaults = {source["name"]: source for source in DEFAULT_SOURCES}
+
+    names = [name.strip() for name in os.getenv("MARKET_DATA_PROVIDERS", "").split(",") if name.strip()]
+    if names:
+        return [
+            {**defaults.get(name, {"rate_limit_per_hour": None}), "name": name, "priority": len(names) - i}
+            for i, name in enumerate(names)
+        ]
+
+    if os.getenv("DATABASE_URL"):
+        try:
+            from app.database_pg import get_data_sources
+            sources = [source for source in get_data_sources() if source["is_active"]]
+            if sources:
+                return sources
+        except Exception as e:
+            logger.warning(f"Failed to load data_sources, using defaults: {e}")
+
+    return [source for source in DEFAULT_SOURCES if source["is_active"]]
+
+
+def build_registry(configs: List[Dict] = None) -> ProviderRegistry:
+    """
+    Build a registry from provider configs (default: load_source_configs())
+
+    Sources without a provider implementation (e.g. alpha_vantage) are skipped.
+    """
+    slots = []
+    for config in configs or load_source_configs():
+        provider_class = PROVIDER_CLASSES.get(config["name"])
+        if provider_class is None:
+            logger.debug(f"No provider implementation for data source {config['name']}")
+            continue
+        slots.append(ProviderSlot(provider_class(), config.get("priority") or 0, config.get("rate_limit_per_hour")))
+
+    if not slots:
+        raise ValueError("No usable market data providers configured")
+
+    registry = ProviderRegistry(slots)
+    logger.info(f"Market data providers (by priority): {', '.join(registry.names)}")
+    return registry
+
+
+_registry: Optional[ProviderRegistry] = None
+
+
+def get_registry() -> ProviderRegistry:
+    """Get the process-wide provider registry, building it on first use"""
+    global _registry
+    if _registry is None:
+        _registry = build_registry()
+    return _registry
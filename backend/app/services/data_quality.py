@@ -4,20 +4,85 @@ Data Quality Validation Service
 Validates stock market data for quality issues including:
 - Missing required fields
 - Invalid OHLC relationships
-- Price/volume anomalies
+- Price/volume anomalies (global and rolling)
+- Split-like price jumps
 - Date gaps and duplicates
 - Negative values
 - Data freshness
+
+validate_data converts the records to NumPy columns once and evaluates each
+rule as an array operation; only flagged rows are turned back into issue
+dicts. validate_data_loop is the original per-record implementation, kept as
+the reference the benchmark (scripts/benchmark_data_quality.py) compares against.
 """
 
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple
+import os
 import statistics
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.services.market_calendar import calendar_for, session_gaps
+
+REQUIRED_FIELDS = ["date", "open", "high", "low", "close", "volume"]
+PRICE_FIELDS = ["open", "high", "low", "close"]
+
+# Issue categories in the order validate_data reports them
+CATEGORIES = [
+    "missing_fields", "invalid_ohlc", "price_anomaly", "volume_anomaly",
+    "return_anomaly", "split_jump", "volume_spike",
+    "date_gaps", "duplicate_dates", "negative_values", "stale_data",
+]
+
+# Rolling detectors (not part of validate_data_loop)
+ROLLING_CATEGORIES = ["return_anomaly", "split_jump", "volume_spike"]
+
+# Bumped when a stored (record-level) rule changes, so stored results are recomputed
+RULES_VERSION = 2
+
+# Categories that only depend on a bar and its neighbours, so they can be
+# computed once at ingestion; the rest depend on the requested window or the clock
+RECORD_CATEGORIES = ["missing_fields", "invalid_ohlc", "date_gaps", "negative_values"]
+WINDOW_CATEGORIES = [
+    "price_anomaly", "volume_anomaly", "return_anomaly", "split_jump", "volume_spike",
+    "duplicate_dates", "stale_data",
+]
+
+# Trailing bars the return median/MAD is taken over, and the robust z-score
+# above which a return is flagged
+RETURN_WINDOW = int(os.getenv("DQ_RETURN_WINDOW", "63"))
+RETURN_Z_THRESHOLD = float(os.getenv("DQ_RETURN_Z", "8"))
+
+# Trailing bars of the volume average, and the volume/average ratio flagged
+VOLUME_WINDOW = int(os.getenv("DQ_VOLUME_WINDOW", "20"))
+VOLUME_RATIO_THRESHOLD = float(os.getenv("DQ_VOLUME_RATIO", "5"))
+
+# Close-to-close ratios within SPLIT_TOLERANCE of 1/f (split) or f (reverse
+# split) for these factors look like an unadjusted split
+SPLIT_FACTORS = [2, 3, 4, 5, 8, 10, 20]
+SPLIT_TOLERANCE = float(os.getenv("DQ_SPLIT_TOLERANCE", "0.03"))
+
+# Aggregated issue payloads: run issues kept per category, sample rows per run
+MAX_ISSUES_PER_CATEGORY = int(os.getenv("DQ_MAX_ISSUES_PER_CATEGORY", "50"))
+SAMPLE_ROWS = int(os.getenv("DQ_SAMPLE_ROWS", "3"))
+
+SEVERITY_ORDER = ["error", "warning", "info"]
 
-def validate_data(data: List[Dict[str, Any]], ticker: str) -> Tuple[bool, List[Dict[str, Any]]]:
+# Consistent scale factor turning a MAD into a standard deviation for normal data
+MAD_SCALE = 1.4826
+
+# Rolling windows evaluated per block, bounding the strided temporaries
+ROLLING_BLOCK = 16384
+
+
+def validate_data_loop(data: List[Dict[str, Any]], ticker: str) -> Tuple[bool, List[Dict[str, Any]]]:
     """
-    Validate stock data for quality issues
+    Validate stock data for quality issues, one record at a time
+
+    Reference implementation of validate_data (same issues, much slower on
+    long histories).
 
     Args:
         data: List of stock data points with date, open, high, low, close, volume
@@ -140,17 +205,7 @@ def validate_data(data: List[Dict[str, Any]], ticker: str) -> Tuple[bool, List[D
 
     # 5. Check for date gaps (missing trading days)
     try:
-        dates = sorted([datetime.strptime(r["date"], "%Y-%m-%d") for r in data if "date" in r])
-        gaps = []
-        for i in range(1, len(dates)):
-            days_diff = (dates[i] - dates[i-1]).days
-            # Trading days should be 1-3 days apart (accounting for weekends)
-            if days_diff > 5:
-                gaps.append({
-                    "from": dates[i-1].strftime("%Y-%m-%d"),
-                    "to": dates[i].strftime("%Y-%m-%d"),
-                    "days": days_diff
-                })
+        gaps = find_date_gaps([r["date"] for r in data if "date" in r])
 
         if gaps:
             issues.append({
@@ -224,3 +279,522 @@ def validate_data(data: List[Dict[str, Any]], ticker: str) -> Tuple[bool, List[D
     is_valid = not has_errors
 
     return is_valid, issues
+
+
+def _numeric_column(data: List[Dict[str, Any]], field: str) -> Tuple[List[Any], np.ndarray, np.ndarray]:
+    """Raw values, presence mask and float array (NaN where absent) of one field"""
+    raw = [record.get(field) for record in data]
+    present = np.fromiter((value is not None for value in raw), dtype=bool, count=len(raw))
+    return raw, present, np.array(raw, dtype=float)
+
+
+def _mean_stdev(values: np.ndarray, integral: bool) -> Tuple[float, float]:
+    """
+    Mean and sample standard deviation as statistics.mean/stdev return them
+
+    Integer samples get the exact mean (an int when it divides evenly, like
+    statistics.mean). Float samples are shifted by their first value so a
+    constant series has exactly zero deviation, as with exact arithmetic.
+    """
+    if integral:
+        total = int(values.astype(np.int64).sum())
+        mean = total // len(values) if total % len(values) == 0 else total / len(values)
+    else:
+        mean = float(values[0] + np.mean(values - values[0]))
+    return mean, float(np.std(values - values[0], ddof=1))
+
+
+def rolling_return_zscores(close: np.ndarray, window: int = RETURN_WINDOW) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Robust z-score of each log return against the previous window of returns
+
+    The median and MAD come from a strided view of the trailing returns,
+    evaluated block by block, so the cost is linear in the history length.
+
+    Args:
+        close: Positive close prices in date order
+        window: Trailing returns the median/MAD is taken over
+
+    Returns:
+        Tuple of (log returns, z-scores), both aligned to close[1:];
+        z-scores are NaN until a full window is available
+    """
+    returns = np.diff(np.log(close))
+    zscores = np.full(len(returns), np.nan)
+    for start in range(window, len(returns), ROLLING_BLOCK):
+        stop = min(start + ROLLING_BLOCK, len(returns))
+        trailing = sliding_window_view(returns[start - window:stop - 1], window)
+        median = np.median(trailing, axis=1)
+        mad = np.median(np.abs(trailing - median[:, None]), axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscores[start:stop] = (returns[start:stop] - median) / (MAD_SCALE * mad)
+    return returns, zscores
+
+
+def rolling_volume_ratio(volume: np.ndarray, window: int = VOLUME_WINDOW) -> np.ndarray:
+    """
+    Each volume divided by the mean of the previous window volumes
+
+    Trailing sums come from one cumulative sum. NaN until a full window is
+    available and where the trailing mean is zero.
+    """
+    ratio = np.full(len(volume), np.nan)
+    if len(volume) <= window:
+        return ratio
+    cumulative = np.concatenate(([0.0], np.cumsum(volume)))
+    trailing_mean = (cumulative[window:-1] - cumulative[:-window - 1]) / window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio[window:] = np.where(trailing_mean > 0, volume[window:] / trailing_mean, np.nan)
+    return ratio
+
+
+def split_jumps(close: np.ndarray, tolerance: float = SPLIT_TOLERANCE) -> np.ndarray:
+    """
+    Split factor implied by each close-to-close move (0 where none)
+
+    Positive values are splits (price divided by the factor), negative
+    values reverse splits (price multiplied by the factor). Aligned to close[1:].
+    """
+    ratio = close[1:] / close[:-1]
+    factors = np.zeros(len(ratio))
+    for factor in SPLIT_FACTORS:
+        factors[np.abs(ratio * factor - 1) < tolerance] = factor
+        factors[np.abs(ratio / factor - 1) < tolerance] = -factor
+    return factors
+
+
+def _rolling_issues(
+    data: List[Dict[str, Any]],
+    dates: List[Any],
+    close: np.ndarray,
+    volume: np.ndarray,
+    wanted: set,
+    timestamp: str
+) -> List[Dict[str, Any]]:
+    """Rolling return, split and volume issues, in record order"""
+    found = []
+
+    # Rolling rules need date order; records keep their own index in the output
+    usable = np.fromiter((date is not None for date in dates), dtype=bool, count=len(dates))
+    usable &= close > 0
+    positions = np.flatnonzero(usable)
+    if positions.size < 2:
+        return []
+    positions = positions[np.argsort(np.array([dates[i] for i in positions]), kind="stable")]
+    ordered_close = close[positions]
+
+    splits = split_jumps(ordered_close)
+    if "split_jump" in wanted:
+        for j in np.flatnonzero(splits).tolist():
+            factor = int(abs(splits[j]))
+            idx = int(positions[j + 1])
+            found.append((idx, {
+                "severity": "warning",
+                "category": "split_jump",
+                "message": f"Split-like price jump at index {idx}",
+                "details": {
+                    "record_index": idx,
+                    "date": dates[idx],
+                    "previous_close": data[int(positions[j])]["close"],
+                    "close": data[idx]["close"],
+                    "ratio": round(float(ordered_close[j + 1] / ordered_close[j]), 4),
+                    "split": f"{factor}:1" if splits[j] > 0 else f"1:{factor}"
+                },
+                "timestamp": timestamp
+            }))
+
+    if "return_anomaly" in wanted:
+        returns, zscores = rolling_return_zscores(ordered_close)
+        with np.errstate(invalid="ignore"):
+            flagged = (np.abs(zscores) > RETURN_Z_THRESHOLD) & (splits == 0)
+        for j in np.flatnonzero(flagged).tolist():
+            idx = int(positions[j + 1])
+            found.append((idx, {
+                "severity": "warning",
+                "category": "return_anomaly",
+                "message": f"Return anomaly at index {idx}",
+                "details": {
+                    "record_index": idx,
+                    "date": dates[idx],
+                    "return": round(float(np.expm1(returns[j])), 4),
+                    "z_score": round(float(zscores[j]), 2),
+                    "window": RETURN_WINDOW
+                },
+                "timestamp": timestamp
+            }))
+
+    if "volume_spike" in wanted:
+        ordered_volume = volume[positions]
+        ratio = rolling_volume_ratio(np.nan_to_num(ordered_volume))
+        with np.errstate(invalid="ignore"):
+            flagged = ratio > VOLUME_RATIO_THRESHOLD
+        for j in np.flatnonzero(flagged).tolist():
+            idx = int(positions[j])
+            found.append((idx, {
+                "severity": "info",
+                "category": "volume_spike",
+                "message": f"Volume {ratio[j]:.1f}x the {VOLUME_WINDOW}-bar average at index {idx}",
+                "details": {
+                    "record_index": idx,
+                    "date": dates[idx],
+                    "volume": data[idx]["volume"],
+                    "ratio": round(float(ratio[j]), 2),
+                    "window": VOLUME_WINDOW
+                },
+                "timestamp": timestamp
+            }))
+
+    rank = {category: position for position, category in enumerate(ROLLING_CATEGORIES)}
+    found.sort(key=lambda item: (rank[item[1]["category"]], item[0]))
+    return [issue for _, issue in found]
+
+
+def _ohlc_issues(idx: int, record: Dict[str, Any], timestamp: str) -> List[Dict[str, Any]]:
+    """OHLC relationship issues of one record (same checks as validate_data_loop)"""
+    issues = []
+    try:
+        o, h, l, c = record["open"], record["high"], record["low"], record["close"]
+
+        if h < l:
+            issues.append({
+                "severity": "error",
+                "category": "invalid_ohlc",
+                "message": f"High ({h}) < Low ({l}) at index {idx}",
+                "details": {"record_index": idx, "high": h, "low": l},
+                "timestamp": timestamp
+            })
+
+        if h < o or h < c:
+            issues.append({
+                "severity": "error",
+                "category": "invalid_ohlc",
+                "message": f"High price not highest at index {idx}",
+                "details": {"record_index": idx, "open": o, "high": h, "low": l, "close": c},
+                "timestamp": timestamp
+            })
+
+        if l > o or l > c:
+            issues.append({
+                "severity": "error",
+                "category": "invalid_ohlc",
+                "message": f"Low price not lowest at index {idx}",
+                "details": {"record_index": idx, "open": o, "high": h, "low": l, "close": c},
+                "timestamp": timestamp
+            })
+    except (KeyError, TypeError):
+        pass  # Already caught by missing fields check
+    return issues
+
+
+def validate_data(
+    data: List[Dict[str, Any]],
+    ticker: str,
+    categories: List[str] = None,
+    asset_category: str = None
+) -> Tuple[bool, List[Dict[str, Any]]]:
+    """
+    Validate stock data for quality issues
+
+    Same rules and issue output as validate_data_loop, evaluated on NumPy
+    columns, except that date gaps are missing sessions of the asset's
+    trading calendar rather than spacings over 5 days. Duplicate dates are
+    listed in date order.
+
+    Args:
+        data: List of stock data points with date, open, high, low, close, volume
+        ticker: Stock ticker symbol
+        categories: Only run the rules of these categories (default: all)
+        asset_category: Category from the assets table, selects the trading
+            calendar (default: guessed from the symbol)
+
+    Returns:
+        Tuple of (is_valid: bool, issues: List[Dict])
+    """
+    issues = []
+    timestamp = datetime.now().isoformat()
+    wanted = set(CATEGORIES if categories is None else categories)
+
+    if not data:
+        issues.append({
+            "severity": "error",
+            "category": "missing_data",
+            "message": f"No data available for {ticker}",
+            "details": {},
+            "timestamp": timestamp
+        })
+        return False, issues
+
+    try:
+        columns = {field: _numeric_column(data, field) for field in PRICE_FIELDS + ["volume"]}
+    except (TypeError, ValueError):
+        # Non-numeric values only compare meaningfully record by record
+        _, issues = validate_data_loop(data, ticker)
+        issues = [issue for issue in issues if issue["category"] in wanted]
+        return not any(issue["severity"] == "error" for issue in issues), issues
+    present = {field: column[1] for field, column in columns.items()}
+    dates = [record.get("date") for record in data]
+    present["date"] = np.fromiter((date is not None for date in dates), dtype=bool, count=len(dates))
+
+    # 1. Check required fields
+    missing_rows = ~np.logical_and.reduce([present[field] for field in REQUIRED_FIELDS])
+    if "missing_fields" not in wanted:
+        missing_rows[:] = False
+    for idx in np.flatnonzero(missing_rows).tolist():
+        missing = [field for field in REQUIRED_FIELDS if not present[field][idx]]
+        issues.append({
+            "severity": "error",
+            "category": "missing_fields",
+            "message": f"Missing required fields at index {idx}",
+            "details": {"missing_fields": missing, "record_index": idx},
+            "timestamp": timestamp
+        })
+
+    # 2. Check OHLC relationships (rows with missing prices go through the
+    # scalar check, which reports whatever comparisons it gets through)
+    o, h, l, c = (columns[field][2] for field in PRICE_FIELDS)
+    complete = np.logical_and.reduce([present[field] for field in PRICE_FIELDS])
+    suspect = ~complete | (h < l) | (h < o) | (h < c) | (l > o) | (l > c)
+    if "invalid_ohlc" not in wanted:
+        suspect[:] = False
+    for idx in np.flatnonzero(suspect).tolist():
+        issues.extend(_ohlc_issues(idx, data[idx], timestamp))
+
+    # 3. Check for price anomalies (values > 3 standard deviations)
+    close_raw, close_present, close = columns["close"]
+    if "price_anomaly" in wanted and np.count_nonzero(close_present) > 2:
+        integral = set(map(type, close_raw)) <= {int, type(None)}
+        mean_price, std_price = _mean_stdev(close[close_present], integral)
+        threshold = 3 * std_price
+
+        for idx in np.flatnonzero(close_present & (np.abs(close - mean_price) > threshold)).tolist():
+            value = close_raw[idx]
+            issues.append({
+                "severity": "warning",
+                "category": "price_anomaly",
+                "message": f"Price anomaly detected at index {idx}",
+                "details": {
+                    "record_index": idx,
+                    "close": value,
+                    "mean": round(mean_price, 2),
+                    "std_dev": round(std_price, 2),
+                    "deviation": round(abs(value - mean_price) / std_price, 2)
+                },
+                "timestamp": timestamp
+            })
+
+    # 4. Check for volume anomalies (statistics over positive volumes)
+    volume_raw, volume_present, volume = columns["volume"]
+    positive = volume_present & (volume > 0)
+    if "volume_anomaly" in wanted and np.count_nonzero(positive) > 2:
+        integral = set(map(type, volume_raw)) <= {int, type(None)}
+        mean_volume, std_volume = _mean_stdev(volume[positive], integral)
+        threshold = 3 * std_volume
+
+        for idx in np.flatnonzero(volume_present & (np.abs(volume - mean_volume) > threshold)).tolist():
+            value = volume_raw[idx]
+            issues.append({
+                "severity": "info",
+                "category": "volume_anomaly",
+                "message": f"Unusual volume at index {idx}",
+                "details": {
+                    "record_index": idx,
+                    "volume": value,
+                    "mean": round(mean_volume, 2),
+                    "deviation": round(abs(value - mean_volume) / std_volume, 2)
+                },
+                "timestamp": timestamp
+            })
+
+    # 4b. Rolling detectors: robust return z-scores, split-like jumps and
+    # volume against its trailing average
+    if wanted.intersection(ROLLING_CATEGORIES):
+        issues.extend(_rolling_issues(data, dates, close, volume, wanted, timestamp))
+
+    # Dates are parsed once for the gap and freshness checks
+    dated = [date for date in dates if date is not None]
+    try:
+        days = np.sort(np.array(dated, dtype="datetime64[D]"))
+    except ValueError:
+        days = None
+
+    # 5. Check for date gaps (missing trading sessions)
+    if "date_gaps" in wanted and days is not None:
+        gaps = session_gaps(days, calendar_for(ticker, asset_category))
+        if gaps:
+            issues.append({
+                "severity": "warning",
+                "category": "date_gaps",
+                "message": f"Found {len(gaps)} date gaps in data",
+                "details": {"gaps": gaps[:5]},  # Limit to first 5 gaps
+                "timestamp": timestamp
+            })
+
+    # 6. Check for duplicate dates
+    if "duplicate_dates" in wanted and dated:
+        unique_dates, counts = np.unique(np.array(dated), return_counts=True)
+        duplicates = unique_dates[counts > 1].tolist()
+        if duplicates:
+            issues.append({
+                "severity": "error",
+                "category": "duplicate_dates",
+                "message": f"Found {len(duplicates)} duplicate dates",
+                "details": {"duplicate_dates": duplicates[:10]},  # Limit to first 10
+                "timestamp": timestamp
+            })
+
+    # 7. Check for negative values
+    negative = {field: present[field] & (columns[field][2] < 0) for field in PRICE_FIELDS}
+    negative_rows = np.logical_or.reduce(list(negative.values()))
+    if "negative_values" not in wanted:
+        negative_rows[:] = False
+    for idx in np.flatnonzero(negative_rows).tolist():
+        issues.append({
+            "severity": "error",
+            "category": "negative_values",
+            "message": f"Negative price values at index {idx}",
+            "details": {"record_index": idx, "fields": [field for field in PRICE_FIELDS if negative[field][idx]]},
+            "timestamp": timestamp
+        })
+
+    # 8. Check data freshness
+    if "stale_data" in wanted and days is not None and days.size:
+        latest = days[-1].astype(datetime)
+        latest_date = datetime(latest.year, latest.month, latest.day)
+        days_old = (datetime.now() - latest_date).days
+
+        if days_old > 2:
+            issues.append({
+                "severity": "warning" if days_old > 7 else "info",
+                "category": "stale_data",
+                "message": f"Data is {days_old} days old",
+                "details": {"latest_date": latest_date.strftime("%Y-%m-%d"), "days_old": days_old},
+                "timestamp": timestamp
+            })
+
+    # Determine overall validity (no errors)
+    has_errors = any(issue["severity"] == "error" for issue in issues)
+    is_valid = not has_errors
+
+    return is_valid, issues
+
+
+def aggregate_issues(
+    issues: List[Dict[str, Any]],
+    max_per_category: int = MAX_ISSUES_PER_CATEGORY,
+    sample_rows: int = SAMPLE_ROWS
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-record issues into runs of consecutive record indexes
+
+    Each category's offending records are grouped into runs; a run with a
+    single issue is kept as it is, longer runs become one issue with the
+    index range, counts and the details of the first few rows. At most
+    max_per_category runs are kept per category, the rest are summed up in
+    one overflow issue, so the payload stays bounded however bad the data is.
+    Issues without a record index (gaps, duplicates, freshness) pass through.
+
+    Args:
+        issues: Issues as returned by validate_data
+        max_per_category: Runs kept per category
+        sample_rows: Issue details kept per run
+
+    Returns:
+        Aggregated issues in the same category order
+    """
+    by_category: Dict[str, List[Dict[str, Any]]] = {}
+    passthrough = []
+    for issue in issues:
+        if "record_index" in issue["details"]:
+            by_category.setdefault(issue["category"], []).append(issue)
+        else:
+            passthrough.append(issue)
+
+    aggregated = []
+    for category, category_issues in by_category.items():
+        category_issues.sort(key=lambda issue: issue["details"]["record_index"])
+        indexes = np.array([issue["details"]["record_index"] for issue in category_issues])
+        # Run boundaries: where the index jumps by more than one (repeats stay in the run)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(indexes) > 1) + 1))
+        ends = np.concatenate((starts[1:], [len(indexes)]))
+
+        for start, end in list(zip(starts.tolist(), ends.tolist()))[:max_per_category]:
+            run = category_issues[start:end]
+            if len(run) == 1:
+                aggregated.append(run[0])
+                continue
+            first, last = int(indexes[start]), int(indexes[end - 1])
+            severity = min((issue["severity"] for issue in run), key=SEVERITY_ORDER.index)
+            where = f"index {first}" if first == last else f"indexes {first}-{last}"
+            aggregated.append({
+                "severity": severity,
+                "category": category,
+                "message": f"{len(run)} {category} issues at {where}",
+                "details": {
+                    "record_index": first,
+                    "end_index": last,
+                    "records": last - first + 1,
+                    "issues": len(run),
+                    "samples": [issue["details"] for issue in run[:sample_rows]]
+                },
+                "timestamp": run[0]["timestamp"]
+            })
+
+        if len(starts) > max_per_category:
+            rest = category_issues[starts[max_per_category]:]
+            aggregated.append({
+                "severity": min((issue["severity"] for issue in rest), key=SEVERITY_ORDER.index),
+                "category": category,
+                "message": f"{len(rest)} more {category} issues in {len(starts) - max_per_category} runs",
+                "details": {
+                    "record_index": int(indexes[starts[max_per_category]]),
+                    "end_index": int(indexes[-1]),
+                    "issues": len(rest),
+                    "runs": len(starts) - max_per_category,
+                    "truncated": True
+                },
+                "timestamp": rest[0]["timestamp"]
+            })
+
+    rank = {category: position for position, category in enumerate(CATEGORIES)}
+    aggregated.extend(passthrough)
+    aggregated.sort(key=lambda issue: (rank.get(issue["category"], len(rank)), issue["details"].get("record_index", 0)))
+    return aggregated
+
+
+def _gaps_between(days: np.ndarray, max_days: int = 5) -> List[Dict[str, Any]]:
+    """Gaps between consecutive entries of a sorted datetime64[D] array"""
+    spacing = np.diff(days).astype(np.int64)
+    return [
+        {"from": str(days[i]), "to": str(days[i + 1]), "days": int(spacing[i])}
+        for i in np.flatnonzero(spacing > max_days).tolist()
+    ]
+
+
+def find_session_gaps(dates: List[str], ticker: str, asset_category: str = None) -> List[Dict[str, Any]]:
+    """
+    Find holes where sessions of the ticker's trading calendar are missing
+
+    Args:
+        dates: Dates as YYYY-MM-DD strings (any order)
+        ticker: Ticker symbol
+        asset_category: Category from the assets table (default: guessed from the symbol)
+
+    Returns:
+        List of gaps (from, to, days, missing_sessions), see market_calendar.session_gaps
+    """
+    return session_gaps(np.array(dates, dtype="datetime64[D]"), calendar_for(ticker, asset_category))
+
+
+def find_date_gaps(dates: List[str], max_days: int = 5) -> List[Dict[str, Any]]:
+    """
+    Find holes between consecutive dates
+
+    Args:
+        dates: Dates as YYYY-MM-DD strings (any order)
+        max_days: Largest spacing that is not a gap (trading days are
+            1-3 days apart, accounting for weekends)
+
+    Returns:
+        List of gaps with the dates before/after the hole and the spacing in days
+    """
+    return _gaps_between(np.sort(np.array(dates, dtype="datetime64[D]")), max_days)
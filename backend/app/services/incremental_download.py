@@ -0,0 +1,177 @@
+"""
+Incremental history downloads.
+Instead of re-requesting the whole history window, each ticker only asks for
+what the database is missing: the range after its last stored date and the
+sessions missing from its asset-class trading calendar (holidays and weekends
+are never requested). Requests with the same range are batched together.
+A requested gap is remembered, so a hole the provider has no data for (a
+halt, a date before listing) is not asked for again on every run; it is
+retried after BACKFILL_RETRY_DAYS.
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.database import (
+    get_asset_category,
+    get_backfill_attempts,
+    get_date_ranges,
+    get_stock_dates,
+    record_backfill_attempts,
+)
+from app.services.data_providers import ProviderRegistry, get_registry
+from app.services.data_quality import find_session_gaps
+from app.services.market_calendar import calendar_for, trading_days
+
+logger = logging.getLogger(__name__)
+
+# (start, end) with yf.download semantics: start inclusive, end exclusive
+DateRange = Tuple[datetime, datetime]
+
+# Days before a gap that was already requested is requested again
+BACKFILL_RETRY_DAYS = int(os.getenv("BACKFILL_RETRY_DAYS", "30"))
+
+
+def _range_key(ticker: str, date_range: DateRange) -> Tuple[str, str, str]:
+    return ticker, date_range[0].strftime("%Y-%m-%d"), date_range[1].strftime("%Y-%m-%d")
+
+
+def plan_ranges(
+    tickers: List[str],
+    start_date: datetime,
+    end_date: datetime,
+    backfill_gaps: bool = True,
+    stored: Dict[str, Tuple[str, str]] = None,
+    attempted: Set[Tuple[str, str, str]] = None
+) -> Tuple[Dict[str, List[DateRange]], Dict[str, List[DateRange]]]:
+    """
+    Work out which date ranges each ticker is missing
+
+    Args:
+        tickers: Ticker symbols
+        start_date: Start of the wanted history window
+        end_date: End of the wanted history window
+        backfill_gaps: Also request holes inside the stored history
+        stored: ticker -> (first, last) stored date (default: read from the database)
+        attempted: (ticker, start, end) gap ranges to skip, already requested
+            (default: those requested in the last BACKFILL_RETRY_DAYS)
+
+    Returns:
+        Tuple of (ticker -> list of (start, end) ranges to download, with the
+        full window for tickers with no stored data; ticker -> the gap ranges
+        among them)
+    """
+    stored = get_date_ranges() if stored is None else stored
+    if attempted is None and backfill_gaps:
+        since = datetime.now() - timedelta(days=BACKFILL_RETRY_DAYS)
+        attempted = get_backfill_attempts(since.isoformat())
+    plan = {}
+    backfills = {}
+
+    for ticker in dict.fromkeys(ticker.upper() for ticker in tickers):
+        if ticker not in stored:
+            plan[ticker] = [(start_date, end_date)]
+            continue
+
+        last = datetime.strptime(stored[ticker][1], "%Y-%m-%d")
+        asset_category = get_asset_category(ticker)
+        ranges = []
+        if backfill_gaps:
+            # Runs of missing sessions, from the day after the stored bar before the hole
+            for gap in find_session_gaps(get_stock_dates(ticker), ticker, asset_category):
+                gap_range = (
+                    datetime.strptime(gap["from"], "%Y-%m-%d") + timedelta(days=1),
+                    datetime.strptime(gap["to"], "%Y-%m-%d")
+                )
+                if _range_key(ticker, gap_range) not in attempted:
+                    ranges.append(gap_range)
+            if ranges:
+                backfills[ticker] = list(ranges)
+        tail_start = last + timedelta(days=1)
+        if tail_start.date() <= end_date.date() and _has_session(tail_start, end_date, ticker, asset_category):
+            ranges.append((tail_start, end_date))
+        plan[ticker] = ranges
+
+    return plan, backfills
+
+
+def _has_session(start: datetime, end: datetime, ticker: str, asset_category: str) -> bool:
+    """Check whether the ticker's calendar has a session from start to end (inclusive)"""
+    sessions = trading_days(calendar_for(ticker, asset_category))
+    first, last = np.array([start.date(), end.date()], dtype="datetime64[D]").astype(np.int64)
+    return bool(np.searchsorted(sessions, last, side="right") > np.searchsorted(sessions, first))
+
+
+def download_missing(
+    tickers: List[str],
+    start_date: datetime,
+    end_date: datetime,
+    backfill_gaps: bool = True,
+    registry: ProviderRegistry = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str], Dict[str, int]]:
+    """
+    Download only the missing history of each ticker
+
+    Tickers sharing a range (typically everyone's "since last night" tail)
+    are fetched in one batched provider request.
+
+    Args:
+        tickers: Ticker symbols
+        start_date: Start of the wanted history window
+        end_date: End of the wanted history window
+        backfill_gaps: Also request holes inside the stored history
+        registry: Market data providers (default: shared registry)
+
+    Returns:
+        Tuple of (ticker -> new rows, ticker -> error message,
+        stats with ranges/requests/backfills/up_to_date counts)
+    """
+    registry = registry or get_registry()
+    stored = get_date_ranges()
+    plan, backfills = plan_ranges(tickers, start_date, end_date, backfill_gaps, stored)
+
+    # Group tickers by identical range so each range is one batched request
+    by_range: Dict[DateRange, List[str]] = {}
+    for ticker, ranges in plan.items():
+        for date_range in ranges:
+            by_range.setdefault(date_range, []).append(ticker)
+
+    parts: Dict[str, List[pd.DataFrame]] = {}
+    errors: Dict[str, str] = {}
+    for (start, end), range_tickers in by_range.items():
+        frames, range_errors = registry.fetch_history(range_tickers, start=start, end=end)
+        for ticker, frame in frames.items():
+            parts.setdefault(ticker, []).append(frame)
+        for ticker, error in range_errors.items():
+            # An empty range for a ticker we already hold just means no new bars yet
+            if ticker not in stored:
+                errors[ticker] = error
+
+    # Gaps that were requested and are still empty are not asked for again soon
+    record_backfill_attempts(
+        _range_key(ticker, date_range)
+        for ticker, ranges in backfills.items()
+        for date_range in ranges
+    )
+
+    frames = {}
+    for ticker, ticker_parts in parts.items():
+        df = pd.concat(ticker_parts).sort_index()
+        frames[ticker] = df[~df.index.duplicated(keep="last")]
+
+    stats = {
+        "tickers": len(plan),
+        "ranges": sum(len(ranges) for ranges in plan.values()),
+        "requests": len(by_range),
+        "backfills": sum(len(ranges) for ranges in backfills.values()),
+        "up_to_date": sum(1 for ticker in plan if ticker not in frames and ticker not in errors),
+    }
+    logger.info(
+        f"Incremental download: {stats['ranges']} missing range(s) for {stats['tickers']} tickers "
+        f"in {stats['requests']} request(s), {stats['up_to_date']} already up to date"
+    )
+    return frames, errors, stats
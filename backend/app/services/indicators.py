@@ -0,0 +1,369 @@
+"""
+Technical Indicator Engine
+Server-side versions of the chart indicators in frontend/src/lib/indicators.ts,
+computed as whole-column NumPy/pandas kernels and returned as columnar arrays.
+Rolling windows use pandas rolling/sliding windows, the recursive smoothers
+(EMA, Wilder averages, Heikin-Ashi open) use ewm with adjust=False seeded the
+same way as the frontend. Parabolic SAR and Supertrend are path dependent and
+run as a single pass over plain floats.
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+# Default parameters (same as the frontend)
+RSI_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+BOLLINGER_PERIOD = 20
+BOLLINGER_STDDEV = 2.0
+STOCH_K = 14
+STOCH_D = 3
+ATR_PERIOD = 14
+ADX_PERIOD = 14
+CCI_PERIOD = 20
+SAR_ACCELERATION = 0.02
+SAR_MAXIMUM = 0.2
+SUPERTREND_PERIOD = 10
+SUPERTREND_MULTIPLIER = 3.0
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def to_columns(data: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    OHLCV records as float columns in ascending date order
+
+    Args:
+        data: Bars with date, open, high, low, close, volume (any order)
+
+    Returns:
+        Dict of date (object array) and float64 OHLCV arrays, missing values as NaN
+    """
+    data = sorted(data, key=lambda record: record["date"])
+    columns = {"date": np.array([record["date"] for record in data], dtype=object)}
+    for field in OHLCV_FIELDS:
+        columns[field] = np.array(
+            [np.nan if record.get(field) is None else record[field] for record in data],
+            dtype=np.float64
+        )
+    return columns
+
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def _seeded_smoother(values: np.ndarray, period: int, alpha: float, offset: int = 0) -> np.ndarray:
+    """
+    Exponential smoother seeded with the mean of its first window
+
+    values[offset:offset + period] are averaged into the first output (at
+    offset + period - 1); later outputs are prev + alpha * (value - prev).
+    alpha = 2 / (period + 1) gives an EMA, 1 / period a Wilder average.
+    """
+    result = _nan(len(values))
+    start = offset + period - 1
+    if period < 1 or start >= len(values):
+        return result
+    seeded = values[start:].copy()
+    seeded[0] = values[offset:start + 1].mean()
+    result[start:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result
+
+
+def ema(values: np.ndarray, period: int, offset: int = 0) -> np.ndarray:
+    """EMA seeded with the SMA of the first period values"""
+    return _seeded_smoother(values, period, 2 / (period + 1), offset)
+
+
+def wilder(values: np.ndarray, period: int, offset: int = 0) -> np.ndarray:
+    """Wilder's moving average (RMA) seeded with the mean of the first period values"""
+    return _seeded_smoother(values, period, 1 / period, offset)
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    return pd.Series(values).rolling(period).mean().to_numpy()
+
+
+def true_range(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """True range; the first bar has no previous close and uses high - low"""
+    high, low, close = columns["high"], columns["low"], columns["close"]
+    previous_close = np.concatenate(([np.nan], close[:-1]))
+    # fmax skips the NaN gaps against the missing previous close
+    return np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+
+def calculate_rsi(columns: Dict[str, np.ndarray], period: int = RSI_PERIOD) -> Dict[str, np.ndarray]:
+    """Wilder RSI, first value at index period"""
+    change = np.diff(columns["close"], prepend=np.nan)
+    avg_gain = wilder(np.where(change > 0, change, 0.0), period, offset=1)
+    avg_loss = wilder(np.where(change < 0, -change, 0.0), period, offset=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    rsi[np.isnan(avg_gain)] = np.nan
+    return {"rsi": rsi}
+
+
+def calculate_macd(
+    columns: Dict[str, np.ndarray],
+    fast: int = MACD_FAST,
+    slow: int = MACD_SLOW,
+    signal: int = MACD_SIGNAL
+) -> Dict[str, np.ndarray]:
+    """MACD line, signal EMA (seeded once the MACD line starts) and histogram"""
+    close = columns["close"]
+    macd = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd, signal, offset=max(fast, slow) - 1)
+    return {"macd": macd, "macdSignal": signal_line, "macdHistogram": macd - signal_line}
+
+
+def calculate_bollinger(
+    columns: Dict[str, np.ndarray],
+    period: int = BOLLINGER_PERIOD,
+    stddev: float = BOLLINGER_STDDEV
+) -> Dict[str, np.ndarray]:
+    """Bollinger Bands around the SMA using the population standard deviation"""
+    rolling = pd.Series(columns["close"]).rolling(period)
+    middle = rolling.mean().to_numpy()
+    deviation = rolling.std(ddof=0).to_numpy()
+    return {
+        "bbUpper": middle + stddev * deviation,
+        "bbMiddle": middle,
+        "bbLower": middle - stddev * deviation
+    }
+
+
+def calculate_stochastic(
+    columns: Dict[str, np.ndarray],
+    k_period: int = STOCH_K,
+    d_period: int = STOCH_D
+) -> Dict[str, np.ndarray]:
+    """%K over the high/low range of k_period bars (50 for a flat range), %D its SMA"""
+    highest = pd.Series(columns["high"]).rolling(k_period).max().to_numpy()
+    lowest = pd.Series(columns["low"]).rolling(k_period).min().to_numpy()
+    spread = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(spread == 0, 50.0, (columns["close"] - lowest) / spread * 100)
+    k[np.isnan(spread)] = np.nan
+    return {"stochK": k, "stochD": sma(k, d_period)}
+
+
+def calculate_atr(columns: Dict[str, np.ndarray], period: int = ATR_PERIOD) -> Dict[str, np.ndarray]:
+    """Wilder ATR, first value at index period"""
+    return {"atr": wilder(true_range(columns), period, offset=1)}
+
+
+def calculate_adx(columns: Dict[str, np.ndarray], period: int = ADX_PERIOD) -> Dict[str, np.ndarray]:
+    """Wilder ADX with +DI/-DI; DI from index period, ADX from index 2 * period - 1"""
+    high, low = columns["high"], columns["low"]
+    up = np.diff(high, prepend=np.nan)
+    down = -np.diff(low, prepend=np.nan)
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+
+    tr = wilder(true_range(columns), period, offset=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = wilder(plus_dm, period, offset=1) / tr * 100
+        minus_di = wilder(minus_dm, period, offset=1) / tr * 100
+        dx = np.abs(plus_di - minus_di) / (plus_di + minus_di) * 100
+    return {"adx": wilder(dx, period, offset=period), "plusDI": plus_di, "minusDI": minus_di}
+
+
+def calculate_cci(columns: Dict[str, np.ndarray], period: int = CCI_PERIOD) -> Dict[str, np.ndarray]:
+    """CCI of the typical price against its mean absolute deviation"""
+    typical = (columns["high"] + columns["low"] + columns["close"]) / 3
+    cci = _nan(len(typical))
+    if len(typical) >= period:
+        windows = sliding_window_view(typical, period)
+        mean = windows.mean(axis=1)
+        deviation = np.abs(windows - mean[:, None]).mean(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cci[period - 1:] = (typical[period - 1:] - mean) / (0.015 * deviation)
+    return {"cci": cci}
+
+
+def calculate_obv(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """On-balance volume starting from the first bar's volume"""
+    volume = columns["volume"]
+    direction = np.sign(np.diff(columns["close"], prepend=np.nan))
+    direction[:1] = 1
+    return {"obv": np.cumsum(np.nan_to_num(direction) * volume)}
+
+
+def calculate_vwap(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Cumulative VWAP of the typical price over the whole series"""
+    typical = (columns["high"] + columns["low"] + columns["close"]) / 3
+    volume = columns["volume"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {"vwap": np.cumsum(typical * volume) / np.cumsum(volume)}
+
+
+def calculate_sar(
+    columns: Dict[str, np.ndarray],
+    acceleration: float = SAR_ACCELERATION,
+    maximum: float = SAR_MAXIMUM
+) -> Dict[str, np.ndarray]:
+    """Parabolic SAR (each bar shows the stop carried in from the previous bar)"""
+    high, low = columns["high"].tolist(), columns["low"].tolist()
+    if not high:
+        return {"sar": _nan(0)}
+
+    uptrend = True
+    af = acceleration
+    extreme = high[0]
+    value = low[0]
+    values = [np.nan]
+    for i in range(1, len(high)):
+        values.append(value)
+        if uptrend:
+            value += af * (extreme - value)
+            if low[i] < value:
+                uptrend, value, extreme, af = False, extreme, low[i], acceleration
+            elif high[i] > extreme:
+                extreme, af = high[i], min(af + acceleration, maximum)
+        else:
+            value -= af * (value - extreme)
+            if high[i] > value:
+                uptrend, value, extreme, af = True, extreme, high[i], acceleration
+            elif low[i] < extreme:
+                extreme, af = low[i], min(af + acceleration, maximum)
+    return {"sar": np.array(values, dtype=np.float64)}
+
+
+def calculate_supertrend(
+    columns: Dict[str, np.ndarray],
+    period: int = SUPERTREND_PERIOD,
+    multiplier: float = SUPERTREND_MULTIPLIER
+) -> Dict[str, np.ndarray]:
+    """Supertrend line and direction (1.0 bullish, 0.0 bearish, NaN before the ATR starts)"""
+    atr = calculate_atr(columns, period)["atr"]
+    hl2 = (columns["high"] + columns["low"]) / 2
+    basic_upper = (hl2 + multiplier * atr).tolist()
+    basic_lower = (hl2 - multiplier * atr).tolist()
+    close = columns["close"].tolist()
+
+    n = len(close)
+    supertrend, bullish = _nan(n), _nan(n)
+    start = period  # First bar with an ATR
+    if start >= n:
+        return {"supertrend": supertrend, "supertrendBullish": bullish}
+
+    upper, lower, trend = basic_upper[start], basic_lower[start], True
+    for i in range(start, n):
+        # Bands only tighten unless the previous close broke through them
+        if i > start:
+            if not (basic_upper[i] < upper or close[i - 1] > upper):
+                basic_upper[i] = upper
+            if not (basic_lower[i] > lower or close[i - 1] < lower):
+                basic_lower[i] = lower
+            upper, lower = basic_upper[i], basic_lower[i]
+        trend = close[i] > lower if trend else close[i] >= upper
+        supertrend[i] = lower if trend else upper
+        bullish[i] = 1.0 if trend else 0.0
+    return {"supertrend": supertrend, "supertrendBullish": bullish}
+
+
+def calculate_heikin_ashi(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Heikin-Ashi candles; the first candle is the original bar"""
+    open_, high, low, close = columns["open"], columns["high"], columns["low"], columns["close"]
+    ha_close = (open_ + high + low + close) / 4
+    ha_close[:1] = close[:1]
+    # HA open is the running average of the previous HA open and close
+    previous = np.concatenate((open_[:1], ha_close[:-1]))
+    ha_open = pd.Series(previous).ewm(alpha=0.5, adjust=False).mean().to_numpy()
+    ha_high = np.maximum.reduce([high, ha_open, ha_close])
+    ha_low = np.minimum.reduce([low, ha_open, ha_close])
+    ha_high[:1], ha_low[:1] = high[:1], low[:1]
+    return {"haOpen": ha_open, "haHigh": ha_high, "haLow": ha_low, "haClose": ha_close}
+
+
+# Indicator sets by name (the frontend's indicator toggles plus heikin_ashi)
+INDICATORS: Dict[str, Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]]] = {
+    "sma20": lambda columns: {"sma20": sma(columns["close"], 20)},
+    "sma50": lambda columns: {"sma50": sma(columns["close"], 50)},
+    "sma200": lambda columns: {"sma200": sma(columns["close"], 200)},
+    "ema20": lambda columns: {"ema20": ema(columns["close"], 20)},
+    "rsi": calculate_rsi,
+    "macd": calculate_macd,
+    "bollinger": calculate_bollinger,
+    "stochastic": calculate_stochastic,
+    "atr": calculate_atr,
+    "adx": calculate_adx,
+    "cci": calculate_cci,
+    "obv": calculate_obv,
+    "vwap": calculate_vwap,
+    "sar": calculate_sar,
+    "supertrend": calculate_supertrend,
+    "heikin_ashi": calculate_heikin_ashi,
+}
+
+
+def parse_indicator_set(names: str = None) -> List[str]:
+    """
+    Indicator names from a comma-separated set parameter
+
+    Args:
+        names: e.g. "rsi,macd,bollinger" (None or empty: every indicator)
+
+    Returns:
+        Names in request order
+
+    Raises:
+        ValueError: If a name is not a known indicator
+    """
+    if not names:
+        return list(INDICATORS)
+    selected = list(dict.fromkeys(name.strip().lower() for name in names.split(",") if name.strip()))
+    unknown = [name for name in selected if name not in INDICATORS]
+    if unknown:
+        raise ValueError(
+            f"Unknown indicators: {', '.join(unknown)} (available: {', '.join(INDICATORS)})"
+        )
+    return selected
+
+
+def compute_indicators(columns: Dict[str, np.ndarray], names: Iterable[str]) -> Dict[str, np.ndarray]:
+    """
+    Run the named indicators over OHLCV columns
+
+    Args:
+        columns: Output of to_columns
+        names: Indicator names (keys of INDICATORS)
+
+    Returns:
+        Dict of output column name to float array aligned with columns["date"]
+    """
+    result = {}
+    for name in names:
+        result.update(INDICATORS[name](columns))
+    return result
+
+
+def to_json_columns(arrays: Dict[str, np.ndarray], tail: int = None) -> Dict[str, List]:
+    """
+    Float arrays as JSON-safe lists (NaN and infinities become None)
+
+    Args:
+        arrays: Column name to array
+        tail: Keep only the last tail values of each column
+
+    Returns:
+        Column name to list
+    """
+    result = {}
+    for name, values in arrays.items():
+        if tail is not None:
+            values = values[-tail:] if tail > 0 else values[:0]
+        if values.dtype == object:
+            result[name] = values.tolist()
+            continue
+        finite = np.isfinite(values)
+        result[name] = values.tolist() if finite.all() else np.where(finite, values, None).tolist()
+    return result
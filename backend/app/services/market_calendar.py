@@ -0,0 +1,372 @@
+"""
+Market session calendar.
+Classifies tickers into asset classes and tells whether their market is
+in session, using each exchange's local time:
+- crypto trades around the clock
+- forex (and spot metals) trade Sunday 17:00 to Friday 17:00 New York time
+- futures follow CME Globex: Sunday 18:00 to Friday 17:00 New York time,
+  with a daily break from 17:00 to 18:00
+- stocks, ETFs and indices follow their exchange's regular session
+
+It also holds daily trading calendars per asset class (NYSE holidays for US
+stocks, CME full-day closures for futures, weekdays for FX and other
+exchanges, every day for crypto) as sorted arrays of day numbers (days since
+1970-01-01), so missing sessions in a history are one set difference.
+"""
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+# Asset categories as defined by the asset_category enum (migration 003)
+ASSET_CATEGORIES = ("stock", "crypto", "forex", "commodity", "etf", "index")
+
+# Exchange suffix -> (timezone, open, close) for regular sessions
+EXCHANGE_SESSIONS: Dict[str, Tuple[str, time, time]] = {
+    "": ("America/New_York", time(9, 30), time(16, 0)),      # NYSE / NASDAQ
+    ".TO": ("America/Toronto", time(9, 30), time(16, 0)),    # Toronto
+    ".L": ("Europe/London", time(8, 0), time(16, 30)),       # London
+    ".DE": ("Europe/Berlin", time(9, 0), time(17, 30)),      # XETRA
+    ".PA": ("Europe/Paris", time(9, 0), time(17, 30)),       # Euronext Paris
+    ".AS": ("Europe/Amsterdam", time(9, 0), time(17, 30)),   # Euronext Amsterdam
+    ".IS": ("Europe/Istanbul", time(10, 0), time(18, 0)),    # Borsa Istanbul
+    ".T": ("Asia/Tokyo", time(9, 0), time(15, 0)),           # Tokyo
+    ".HK": ("Asia/Hong_Kong", time(9, 30), time(16, 0)),     # Hong Kong
+    ".AX": ("Australia/Sydney", time(10, 0), time(16, 0)),   # ASX
+}
+
+# Spot metals quoted like crypto pairs but traded on the FX session
+SPOT_METALS = {"XAU-USD", "XAG-USD", "XPT-USD", "XPD-USD"}
+
+# Daily cut-over for FX and futures sessions (New York time)
+FX_ROLLOVER = time(17, 0)
+FUTURES_REOPEN = time(18, 0)
+
+# Years covered by the precomputed trading calendars
+CALENDAR_FIRST_YEAR = 1960
+CALENDAR_LAST_YEAR = datetime.now().year + 2
+
+# Asset category -> trading calendar (stocks on non-US exchanges use "weekdays")
+CATEGORY_CALENDARS = {
+    "stock": "nyse",
+    "etf": "nyse",
+    "index": "nyse",
+    "commodity": "futures",
+    "forex": "fx",
+    "crypto": "crypto",
+}
+
+# Unscheduled NYSE closures (weather, national mourning, 9/11)
+NYSE_SPECIAL_CLOSURES = [
+    date(2001, 9, 11), date(2001, 9, 12), date(2001, 9, 13), date(2001, 9, 14),
+    date(2004, 6, 11), date(2007, 1, 2), date(2012, 10, 29), date(2012, 10, 30),
+    date(2018, 12, 5), date(2025, 1, 9),
+]
+
+
+def classify_symbol(symbol: str) -> str:
+    """
+    Guess the asset category of a ticker from its Yahoo Finance symbol
+
+    Args:
+        symbol: Ticker symbol (e.g., AAPL, BTC-USD, EURUSD=X, GC=F, ^GSPC)
+
+    Returns:
+        One of 'stock', 'crypto', 'forex', 'commodity', 'index'
+    """
+    symbol = symbol.upper()
+
+    if symbol in SPOT_METALS or symbol.endswith("=X"):
+        return "forex"
+    if symbol.endswith("=F"):
+        return "commodity"
+    if symbol.startswith("^"):
+        return "index"
+    if symbol.endswith(("-USD", "-USDT", "-EUR", "-BTC")):
+        return "crypto"
+    return "stock"
+
+
+def exchange_session(symbol: str) -> Tuple[ZoneInfo, time, time]:
+    """
+    Get the regular session of the exchange a stock/ETF/index symbol trades on
+
+    Args:
+        symbol: Ticker symbol; the suffix after the last '.' selects the exchange
+
+    Returns:
+        Tuple of (exchange timezone, open time, close time)
+    """
+    suffix = ""
+    if "." in symbol:
+        suffix = symbol[symbol.rindex("."):].upper()
+    tz_name, open_time, close_time = EXCHANGE_SESSIONS.get(suffix, EXCHANGE_SESSIONS[""])
+    return ZoneInfo(tz_name), open_time, close_time
+
+
+def easter_sunday(year: int) -> date:
+    """Date of Western Easter (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th weekday (0 = Monday) of a month; n = -1 for the last one"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(holiday: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday"""
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+
+def nyse_holidays(year: int) -> List[date]:
+    """
+    Full-day NYSE holidays of a year (regular rules, no special closures)
+
+    Args:
+        year: Calendar year
+
+    Returns:
+        Holiday dates as observed by the exchange
+    """
+    holidays = [
+        _nth_weekday(year, 9, 0, 1),                  # Labor Day
+        _nth_weekday(year, 11, 3, 4),                 # Thanksgiving
+        easter_sunday(year) - timedelta(days=2),      # Good Friday
+        _observed(date(year, 7, 4)),                  # Independence Day
+        _observed(date(year, 12, 25)),                # Christmas
+    ]
+    # New Year's Day falling on a Saturday is not moved to the Friday before
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.append(_observed(new_year))
+    if year >= 1998:
+        holidays.append(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    if year >= 1971:
+        holidays.append(_nth_weekday(year, 2, 0, 3))  # Washington's Birthday
+        holidays.append(_nth_weekday(year, 5, 0, -1))  # Memorial Day
+    else:
+        holidays.append(_observed(date(year, 2, 22)))
+        holidays.append(_observed(date(year, 5, 30)))
+    if year >= 2022:
+        holidays.append(_observed(date(year, 6, 19)))  # Juneteenth
+    return sorted(holidays)
+
+
+def futures_holidays(year: int) -> List[date]:
+    """Days CME Globex is closed all day (other holidays trade a short session)"""
+    holidays = [
+        easter_sunday(year) - timedelta(days=2),
+        _observed(date(year, 12, 25)),
+    ]
+    # As on NYSE, a Saturday New Year's Day is not moved to the Friday before
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.append(_observed(new_year))
+    return sorted(holidays)
+
+
+def _day_numbers(days: List[date]) -> np.ndarray:
+    return np.array(days, dtype="datetime64[D]").astype(np.int64)
+
+
+@lru_cache(maxsize=None)
+def trading_days(calendar: str) -> np.ndarray:
+    """
+    Sessions of a trading calendar as sorted day numbers
+
+    Args:
+        calendar: nyse, futures, fx, weekdays or crypto
+
+    Returns:
+        Read-only int64 array of days since 1970-01-01
+    """
+    first = _day_numbers([date(CALENDAR_FIRST_YEAR, 1, 1)])[0]
+    last = _day_numbers([date(CALENDAR_LAST_YEAR, 12, 31)])[0]
+    days = np.arange(first, last + 1, dtype=np.int64)
+
+    if calendar != "crypto":
+        # 1970-01-01 was a Thursday (weekday 3)
+        days = days[(days + 3) % 7 < 5]
+    years = range(CALENDAR_FIRST_YEAR, CALENDAR_LAST_YEAR + 1)
+    if calendar == "nyse":
+        holidays = [day for year in years for day in nyse_holidays(year)] + NYSE_SPECIAL_CLOSURES
+        days = np.setdiff1d(days, _day_numbers(holidays), assume_unique=False)
+    elif calendar == "futures":
+        days = np.setdiff1d(days, _day_numbers([day for year in years for day in futures_holidays(year)]))
+    elif calendar not in ("fx", "weekdays", "crypto"):
+        raise ValueError(f"Unknown trading calendar: {calendar}")
+
+    days.flags.writeable = False
+    return days
+
+
+def calendar_for(symbol: str, category: Optional[str] = None) -> str:
+    """
+    Pick the trading calendar of a ticker
+
+    Args:
+        symbol: Ticker symbol
+        category: Asset category from the assets table (default: classify_symbol)
+
+    Returns:
+        Calendar name for trading_days
+    """
+    category = category or classify_symbol(symbol)
+    calendar = CATEGORY_CALENDARS.get(category, "weekdays")
+    if calendar == "nyse" and "." in symbol and symbol[symbol.rindex("."):].upper() in EXCHANGE_SESSIONS:
+        # Holidays of other exchanges are not tracked
+        return "weekdays"
+    return calendar
+
+
+def is_trading_day(day: date, calendar: str) -> bool:
+    """Check whether a date is a session of a trading calendar"""
+    sessions = trading_days(calendar)
+    number = _day_numbers([day])[0]
+    position = np.searchsorted(sessions, number)
+    return bool(position < len(sessions) and sessions[position] == number)
+
+
+def session_gaps(days: np.ndarray, calendar: str) -> List[Dict[str, Any]]:
+    """
+    Find the holes in a history where trading sessions are missing
+
+    Missing sessions between the first and last date are the set difference
+    of the calendar and the stored dates; consecutive missing sessions form
+    one gap.
+
+    Args:
+        days: Stored dates as a datetime64[D] array (any order, duplicates allowed)
+        calendar: Calendar name for trading_days
+
+    Returns:
+        List of gaps with the stored dates before/after the hole, the spacing
+        in calendar days and the number of missing sessions
+    """
+    present = np.unique(np.asarray(days, dtype="datetime64[D]").astype(np.int64))
+    if present.size < 2:
+        return []
+    sessions = trading_days(calendar)
+    expected = sessions[np.searchsorted(sessions, present[0]):np.searchsorted(sessions, present[-1], side="right")]
+    missing = np.setdiff1d(expected, present, assume_unique=True)
+    if not missing.size:
+        return []
+
+    # Runs of consecutive calendar sessions
+    positions = np.searchsorted(expected, missing)
+    breaks = np.flatnonzero(np.diff(positions) != 1) + 1
+    run_starts = missing[np.concatenate(([0], breaks))]
+    run_ends = missing[np.concatenate((breaks - 1, [missing.size - 1]))]
+    run_lengths = np.diff(np.concatenate(([0], breaks, [missing.size])))
+    before = present[np.searchsorted(present, run_starts) - 1]
+    after = present[np.searchsorted(present, run_ends)]
+
+    return [
+        {"from": start, "to": end, "days": spacing, "missing_sessions": count}
+        for start, end, spacing, count in zip(
+            before.astype("datetime64[D]").astype(str).tolist(),
+            after.astype("datetime64[D]").astype(str).tolist(),
+            (after - before).tolist(),
+            run_lengths.tolist()
+        )
+    ]
+
+
+def is_market_open(
+    symbol: str,
+    category: Optional[str] = None,
+    now: Optional[datetime] = None
+) -> bool:
+    """
+    Check whether the market for a ticker is currently in session
+
+    Args:
+        symbol: Ticker symbol
+        category: Asset category from the assets table (default: classify_symbol)
+        now: Timezone-aware time to check (default: current time)
+
+    Returns:
+        True if the market is open
+    """
+    category = category or classify_symbol(symbol)
+    now = now or datetime.now(NEW_YORK)
+
+    if category == "crypto":
+        return True
+
+    if category in ("forex", "commodity"):
+        local = now.astimezone(NEW_YORK)
+        if category == "commodity" and not is_trading_day(_session_date(local), "futures"):
+            return False
+        weekday = local.weekday()  # 0 = Monday, 6 = Sunday
+        opens_at = FX_ROLLOVER if category == "forex" else FUTURES_REOPEN
+
+        if weekday == 5:
+            return False
+        if weekday == 6:
+            return local.time() >= opens_at
+        if weekday == 4:
+            return local.time() < FX_ROLLOVER
+        if category == "commodity":
+            # Globex daily maintenance break
+            return not (FX_ROLLOVER <= local.time() < FUTURES_REOPEN)
+        return True
+
+    # Stocks, ETFs and indices: regular session in exchange time
+    tz, open_time, close_time = exchange_session(symbol)
+    local = now.astimezone(tz)
+    if local.weekday() >= 5:
+        return False
+    if calendar_for(symbol, category) == "nyse" and not is_trading_day(local.date(), "nyse"):
+        return False
+    return open_time <= local.time() < close_time
+
+
+def _session_date(local: datetime) -> date:
+    """Trading date of a Globex session (sessions opening in the evening belong to the next day)"""
+    if local.time() >= FUTURES_REOPEN:
+        return local.date() + timedelta(days=1)
+    return local.date()
+
+
+def trading_date(when: datetime, category: Optional[str] = None) -> date:
+    """
+    Trading date a bar time belongs to
+
+    Bar times are taken in the timezone they carry (yfinance reports bars in
+    the exchange's timezone, the same one its daily bars are dated in);
+    Globex evening sessions count for the next day.
+
+    Args:
+        when: Bar time
+        category: Asset category (default: the date of when)
+
+    Returns:
+        Trading date
+    """
+    if category == "commodity" and when.tzinfo is not None:
+        return _session_date(when.astimezone(NEW_YORK))
+    return when.date()
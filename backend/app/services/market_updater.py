@@ -1,73 +1,376 @@
 """
 Market data updater service.
-Fetches price updates from yfinance and broadcasts via Redis.
+Fetches price updates through the market data provider registry (yfinance by
+default, with priority failover) and broadcasts via Redis.
+Each ticker is polled on its own schedule: at the open-market interval of its
+asset class while its market is in session, and slowly (or not at all)
+while it is closed.
+The polled set follows demand: tickers with live WebSocket subscribers,
+tickers in any watchlist, and a configurable pinned set.
+Updates are only published when the latest bar changed (and, optionally,
+moved by more than a significance threshold).
+Each fetched bar also advances O(1) streaming daily indicators (RSI, EMA, MACD,
+Bollinger) per ticker, published with the price update.
+Tickers that keep failing are backed off by per-ticker circuit breakers whose
+outcomes are persisted to asset_data_sources when PostgreSQL is configured.
+When several processes run an updater they coordinate through the broker
+(see coordination.py) so each ticker is fetched and published once.
 """
 import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List
-import yfinance as yf
+from typing import List, Dict, Any, Optional, Set, Tuple
+import pandas as pd
+from app.database import get_stock_data
+from app.services.batch_fetcher import BATCH_SIZE, chunked
 from app.services.broadcaster import broadcaster
+from app.services.circuit_breaker import CircuitBreakerRegistry
+from app.services.coordination import UpdaterCoordinator
+from app.services.data_providers import ProviderRegistry, get_registry
+from app.services.market_calendar import ASSET_CATEGORIES, classify_symbol, is_market_open
+from app.services.streaming_indicators import StreamingIndicators
 
 logger = logging.getLogger(__name__)
 
+# Max number of blocking fetches running at once
+FETCH_CONCURRENCY = int(os.getenv("MARKET_UPDATER_CONCURRENCY", "8"))
+
+# Per-category polling interval while the market is open (default: update_interval),
+# e.g. POLL_INTERVAL_CRYPTO=10, POLL_INTERVAL_FOREX=30
+OPEN_POLL_INTERVALS = {
+    category: int(os.environ[f"POLL_INTERVAL_{category.upper()}"])
+    for category in ASSET_CATEGORIES
+    if f"POLL_INTERVAL_{category.upper()}" in os.environ
+}
+
+# Polling interval while the market is closed (0 = do not poll closed markets)
+CLOSED_POLL_INTERVAL = int(os.getenv("POLL_INTERVAL_CLOSED", "900"))
+
+# How often a closed, unpolled ticker re-checks whether its session opened
+SESSION_RECHECK_INTERVAL = 60
+
+# Minimum close move since the last published bar for an update to be published
+# (absolute price change and/or basis points; 0 = publish any change)
+PUBLISH_MIN_CHANGE_ABS = float(os.getenv("PUBLISH_MIN_CHANGE_ABS", "0"))
+PUBLISH_MIN_CHANGE_BPS = float(os.getenv("PUBLISH_MIN_CHANGE_BPS", "0"))
+
+# Bar fields compared to detect unchanged updates
+BAR_FIELDS = ("bar_time", "open", "high", "low", "close", "volume")
+
+# Minimum seconds between batched writes of fetch outcomes to asset_data_sources
+FETCH_RESULTS_PERSIST_INTERVAL = int(os.getenv("FETCH_RESULTS_PERSIST_INTERVAL", "60"))
+
+# Tickers always polled regardless of subscribers/watchlists (comma separated)
+PINNED_TICKERS = [
+    ticker.strip().upper()
+    for ticker in os.getenv("MARKET_UPDATER_PINNED", "").split(",")
+    if ticker.strip()
+]
+
+# Whether this process fetches data; API workers behind a dedicated updater
+# process (run_updater.py) set this to false and only announce their demand
+POLLING_ENABLED = os.getenv("MARKET_UPDATER_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# Whether price updates carry live indicator values
+LIVE_INDICATORS_ENABLED = os.getenv("LIVE_INDICATORS_ENABLED", "1").lower() not in ("0", "false", "no")
+
+def stored_closes(ticker: str, bars: int) -> List[Tuple[str, float]]:
+    """Last stored daily (date, close) bars of a ticker, oldest first (seeds its live indicators)"""
+    return [(row["date"], row["close"]) for row in reversed(get_stock_data(ticker, bars))]
+
+
 class MarketUpdater:
     """
     Background service to fetch market data and broadcast updates
     """
 
-    def __init__(self, update_interval: int = 15):
+    def __init__(
+        self,
+        update_interval: int = 15,
+        concurrency: int = FETCH_CONCURRENCY,
+        providers: ProviderRegistry = None,
+        batch_size: int = BATCH_SIZE,
+        open_intervals: Dict[str, int] = None,
+        closed_interval: int = CLOSED_POLL_INTERVAL,
+        min_change_abs: float = PUBLISH_MIN_CHANGE_ABS,
+        min_change_bps: float = PUBLISH_MIN_CHANGE_BPS,
+        coordinator: UpdaterCoordinator = None
+    ):
         """
         Initialize market updater
 
         Args:
             update_interval: Update interval in seconds (default 15)
+            concurrency: Max concurrent fetches (default MARKET_UPDATER_CONCURRENCY)
+            providers: Market data providers (default: the shared registry, built on first fetch)
+            batch_size: Symbols per batched quote request (default YFINANCE_BATCH_SIZE)
+            open_intervals: Per-category interval while the market is open
+            closed_interval: Interval while the market is closed (0 = no polling)
+            min_change_abs: Minimum absolute close move to publish (0 = any change)
+            min_change_bps: Minimum close move in basis points to publish (0 = any change)
+            coordinator: Cross-process coordination (default: MARKET_UPDATER_COORDINATION mode)
         """
         self.update_interval = update_interval
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.open_intervals = {
+            **{category: update_interval for category in ASSET_CATEGORIES},
+            **(OPEN_POLL_INTERVALS if open_intervals is None else open_intervals)
+        }
+        self.closed_interval = closed_interval
+        self.min_change_abs = min_change_abs
+        self.min_change_bps = min_change_bps
         self.is_running = False
         self.tickers = []
+        self.categories: Dict[str, str] = {}
+        self.next_due: Dict[str, float] = {}
+        self.poll_stats = {"polled": 0, "skipped_closed": 0, "skipped_circuit_open": 0}
+        self.breakers = CircuitBreakerRegistry()
+        self._last_persist = time.monotonic()
+        self.last_published: Dict[str, Dict[str, Any]] = {}
+        self.publish_counts = {"published": 0, "suppressed_unchanged": 0, "suppressed_threshold": 0}
+        self.indicators = StreamingIndicators(history=stored_closes) if LIVE_INDICATORS_ENABLED else None
 
-    def set_tickers(self, tickers: List[str]):
+        # Demand sources for the polled ticker set
+        self.subscriber_counts: Dict[str, int] = {}
+        self.watchlist_tickers: Set[str] = set()
+        self.pinned_tickers: Set[str] = set()
+        # Tickers demanded by other updater processes
+        self.remote_tickers: Set[str] = set()
+        self.coordinator = coordinator or UpdaterCoordinator(polls=POLLING_ENABLED)
+        self.set_tickers(PINNED_TICKERS)
+        self.last_cycle_stats: Dict[str, Any] = {}
+        self._request_count = 0
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency,
+            thread_name_prefix="market-fetch"
+        )
+        self._providers = providers
+
+    @property
+    def providers(self) -> ProviderRegistry:
+        """Provider registry used for fetching (rate limits and failover live there)"""
+        if self._providers is None:
+            self._providers = get_registry()
+        return self._providers
+
+    def set_tickers(self, tickers: List[str], categories: Dict[str, str] = None):
         """
-        Set list of tickers to monitor
+        Set list of pinned tickers to monitor regardless of subscribers and watchlists
+
+        Newly added tickers are due immediately; existing ones keep their schedule.
 
         Args:
             tickers: List of ticker symbols
+            categories: Optional ticker -> asset category (default: guessed from the symbol)
         """
-        self.tickers = [ticker.upper() for ticker in tickers]
+        for ticker, category in (categories or {}).items():
+            self.categories[ticker.upper()] = category
+        new_tickers = {ticker.upper() for ticker in tickers}
+        changed = new_tickers ^ self.pinned_tickers
+        self.pinned_tickers = new_tickers
+        self._refresh_demand(changed)
         logger.info(f"Monitoring {len(self.tickers)} tickers: {self.tickers}")
 
+    def is_locally_demanded(self, ticker: str) -> bool:
+        """Check whether this process's subscribers, watchlists or pins need the ticker"""
+        return (
+            self.subscriber_counts.get(ticker, 0) > 0
+            or ticker in self.watchlist_tickers
+            or ticker in self.pinned_tickers
+        )
+
+    def is_demanded(self, ticker: str) -> bool:
+        """Check whether any demand source (in any updater process) needs the ticker polled"""
+        return self.is_locally_demanded(ticker) or ticker in self.remote_tickers
+
+    def _refresh_demand(self, tickers):
+        """Add or drop tickers from the polled set after their demand changed"""
+        for ticker in tickers:
+            demanded = self.is_demanded(ticker)
+            if demanded and ticker not in self.next_due:
+                self.tickers.append(ticker)
+                self.next_due[ticker] = 0.0
+                # New demand gets the current bar even if it has not changed
+                self.last_published.pop(ticker, None)
+                logger.info(f"Started polling {ticker}")
+            elif not demanded and ticker in self.next_due:
+                self.tickers.remove(ticker)
+                del self.next_due[ticker]
+                if self.indicators:
+                    self.indicators.drop(ticker)
+                logger.info(f"Stopped polling {ticker}")
+
+    def add_subscriber(self, ticker: str):
+        """
+        Register a live WebSocket subscriber for a ticker
+
+        Args:
+            ticker: Ticker symbol
+        """
+        ticker = ticker.upper()
+        self.subscriber_counts[ticker] = self.subscriber_counts.get(ticker, 0) + 1
+        self._refresh_demand([ticker])
+
+    def remove_subscriber(self, ticker: str):
+        """
+        Unregister a WebSocket subscriber for a ticker
+
+        Args:
+            ticker: Ticker symbol
+        """
+        ticker = ticker.upper()
+        count = self.subscriber_counts.get(ticker, 0) - 1
+        if count > 0:
+            self.subscriber_counts[ticker] = count
+        else:
+            self.subscriber_counts.pop(ticker, None)
+        self._refresh_demand([ticker])
+
+    def set_watchlist_tickers(self, tickers: List[str], categories: Dict[str, str] = None):
+        """
+        Replace the set of tickers found in watchlists
+
+        Args:
+            tickers: Ticker symbols in any watchlist
+            categories: Optional ticker -> asset category
+        """
+        for ticker, category in (categories or {}).items():
+            self.categories[ticker.upper()] = category
+        new_tickers = {ticker.upper() for ticker in tickers}
+        changed = new_tickers ^ self.watchlist_tickers
+        self.watchlist_tickers = new_tickers
+        self._refresh_demand(changed)
+
+    def category_for(self, ticker: str) -> str:
+        """Get the asset category of a ticker"""
+        if ticker not in self.categories:
+            self.categories[ticker] = classify_symbol(ticker)
+        return self.categories[ticker]
+
+    def poll_interval(self, ticker: str, now: datetime = None) -> Optional[int]:
+        """
+        Get the polling interval for a ticker given its market session
+
+        Args:
+            ticker: Ticker symbol
+            now: Time to evaluate the session at (default: current time)
+
+        Returns:
+            Interval in seconds, or None if the ticker should not be polled now
+        """
+        category = self.category_for(ticker)
+        if is_market_open(ticker, category, now):
+            return self.open_intervals.get(category, self.update_interval)
+        return self.closed_interval or None
+
+    def due_tickers(self) -> List[str]:
+        """
+        Get the tickers due for polling and schedule their next poll
+
+        Returns:
+            List of tickers to fetch now
+        """
+        now = time.monotonic()
+        wall_now = datetime.now().astimezone()
+        due = []
+
+        # Ownership only changes at a heartbeat: unowned tickers wait for the next one
+        unowned_recheck = now + max(min(self.coordinator.seconds_until_heartbeat(), self.update_interval), 1.0)
+
+        for ticker in self.tickers:
+            if self.next_due.get(ticker, 0.0) > now:
+                continue
+            if not self.coordinator.owns(ticker):
+                self.next_due[ticker] = unowned_recheck
+                continue
+
+            interval = self.poll_interval(ticker, wall_now)
+            if interval is None:
+                # Market closed and closed polling disabled: re-check the session later
+                self.next_due[ticker] = now + SESSION_RECHECK_INTERVAL
+                self.poll_stats["skipped_closed"] += 1
+                continue
+
+            self.next_due[ticker] = now + interval
+            if not self.breakers.allow(ticker, now):
+                # Failing ticker backing off: keep it out of fetch slots and rate budget
+                self.poll_stats["skipped_circuit_open"] += 1
+                continue
+            due.append(ticker)
+
+        self.poll_stats["polled"] += len(due)
+        return due
+
+    def seconds_until_next_due(self) -> float:
+        """Seconds until the next ticker is due or heartbeat is needed (capped at update_interval)"""
+        wait = self.update_interval
+        if self.next_due:
+            wait = min(wait, max(min(self.next_due.values()) - time.monotonic(), 0.1))
+        return min(wait, max(self.coordinator.seconds_until_heartbeat(), 0.1))
+
+    async def coordinate(self):
+        """
+        Heartbeat to the other updater processes and adopt their demand
+
+        Announces this process's demand, refreshes membership and leadership,
+        and adds tickers demanded elsewhere to the polled set (they are only
+        fetched here if this member owns them).
+        """
+        if not self.coordinator.heartbeat_due():
+            return
+
+        demand = {
+            ticker: self.category_for(ticker)
+            for ticker in self.tickers
+            if self.is_locally_demanded(ticker)
+        }
+        try:
+            self.coordinator.heartbeat(broadcaster.broker, demand)
+        except Exception as e:
+            if self.coordinator.connected:
+                logger.error(f"Market updater heartbeat failed: {e}")
+            else:
+                logger.warning(f"Market updater broker unreachable, polling standalone: {e}")
+            return
+
+        remote = self.coordinator.demand()
+        for ticker, category in remote.items():
+            self.categories.setdefault(ticker, category)
+        remote_tickers = set(remote)
+        changed = remote_tickers ^ self.remote_tickers
+        self.remote_tickers = remote_tickers
+        self._refresh_demand(changed)
+
     async def fetch_latest_price(self, ticker: str):
         """
         Fetch latest price data for a ticker
 
+        Runs the blocking provider call (which waits for the source's rate
+        limit) on the fetch worker pool so the event loop stays free.
+
         Args:
             ticker: Stock ticker symbol
 
         Returns:
             Dict with price data or None if failed
         """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._fetch_latest_price_sync, ticker)
+
+    def _fetch_latest_price_sync(self, ticker: str):
+        """Blocking provider fetch for one ticker (runs on the worker pool)"""
         try:
-            stock = yf.Ticker(ticker)
-            # Get latest data (1 day)
-            hist = stock.history(period="1d", interval="1m")
+            bars, errors = self.providers.fetch_latest([ticker])
 
-            if hist.empty:
-                logger.warning(f"No data returned for {ticker}")
+            if ticker not in bars:
+                logger.warning(f"No data returned for {ticker}: {errors.get(ticker)}")
                 return None
 
-            # Get the most recent data point
-            latest = hist.iloc[-1]
-
-            price_data = {
-                "ticker": ticker,
-                "open": float(latest["Open"]),
-                "high": float(latest["High"]),
-                "low": float(latest["Low"]),
-                "close": float(latest["Close"]),
-                "volume": int(latest["Volume"]),
-                "timestamp": datetime.now().isoformat()
-            }
+            price_data = self._price_data(ticker, bars[ticker])
 
             logger.debug(f"Fetched {ticker}: ${price_data['close']:.2f}")
             return price_data
@@ -76,6 +379,85 @@ class MarketUpdater:
             logger.error(f"Failed to fetch price for {ticker}: {e}")
             return None
 
+    async def fetch_latest_prices(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch latest price data for many tickers with batched requests
+
+        Tickers are grouped into chunks of `batch_size`, each fetched with one
+        provider request. The registry already fails missing symbols over to
+        lower-priority providers, so they are not requested again here.
+
+        Args:
+            tickers: Ticker symbols
+
+        Returns:
+            Dict of ticker -> price data for tickers that returned data
+        """
+        chunks = list(chunked(tickers, self.batch_size))
+        results = await asyncio.gather(
+            *(self._fetch_chunk(chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        prices: Dict[str, Dict[str, Any]] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Batch fetch failed for {len(chunk)} tickers: {result}")
+            else:
+                prices.update(result)
+
+        self._request_count = len(chunks)
+        return prices
+
+    async def _fetch_chunk(self, chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch one batch of tickers on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._fetch_chunk_sync, chunk)
+
+    def _fetch_chunk_sync(self, chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Blocking batched provider fetch (runs on the worker pool)"""
+        bars, _ = self.providers.fetch_latest(chunk)
+        return {ticker: self._price_data(ticker, bar) for ticker, bar in bars.items()}
+
+    @staticmethod
+    def _price_data(ticker: str, bar: pd.Series) -> Dict[str, Any]:
+        """Build the price data dict from a 1-minute OHLCV bar"""
+        return {
+            "ticker": ticker,
+            "open": float(bar["Open"]),
+            "high": float(bar["High"]),
+            "low": float(bar["Low"]),
+            "close": float(bar["Close"]),
+            "volume": int(bar["Volume"]) if pd.notna(bar["Volume"]) else 0,
+            "bar_time": bar.name.isoformat() if hasattr(bar.name, "isoformat") else None,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def suppression_reason(self, ticker: str, price_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Check whether an update should be suppressed
+
+        Args:
+            ticker: Ticker symbol
+            price_data: Fetched price data
+
+        Returns:
+            "unchanged", "below_threshold", or None if the update should be published
+        """
+        last = self.last_published.get(ticker)
+        if last is None:
+            return None
+
+        if all(last.get(field) == price_data.get(field) for field in BAR_FIELDS):
+            return "unchanged"
+
+        move = abs(price_data["close"] - last["close"])
+        if move < self.min_change_abs:
+            return "below_threshold"
+        if last["close"] and move / abs(last["close"]) * 10000 < self.min_change_bps:
+            return "below_threshold"
+        return None
+
     async def update_all_tickers(self):
         """
         Update all monitored tickers and broadcast updates
@@ -84,23 +466,146 @@ class MarketUpdater:
             logger.warning("No tickers to update")
             return
 
-        logger.info(f"Updating {len(self.tickers)} tickers...")
+        await self.update_tickers(self.tickers)
 
-        for ticker in self.tickers:
-            try:
-                # Fetch latest price
-                price_data = await self.fetch_latest_price(ticker)
+    async def update_tickers(self, tickers: List[str]):
+        """
+        Update the given tickers and broadcast updates
 
-                if price_data:
-                    # Broadcast update via Redis
-                    await broadcaster.publish_price_update(ticker, price_data)
+        Args:
+            tickers: Ticker symbols to fetch and publish
+        """
+        logger.info(f"Updating {len(tickers)} tickers...")
+        cycle_start = time.perf_counter()
 
-                    # Also cache the latest price
-                    cache_key = f"latest:{ticker}"
-                    await broadcaster.cache_set(cache_key, price_data, ttl=60)
+        # Fetch all tickers in concurrent batches (bounded by the worker pool and rate limiter)
+        prices = await self.fetch_latest_prices(tickers)
 
-            except Exception as e:
-                logger.error(f"Error updating {ticker}: {e}")
+        fetch_ms = (time.perf_counter() - cycle_start) * 1000
+
+        # Successes count for the provider that served the ticker (failover may
+        # have used a fallback). The circuit state lives on the primary provider's
+        # row: failures are counted there, any success resets it, and a restart
+        # restores from it
+        primary = self.providers.names[0]
+        for ticker in tickers:
+            if ticker in prices:
+                self.breakers.record_success(
+                    ticker, self.providers.served_by.get(ticker, primary), primary=primary
+                )
+            else:
+                self.breakers.record_failure(ticker, "No data returned", source=primary)
+        await self.persist_fetch_results()
+
+        if self.indicators:
+            # First bar of a ticker: warm its indicators up from stored history
+            unseeded = [ticker for ticker in prices if ticker not in self.indicators.tickers]
+            if unseeded:
+                loop = asyncio.get_running_loop()
+                await asyncio.gather(*(
+                    loop.run_in_executor(self.executor, self.indicators.seed, ticker)
+                    for ticker in unseeded
+                ))
+
+        # Publish only changed bars; unchanged ones just refresh the latest-price cache
+        updates = []
+        unchanged = []
+        suppressed = {"unchanged": 0, "below_threshold": 0}
+        for ticker in tickers:
+            price_data = prices.get(ticker)
+            if not price_data:
+                continue
+            if self.indicators:
+                # Every fetched bar advances the indicators, published or not
+                price_data["indicators"] = self.indicators.update(
+                    ticker, price_data, self.category_for(ticker)
+                )
+            reason = self.suppression_reason(ticker, price_data)
+            if reason:
+                suppressed[reason] += 1
+                unchanged.append((ticker, price_data))
+            else:
+                updates.append((ticker, price_data))
+                self.last_published[ticker] = price_data
+
+        # Broadcast updates and cache latest prices in pipelined batches
+        publish_stats = await broadcaster.publish_price_updates(updates, ttl=60, cache_only=unchanged)
+
+        self.publish_counts["published"] += publish_stats["published"]
+        self.publish_counts["suppressed_unchanged"] += suppressed["unchanged"]
+        self.publish_counts["suppressed_threshold"] += suppressed["below_threshold"]
+
+        cycle_ms = (time.perf_counter() - cycle_start) * 1000
+        overran = cycle_ms > self.update_interval * 1000
+
+        self.last_cycle_stats = {
+            "tickers": len(tickers),
+            "monitored": len(self.tickers),
+            "fetched": len(prices),
+            "suppressed_unchanged": suppressed["unchanged"],
+            "suppressed_threshold": suppressed["below_threshold"],
+            "concurrency": self.concurrency,
+            "fetch_requests": self._request_count,
+            "provider_requests": dict(self.providers.request_counts),
+            "fetch_ms": round(fetch_ms, 2),
+            "cycle_ms": round(cycle_ms, 2),
+            "overran": overran,
+            "finished_at": datetime.now().isoformat(),
+            **publish_stats
+        }
+        logger.info(
+            f"Cycle done in {cycle_ms:.0f}ms: {publish_stats['published']}/{len(tickers)} "
+            f"published ({suppressed['unchanged']} unchanged, "
+            f"{suppressed['below_threshold']} below threshold) in {publish_stats['round_trips']} round trips "
+            f"(serialize {publish_stats['serialize_ms']}ms, broker {publish_stats['broker_ms']}ms)"
+        )
+        if overran:
+            logger.warning(
+                f"Update cycle took {cycle_ms / 1000:.1f}s, longer than the "
+                f"{self.update_interval}s interval"
+            )
+
+    async def persist_fetch_results(self, force: bool = False):
+        """
+        Write buffered fetch outcomes to asset_data_sources in one batch (requires PostgreSQL)
+
+        Args:
+            force: Write now instead of waiting for FETCH_RESULTS_PERSIST_INTERVAL
+        """
+        if not os.getenv("DATABASE_URL"):
+            return
+        if not force and time.monotonic() - self._last_persist < FETCH_RESULTS_PERSIST_INTERVAL:
+            return
+
+        self._last_persist = time.monotonic()
+        rows = self.breakers.drain_pending()
+        if not rows:
+            return
+
+        from app.database_pg import record_fetch_results
+
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, record_fetch_results, rows)
+            logger.debug(f"Persisted fetch results for {len(rows)} tickers")
+        except Exception as e:
+            logger.error(f"Failed to persist fetch results: {e}")
+
+    async def restore_circuit_state(self):
+        """Re-open circuits for tickers that were failing before a restart (requires PostgreSQL)"""
+        if not os.getenv("DATABASE_URL"):
+            return
+
+        from app.database_pg import get_fetch_error_counts
+
+        try:
+            loop = asyncio.get_running_loop()
+            error_counts = await loop.run_in_executor(
+                self.executor, get_fetch_error_counts, self.providers.names[0]
+            )
+            self.breakers.restore(error_counts)
+        except Exception as e:
+            logger.error(f"Failed to restore circuit breaker state: {e}")
 
     async def start(self):
         """
@@ -111,15 +616,24 @@ class MarketUpdater:
             return
 
         self.is_running = True
-        logger.info(f"Starting market updater (interval: {self.update_interval}s)")
+        logger.info(
+            f"Starting market updater (open interval: {self.update_interval}s, "
+            f"closed interval: {self.closed_interval or 'off'}, "
+            f"coordination: {self.coordinator.mode}, polling: {self.coordinator.polls})"
+        )
 
         # Connect broadcaster to Redis
         await broadcaster.connect()
+        await self.restore_circuit_state()
 
         while self.is_running:
             try:
-                await self.update_all_tickers()
-                await asyncio.sleep(self.update_interval)
+                await self.coordinate()
+                due = self.due_tickers()
+                if due:
+                    await self.update_tickers(due)
+                # Sleep until the next ticker is due
+                await asyncio.sleep(self.seconds_until_next_due())
             except Exception as e:
                 logger.error(f"Error in market updater loop: {e}")
                 await asyncio.sleep(self.update_interval)
@@ -130,25 +644,24 @@ class MarketUpdater:
         """
         logger.info("Stopping market updater")
         self.is_running = False
+        await self.persist_fetch_results(force=True)
+        try:
+            self.coordinator.release(broadcaster.broker)
+        except Exception as e:
+            logger.error(f"Failed to leave updater group: {e}")
         await broadcaster.disconnect()
 
-    def is_market_open(self) -> bool:
+    def is_market_open(self, ticker: str = "^GSPC") -> bool:
         """
-        Check if US market is currently open
+        Check if the market for a ticker is currently open (default: US equities)
+
+        Args:
+            ticker: Ticker symbol
 
         Returns:
             True if market is open
         """
-        now = datetime.now()
-        weekday = now.weekday()  # 0 = Monday, 6 = Sunday
-
-        # Market closed on weekends
-        if weekday >= 5:
-            return False
-
-        # Market hours: 9:30 AM - 4:00 PM ET (simplified check)
-        hour = now.hour
-        return 9 <= hour < 16
+        return is_market_open(ticker, self.category_for(ticker.upper()))
 
 
 # Global updater instance
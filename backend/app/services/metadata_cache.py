@@ -0,0 +1,135 @@
+"""
+Asset metadata fetching with a persistent cache.
+Symbol metadata (.info) is fetched once per symbol with bounded concurrency
+through the provider registry and stored in a JSON-lines file, so repeated
+seeding runs and different callers (names, sector data) share one fetch.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app.services.data_providers import ProviderRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+
+METADATA_CACHE_PATH = os.getenv("METADATA_CACHE_PATH", "data/metadata_cache.jsonl")
+
+# Seconds a cached entry stays fresh (default one week)
+METADATA_CACHE_TTL = int(os.getenv("METADATA_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Concurrent metadata requests (the registry still enforces rate limits)
+METADATA_FETCH_WORKERS = int(os.getenv("METADATA_FETCH_WORKERS", "8"))
+
+
+class MetadataCache:
+    """
+    Append-only JSON-lines cache of symbol metadata
+
+    Each line is {"symbol", "fetched_at", "info"}; the last line for a
+    symbol wins. The file is compacted on load when it holds stale lines.
+    """
+
+    def __init__(self, path: str = METADATA_CACHE_PATH, ttl: int = METADATA_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        lines = 0
+        with open(self.path) as f:
+            for line in f:
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry["symbol"]] = entry
+                except (ValueError, KeyError):
+                    continue  # Torn write from an interrupted run
+        if lines > len(self.entries) * 2:
+            self._compact()
+
+    def _compact(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, default=str) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Get cached metadata if present and fresh"""
+        entry = self.entries.get(symbol)
+        if entry and time.time() - entry["fetched_at"] < self.ttl:
+            return entry["info"]
+        return None
+
+    def put(self, symbol: str, info: Dict):
+        """Cache metadata and append it to the file"""
+        entry = {"symbol": symbol, "fetched_at": time.time(), "info": info}
+        with self._lock:
+            self.entries[symbol] = entry
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry, default=str) + "\n")
+
+
+def fetch_infos(
+    symbols: List[str],
+    cache: MetadataCache = None,
+    workers: int = METADATA_FETCH_WORKERS,
+    registry: ProviderRegistry = None
+) -> Dict[str, Dict]:
+    """
+    Get metadata for many symbols, fetching each uncached symbol once
+
+    Args:
+        symbols: Ticker symbols (duplicates are fetched once)
+        cache: Metadata cache (default: METADATA_CACHE_PATH)
+        workers: Concurrent fetches
+        registry: Market data providers (default: shared registry)
+
+    Returns:
+        Dict of symbol -> info (empty dict if no provider had metadata)
+    """
+    cache = cache or MetadataCache()
+    registry = registry or get_registry()
+    symbols = list(dict.fromkeys(symbols))
+
+    infos = {}
+    missing = []
+    for symbol in symbols:
+        info = cache.get(symbol)
+        if info is None:
+            missing.append(symbol)
+        else:
+            infos[symbol] = info
+
+    def fetch(symbol: str) -> Dict:
+        try:
+            info = registry.fetch_info(symbol)
+        except Exception as e:
+            logger.warning(f"Failed to fetch metadata for {symbol}: {e}")
+            return {}
+        if info:
+            cache.put(symbol, info)
+        return info
+
+    if missing:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metadata") as pool:
+            for symbol, info in zip(missing, pool.map(fetch, missing)):
+                infos[symbol] = info
+        logger.info(
+            f"Fetched metadata for {len(missing)} symbols in {time.perf_counter() - started:.1f}s "
+            f"({len(symbols) - len(missing)} from cache)"
+        )
+
+    return infos
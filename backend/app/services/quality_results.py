@@ -0,0 +1,82 @@
+"""
+Persisted data quality results.
+Record-level issues (missing fields, OHLC relationships, negative prices) and
+date gaps only depend on a bar and its neighbours, so they are computed when
+bars are stored (see database.insert_stock_data) and read back per request.
+Rules that depend on the requested window (anomaly statistics, duplicates)
+or on the clock (freshness) still run on the returned rows.
+"""
+import logging
+from typing import Any, Dict, List, Tuple
+
+from app.database import get_asset_category, get_quality_results, revalidate_quality
+from app.services.data_quality import CATEGORIES, WINDOW_CATEGORIES, validate_data
+
+logger = logging.getLogger(__name__)
+
+
+def validate_window(data: List[Dict[str, Any]], ticker: str) -> Tuple[bool, List[Dict[str, Any]]]:
+    """
+    Data quality issues for a window of stored bars
+
+    Gives the same issues as validate_data(data, ticker) for a contiguous
+    window read from the database, without re-running the record-level rules.
+
+    Args:
+        data: Stored bars (any order) with date, open, high, low, close, volume
+        ticker: Stock ticker symbol
+
+    Returns:
+        Tuple of (is_valid: bool, issues: List[Dict])
+    """
+    if not data:
+        return validate_data(data, ticker)
+
+    dates = [record["date"] for record in data]
+    start_date, end_date = min(dates), max(dates)
+    stored = get_quality_results(ticker, start_date, end_date)
+    if stored is None:
+        # Bars stored before results were persisted: validate the history once
+        logger.info(f"Validating stored history of {ticker}")
+        revalidate_quality(ticker)
+        stored = get_quality_results(ticker, start_date, end_date) or []
+
+    index = {date: idx for idx, date in enumerate(dates)}
+    issues = []
+    gaps = []
+    for result in stored:
+        if result["category"] == "date_gaps":
+            # Gaps are keyed by the bar after the hole; both ends must be in the window
+            if result["details"]["from"] >= start_date:
+                gaps.append(result["details"])
+            continue
+        idx = index[result["date"]]
+        issues.append({
+            "severity": result["severity"],
+            "category": result["category"],
+            "message": result["message"].format(record_index=idx),
+            "details": {**result["details"], "record_index": idx},
+            "timestamp": result["validated_at"]
+        })
+
+    if gaps:
+        gaps.sort(key=lambda gap: gap["from"])
+        issues.append({
+            "severity": "warning",
+            "category": "date_gaps",
+            "message": f"Found {len(gaps)} date gaps in data",
+            "details": {"gaps": gaps[:5]},  # Limit to first 5 gaps
+            "timestamp": max(result["validated_at"] for result in stored if result["category"] == "date_gaps")
+        })
+
+    _, window_issues = validate_data(
+        data, ticker, categories=WINDOW_CATEGORIES, asset_category=get_asset_category(ticker)
+    )
+    issues.extend(window_issues)
+
+    # Same order as validate_data: by rule, then by record
+    rank = {category: position for position, category in enumerate(CATEGORIES)}
+    issues.sort(key=lambda issue: (rank[issue["category"]], issue["details"].get("record_index", 0)))
+
+    is_valid = not any(issue["severity"] == "error" for issue in issues)
+    return is_valid, issues
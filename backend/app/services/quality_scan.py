@@ -0,0 +1,119 @@
+"""
+Universe-wide data quality scan.
+Runs every validate_data rule over each ticker's full stored history on a
+process pool (one task per ticker, handed out in chunks). Workers only read
+and compute; the parent process writes the per-ticker summaries, so SQLite
+sees a single writer. The summaries back /api/data-quality/summary.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List
+
+from app.database import get_all_stocks, get_asset_category, get_stock_history, save_quality_summaries
+from app.services.data_quality import validate_data
+
+logger = logging.getLogger(__name__)
+
+# Worker processes for the scan (the rules are CPU bound)
+SCAN_WORKERS = int(os.getenv("QUALITY_SCAN_WORKERS", str(os.cpu_count() or 2)))
+
+# Tickers handed to a worker per task, and summaries written per transaction
+SCAN_CHUNK_SIZE = int(os.getenv("QUALITY_SCAN_CHUNK_SIZE", "8"))
+SAVE_BATCH_SIZE = 200
+
+SEVERITY_RANK = {"error": 0, "warning": 1, "info": 2}
+
+# Categories listed in a summary's worst_categories
+WORST_CATEGORIES = 3
+
+
+def summarize(ticker: str, data: List[Dict[str, Any]], issues: List[Dict[str, Any]], scan_ms: float) -> Dict:
+    """
+    Condense a ticker's issues into its scan summary
+
+    Categories rank by their most severe issue, then by issue count.
+    """
+    counts = {"error": 0, "warning": 0, "info": 0}
+    categories: Dict[str, int] = {}
+    category_rank: Dict[str, int] = {}
+    for issue in issues:
+        counts[issue["severity"]] += 1
+        category = issue["category"]
+        categories[category] = categories.get(category, 0) + 1
+        category_rank[category] = min(category_rank.get(category, 2), SEVERITY_RANK[issue["severity"]])
+
+    worst = sorted(categories, key=lambda category: (category_rank[category], -categories[category]))
+    return {
+        "ticker": ticker,
+        "rows": len(data),
+        "first_date": data[0]["date"] if data else None,
+        "last_date": data[-1]["date"] if data else None,
+        "is_valid": counts["error"] == 0,
+        "errors": counts["error"],
+        "warnings": counts["warning"],
+        "info": counts["info"],
+        "categories": categories,
+        "worst_categories": worst[:WORST_CATEGORIES],
+        "scanned_at": datetime.now().isoformat(),
+        "scan_ms": round(scan_ms, 2),
+    }
+
+
+def scan_ticker(ticker: str) -> Dict:
+    """Validate one ticker's full history (runs in a worker process)"""
+    try:
+        started = time.perf_counter()
+        data = get_stock_history(ticker)
+        _, issues = validate_data(data, ticker, asset_category=get_asset_category(ticker))
+        return summarize(ticker, data, issues, (time.perf_counter() - started) * 1000)
+    except Exception as e:
+        return {"ticker": ticker, "error": str(e)}
+
+
+def run_scan(
+    tickers: List[str] = None,
+    workers: int = SCAN_WORKERS,
+    chunk_size: int = SCAN_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Scan tickers and store their summaries
+
+    Args:
+        tickers: Ticker symbols (default: every ticker in the database)
+        workers: Worker processes
+        chunk_size: Tickers per worker task
+
+    Returns:
+        Stats with scanned/failed counts, elapsed seconds and per-ticker errors
+    """
+    tickers = get_all_stocks() if tickers is None else list(dict.fromkeys(tickers))
+    started = time.perf_counter()
+    stats = {"scanned": 0, "failed": 0, "errors": {}}
+    logger.info(f"Data quality scan: {len(tickers)} tickers on {workers} workers")
+
+    batch = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(scan_ticker, tickers, chunksize=chunk_size):
+            if "error" in result:
+                stats["failed"] += 1
+                stats["errors"][result["ticker"]] = result["error"]
+                logger.error(f"Scan failed for {result['ticker']}: {result['error']}")
+                continue
+            batch.append(result)
+            if len(batch) >= SAVE_BATCH_SIZE:
+                save_quality_summaries(batch)
+                stats["scanned"] += len(batch)
+                batch = []
+    if batch:
+        save_quality_summaries(batch)
+        stats["scanned"] += len(batch)
+
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    logger.info(
+        f"Data quality scan finished in {stats['seconds']}s: "
+        f"{stats['scanned']} scanned, {stats['failed']} failed"
+    )
+    return stats
@@ -0,0 +1,90 @@
+"""
+Token bucket rate limiter for external data sources.
+Usable from the event loop (acquire) and from worker threads (acquire_blocking).
+"""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket limiting requests to a data source
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each request takes one token and waits when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (default: one second worth of tokens, min 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _take(self, tokens: float) -> float:
+        """Take tokens if available; return 0 on success or the seconds to wait"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) / self.rate
+
+    async def acquire(self, tokens: float = 1.0):
+        """
+        Wait until `tokens` are available and take them (event loop)
+
+        Args:
+            tokens: Number of tokens to take (default 1)
+        """
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def acquire_blocking(self, tokens: float = 1.0):
+        """
+        Wait until `tokens` are available and take them (worker threads and scripts)
+
+        Args:
+            tokens: Number of tokens to take (default 1)
+        """
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """
+        Take `tokens` if available without waiting
+
+        Returns:
+            True if the tokens were taken
+        """
+        return self._take(tokens) == 0.0
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """
+        Seconds until `tokens` are available, without taking them
+
+        Returns:
+            0 if the tokens could be taken now
+        """
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self.tokens) / self.rate)
@@ -0,0 +1,378 @@
+"""
+Streaming technical indicators for live bars.
+Each indicator keeps O(1) state (seeded EMA/Wilder averages, running sums
+over a fixed window) and gives the same values as app.services.indicators
+over the same bars, so a price update costs a few float operations instead
+of a pass over the whole window.
+Indicators run on daily bars, the timeframe of the stored history and of
+the charts: push() commits a finished day, peek() gives the values as if
+the forming day closed at the given price without changing any state. The
+market updater's 1-minute bars only move the forming day's close; a day is
+committed when the trading date rolls over.
+A ticker's state is seeded from its stored daily bars through the batch
+engine, so values are warm from the first live bar.
+"""
+import logging
+import math
+from collections import deque
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.indicators import (
+    BOLLINGER_PERIOD,
+    BOLLINGER_STDDEV,
+    MACD_FAST,
+    MACD_SIGNAL,
+    MACD_SLOW,
+    RSI_PERIOD,
+    ema,
+    wilder,
+)
+from app.services.market_calendar import trading_date
+
+logger = logging.getLogger(__name__)
+
+EMA_PERIOD = 20
+
+# Bars between exact re-sums of a rolling window (bounds floating point drift)
+RESUM_INTERVAL = 1000
+
+# Stored daily bars used to seed a ticker (enough for the EMAs to converge)
+SEED_BARS = 500
+
+
+def parse_bar_time(bar_time: Optional[str]) -> Optional[datetime]:
+    """Timezone-aware ISO bar time (naive times are taken as UTC; None if unparseable)"""
+    if not bar_time:
+        return None
+    try:
+        parsed = datetime.fromisoformat(bar_time)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class SeededSmoother:
+    """
+    Exponential smoother seeded with the mean of its first period values
+
+    alpha = 2 / (period + 1) gives an EMA, 1 / period a Wilder average.
+    """
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.count = 0
+        self.total = 0.0
+        self.value: Optional[float] = None
+
+    def peek(self, x: float) -> Optional[float]:
+        """Value after x, without committing it (None while warming up)"""
+        if self.value is not None:
+            return self.value + self.alpha * (x - self.value)
+        if self.count == self.period - 1:
+            return (self.total + x) / self.period
+        return None
+
+    def push(self, x: float) -> Optional[float]:
+        """Commit x and return the new value"""
+        value = self.peek(x)
+        if self.value is None:
+            self.count += 1
+            self.total += x
+        self.value = value
+        return value
+
+
+class StreamingEMA(SeededSmoother):
+    def __init__(self, period: int):
+        super().__init__(period, 2 / (period + 1))
+
+
+class StreamingWilder(SeededSmoother):
+    def __init__(self, period: int):
+        super().__init__(period, 1 / period)
+
+
+class StreamingRSI:
+    """Wilder RSI over close-to-close changes"""
+
+    def __init__(self, period: int = RSI_PERIOD):
+        self.gain = StreamingWilder(period)
+        self.loss = StreamingWilder(period)
+        self.previous: Optional[float] = None
+
+    def peek(self, close: float) -> Optional[float]:
+        if self.previous is None:
+            return None
+        change = close - self.previous
+        avg_gain = self.gain.peek(max(change, 0.0))
+        avg_loss = self.loss.peek(max(-change, 0.0))
+        if avg_gain is None:
+            return None
+        return 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def push(self, close: float) -> Optional[float]:
+        value = self.peek(close)
+        if self.previous is not None:
+            change = close - self.previous
+            self.gain.push(max(change, 0.0))
+            self.loss.push(max(-change, 0.0))
+        self.previous = close
+        return value
+
+
+class StreamingMACD:
+    """MACD line, signal EMA (fed once the MACD line starts) and histogram"""
+
+    def __init__(self, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+
+    def peek(self, close: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        fast, slow = self.fast.peek(close), self.slow.peek(close)
+        if fast is None or slow is None:
+            return None, None, None
+        macd = fast - slow
+        signal = self.signal.peek(macd)
+        return macd, signal, None if signal is None else macd - signal
+
+    def push(self, close: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        value = self.peek(close)
+        self.fast.push(close)
+        self.slow.push(close)
+        if value[0] is not None:
+            self.signal.push(value[0])
+        return value
+
+
+class StreamingBollinger:
+    """
+    Bollinger Bands from a running sum and sum of squares over the window
+
+    Values are shifted by the first close seen so the sums stay small, and
+    the sums are recomputed from the window every RESUM_INTERVAL bars.
+    """
+
+    def __init__(self, period: int = BOLLINGER_PERIOD, stddev: float = BOLLINGER_STDDEV):
+        self.period = period
+        self.stddev = stddev
+        self.window: deque = deque(maxlen=period)
+        self.shift: Optional[float] = None
+        self.total = 0.0
+        self.squares = 0.0
+        self.pushes = 0
+
+    def _bands(self, shift: float, total: float, squares: float) -> Tuple[float, float, float]:
+        mean = total / self.period
+        deviation = math.sqrt(max(squares / self.period - mean * mean, 0.0))
+        middle = shift + mean
+        return middle + self.stddev * deviation, middle, middle - self.stddev * deviation
+
+    def peek(self, close: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        if len(self.window) < self.period - 1:
+            return None, None, None
+        shift = close if self.shift is None else self.shift
+        x = close - shift
+        total, squares = self.total + x, self.squares + x * x
+        if len(self.window) == self.period:
+            oldest = self.window[0]
+            total, squares = total - oldest, squares - oldest * oldest
+        return self._bands(shift, total, squares)
+
+    def push(self, close: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        value = self.peek(close)
+        if self.shift is None:
+            self.shift = close
+        x = close - self.shift
+        if len(self.window) == self.period:
+            oldest = self.window[0]
+            self.total -= oldest
+            self.squares -= oldest * oldest
+        self.window.append(x)
+        self.total += x
+        self.squares += x * x
+
+        self.pushes += 1
+        if self.pushes % RESUM_INTERVAL == 0:
+            self.total = math.fsum(self.window)
+            self.squares = math.fsum(v * v for v in self.window)
+        return value
+
+
+class TickerIndicators:
+    """
+    Live daily indicators of one ticker
+
+    Intraday bars are mapped to their trading date: bars of the current
+    day only update the forming close, the first bar of a later day commits
+    the previous day's last close.
+    """
+
+    def __init__(self):
+        self.rsi = StreamingRSI()
+        self.ema = StreamingEMA(EMA_PERIOD)
+        self.macd = StreamingMACD()
+        self.bollinger = StreamingBollinger()
+        self.session: Optional[date] = None
+        self.bar_time: Optional[datetime] = None
+        self.close: Optional[float] = None
+        self.bars = 0
+
+    def seed(self, bars: Iterable[Tuple[str, float]]):
+        """
+        Warm the state up with stored daily bars (oldest first)
+
+        The last bar becomes the forming day: live bars of the same date
+        replace its close, a later date commits it. For the others the
+        smoothers take their last values from the batch engine and the
+        Bollinger window their last closes, which is the state pushing every
+        close would leave. Short histories are simply pushed.
+
+        Args:
+            bars: (YYYY-MM-DD date, close) pairs
+        """
+        bars = [(day, close) for day, close in bars if close is not None and not math.isnan(close)]
+        if not bars:
+            return
+        last_day, last_close = bars[-1]
+        closes = np.asarray([close for _, close in bars[:-1]], dtype=np.float64)
+        self.session = date.fromisoformat(str(last_day)[:10])
+        self.close = float(last_close)
+
+        warm_up = max(MACD_SLOW + MACD_SIGNAL, RSI_PERIOD + 1, EMA_PERIOD, BOLLINGER_PERIOD)
+        if len(closes) < warm_up:
+            for close in closes.tolist():
+                self._commit(close)
+            return
+
+        change = np.diff(closes, prepend=np.nan)
+        self.rsi.gain.value = float(wilder(np.where(change > 0, change, 0.0), RSI_PERIOD, offset=1)[-1])
+        self.rsi.loss.value = float(wilder(np.where(change < 0, -change, 0.0), RSI_PERIOD, offset=1)[-1])
+        self.rsi.previous = float(closes[-1])
+        self.ema.value = float(ema(closes, EMA_PERIOD)[-1])
+
+        fast, slow = ema(closes, self.macd.fast.period), ema(closes, self.macd.slow.period)
+        self.macd.fast.value, self.macd.slow.value = float(fast[-1]), float(slow[-1])
+        start = max(self.macd.fast.period, self.macd.slow.period) - 1
+        self.macd.signal.value = float(ema(fast - slow, self.macd.signal.period, offset=start)[-1])
+
+        for close in closes[-self.bollinger.period:].tolist():
+            self.bollinger.push(close)
+        self.bars = len(closes)
+
+    def _commit(self, close: float):
+        self.rsi.push(close)
+        self.ema.push(close)
+        self.macd.push(close)
+        self.bollinger.push(close)
+        self.bars += 1
+
+    def values(self, close: float) -> Dict[str, Optional[float]]:
+        """Indicator values with close as the forming day's close (None while warming up)"""
+        macd, signal, histogram = self.macd.peek(close)
+        upper, middle, lower = self.bollinger.peek(close)
+        return {
+            "rsi": self.rsi.peek(close),
+            f"ema{EMA_PERIOD}": self.ema.peek(close),
+            "macd": macd,
+            "macdSignal": signal,
+            "macdHistogram": histogram,
+            "bbUpper": upper,
+            "bbMiddle": middle,
+            "bbLower": lower,
+        }
+
+    def update(
+        self,
+        bar_time: Optional[str],
+        close: float,
+        category: Optional[str] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Advance with a fetched intraday bar and return the current values
+
+        Args:
+            bar_time: ISO bar start (None or unparseable: counts for the forming day)
+            close: Latest close of the bar
+            category: Asset category (selects how bar times map to trading dates)
+
+        Returns:
+            Indicator values including the forming day
+        """
+        # Compare instants, not strings ("Z" vs "+00:00", other offsets)
+        when = parse_bar_time(bar_time)
+        if when is not None and self.bar_time is not None and when < self.bar_time:
+            # Older bar from a lagging provider: keep the current one
+            return self.values(self.close)
+
+        session = self.session if when is None else trading_date(when, category)
+        if self.close is not None and session is not None and self.session is not None:
+            if session < self.session:
+                # Bar of a day before the stored forming day (e.g. before the open)
+                return self.values(self.close)
+            if session > self.session:
+                self._commit(self.close)
+        if when is not None:
+            self.bar_time = when
+        self.session, self.close = session, close
+        return self.values(close)
+
+
+class StreamingIndicators:
+    """Live indicator state per ticker"""
+
+    def __init__(self, history: Callable[[str, int], List[Tuple[str, float]]] = None):
+        """
+        Args:
+            history: Loader of a ticker's last n stored daily (date, close)
+                bars, oldest first (None: tickers start cold)
+        """
+        self.history = history
+        self.tickers: Dict[str, TickerIndicators] = {}
+
+    def seed(self, ticker: str) -> TickerIndicators:
+        """
+        Create a ticker's state warmed up from its stored history
+
+        Blocking (reads the database); the updater runs it on its worker pool.
+        """
+        state = TickerIndicators()
+        if self.history is not None:
+            try:
+                state.seed(self.history(ticker, SEED_BARS))
+            except Exception as e:
+                logger.warning(f"Could not seed indicators for {ticker}: {e}")
+        self.tickers[ticker] = state
+        return state
+
+    def update(
+        self,
+        ticker: str,
+        price_data: Dict[str, Any],
+        category: Optional[str] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Advance a ticker's indicators with fetched price data
+
+        Args:
+            ticker: Ticker symbol
+            price_data: Price data with bar_time and close
+            category: Asset category of the ticker
+
+        Returns:
+            Indicator values for the price update
+        """
+        state = self.tickers.get(ticker)
+        if state is None:
+            state = self.tickers[ticker] = TickerIndicators()
+        return state.update(price_data.get("bar_time"), price_data["close"], category)
+
+    def drop(self, ticker: str):
+        """Forget a ticker's state (it is no longer polled)"""
+        self.tickers.pop(ticker, None)
@@ -0,0 +1,91 @@
+"""
+Bulk History Downloader
+Downloads history for a large ticker universe with parallel fetches, a single
+database writer and a resumable checkpoint.
+
+Usage:
+    python bulk_download.py TICKER [TICKER2 ...]
+    python bulk_download.py --file tickers.txt
+    python bulk_download.py --from-assets    (all active assets, requires DATABASE_URL)
+
+Rerunning the same command resumes from the checkpoint; --restart starts over.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+
+from app.database import init_db
+from app.services.batch_fetcher import BATCH_SIZE
+from app.services.bulk_downloader import (
+    DEFAULT_CHECKPOINT, DOWNLOAD_RETRIES, DOWNLOAD_WORKERS, BulkDownloader
+)
+
+logging.basicConfig(level=logging.INFO)
+
+
+def load_tickers(args) -> list:
+    tickers = list(args.tickers)
+    if args.file:
+        with open(args.file) as f:
+            tickers.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if args.from_assets:
+        if not os.getenv("DATABASE_URL"):
+            print("[ERROR] --from-assets requires DATABASE_URL")
+            sys.exit(1)
+        from app.database_pg import get_all_stocks
+        tickers.extend(get_all_stocks())
+    return tickers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Download history for many tickers')
+    parser.add_argument('tickers', nargs='*', help='Ticker symbols')
+    parser.add_argument('--file', help='File with one ticker per line')
+    parser.add_argument('--from-assets', action='store_true', help='Download every active asset')
+    parser.add_argument('--years', type=int, default=15, help='Years of history (default 15)')
+    parser.add_argument('--incremental', action='store_true', help='Only download missing dates')
+    parser.add_argument('--workers', type=int, default=DOWNLOAD_WORKERS, help='Concurrent fetch tasks')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Tickers per fetch task')
+    parser.add_argument('--retries', type=int, default=DOWNLOAD_RETRIES, help='Retry rounds for failures')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='Checkpoint file')
+    parser.add_argument('--restart', action='store_true', help='Ignore the existing checkpoint')
+    args = parser.parse_args()
+
+    tickers = load_tickers(args)
+    if not tickers:
+        parser.print_help()
+        sys.exit(1)
+
+    init_db()
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=365 * args.years)
+    downloader = BulkDownloader(
+        start_date,
+        end_date,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        retries=args.retries,
+        incremental=args.incremental
+    )
+    results = downloader.run(tickers)
+
+    failed = {ticker: result for ticker, result in results.items() if result["status"] != "done"}
+    print("\n" + "=" * 60)
+    print(f"[OK] Done: {downloader.stats['done']} ({downloader.stats['rows']} new rows)")
+    print(f"[OK] Skipped (already done): {downloader.stats['skipped']}")
+    print(f"[FAIL] Failed: {len(failed)}")
+    for ticker, result in failed.items():
+        print(f"   - {ticker}: {result.get('error')}")
+    print("=" * 60)
+    if failed:
+        print(f"Rerun the same command to retry the failures (checkpoint: {args.checkpoint})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-import yfinance as yf
 from app.database import init_db, insert_stock_data
+from app.services.data_providers import get_registry
 from datetime import datetime, timedelta
 
 # Initialize database
@@ -23,11 +23,14 @@ start_date = end_date - timedelta(days=365*15)
 
 print(f"[DOWNLOAD] Downloading stock data from {start_date.date()} to {end_date.date()}")
 
+frames, errors = get_registry().fetch_history(STOCKS, start=start_date, end=end_date)
+
 for ticker in STOCKS:
     print(f"\n[DOWNLOAD] Downloading {ticker}...")
     try:
-        df = yf.download(ticker, start=start_date, end=end_date, progress=False)
-        insert_stock_data(ticker, df)
+        if ticker in errors:
+            raise ValueError(errors[ticker])
+        insert_stock_data(ticker, frames[ticker])
         print(f"[OK] {ticker} completed")
     except Exception as e:
         print(f"[ERROR] Error downloading {ticker}: {e}")
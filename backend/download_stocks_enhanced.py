@@ -1,12 +1,25 @@
 """
 Enhanced Stock & Metal Data Downloader
 Downloads historical data for stocks, metals, commodities, and crypto
+
+Usage: python download_stocks_enhanced.py [--incremental] [--restart]
+--incremental only downloads bars after each ticker's last stored date and
+holes found by the date-gap check (for nightly refreshes).
+
+Downloads run in parallel and progress is checkpointed to
+data/download_checkpoint.json: an interrupted run resumes where it stopped
+unless --restart is given.
 """
+import logging
+import os
+import sys
 
-import yfinance as yf
-from app.database import init_db, insert_stock_data
+from app.database import init_db
+from app.services.bulk_downloader import DEFAULT_CHECKPOINT, BulkDownloader
 from datetime import datetime, timedelta
 
+logging.basicConfig(level=logging.INFO)
+
 # Initialize database
 init_db()
 
@@ -108,6 +121,8 @@ for category, tickers in ASSETS.items():
 
 # Download configuration
 YEARS_OF_DATA = 15
+INCREMENTAL = "--incremental" in sys.argv[1:]
+RESTART = "--restart" in sys.argv[1:]
 end_date = datetime.now()
 start_date = end_date - timedelta(days=365 * YEARS_OF_DATA)
 
@@ -116,9 +131,17 @@ print("DEPO STOCK & METAL DATABASE BUILDER")
 print("=" * 80)
 print(f"Date Range: {start_date.date()} to {end_date.date()}")
 print(f"Total Assets: {len(ALL_TICKERS)}")
+if INCREMENTAL:
+    print("Mode: incremental (missing dates only)")
 print("=" * 80)
 
-# Download by category for better organization
+# Download every asset with parallel fetches and a single database writer
+print(f"\n⬇️  Downloading {len(ALL_TICKERS)} assets...")
+if RESTART and os.path.exists(DEFAULT_CHECKPOINT):
+    os.remove(DEFAULT_CHECKPOINT)
+results = BulkDownloader(start_date, end_date, incremental=INCREMENTAL).run(ALL_TICKERS)
+
+# Report by category for better organization
 success_count = 0
 error_count = 0
 errors = []
@@ -129,23 +152,15 @@ for category, tickers in ASSETS.items():
     print('=' * 80)
 
     for ticker in tickers:
-        try:
-            print(f"\n⬇️  Downloading {ticker}...", end=" ")
-            df = yf.download(ticker, start=start_date, end=end_date, progress=False)
-
-            if df.empty:
-                print(f"❌ No data available")
-                error_count += 1
-                errors.append((ticker, "No data available"))
-            else:
-                insert_stock_data(ticker, df)
-                print(f"✅ {len(df)} records")
-                success_count += 1
-
-        except Exception as e:
-            print(f"❌ Error: {str(e)}")
+        result = results[ticker]
+        if result["status"] == "done":
+            print(f"💾 {ticker}... ✅ {result.get('rows', 0)} new records")
+            success_count += 1
+        else:
+            error = result.get("error") or "not downloaded"
+            print(f"💾 {ticker}... ❌ {error}")
             error_count += 1
-            errors.append((ticker, str(e)))
+            errors.append((ticker, error))
 
 # Summary
 print("\n" + "=" * 80)
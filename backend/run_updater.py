@@ -0,0 +1,48 @@
+"""
+Dedicated market updater process for DEPO Financial Dashboard
+Runs the market updater outside the API workers. Start the API with
+MARKET_UPDATER_ENABLED=false so its workers only announce their demand
+(WebSocket subscribers, watchlists) and this process does the polling.
+Several of these can run with MARKET_UPDATER_COORDINATION=shard.
+"""
+import asyncio
+import logging
+import os
+
+from app.services.market_updater import market_updater
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_watchlist_demand():
+    """Feed the tickers found in watchlists to the market updater (requires PostgreSQL)"""
+    if not os.getenv("DATABASE_URL"):
+        return
+
+    from app.database_pg import get_watchlist_symbols
+
+    try:
+        rows = get_watchlist_symbols()
+        market_updater.set_watchlist_tickers(
+            [row['symbol'] for row in rows],
+            {row['symbol']: row['category'] for row in rows}
+        )
+    except Exception as e:
+        logger.error(f"Failed to load watchlist tickers: {e}")
+
+
+async def main():
+    market_updater.coordinator.polls = True
+    load_watchlist_demand()
+    try:
+        await market_updater.start()
+    finally:
+        await market_updater.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Market updater stopped")
@@ -0,0 +1,42 @@
+"""
+Universe Data Quality Scan
+Runs the data quality rules over every stored ticker on a process pool and
+stores per-ticker summaries, served by /api/data-quality/summary.
+
+Usage:
+    python scan_quality.py                (every ticker in the database)
+    python scan_quality.py AAPL MSFT      (selected tickers)
+"""
+import argparse
+import logging
+
+from app.database import init_db
+from app.services.quality_scan import SCAN_CHUNK_SIZE, SCAN_WORKERS, run_scan
+
+logging.basicConfig(level=logging.INFO)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scan stored history for data quality issues')
+    parser.add_argument('tickers', nargs='*', help='Ticker symbols (default: all stored tickers)')
+    parser.add_argument('--workers', type=int, default=SCAN_WORKERS, help='Worker processes')
+    parser.add_argument('--chunk-size', type=int, default=SCAN_CHUNK_SIZE, help='Tickers per worker task')
+    args = parser.parse_args()
+
+    init_db()
+    stats = run_scan(
+        [ticker.upper() for ticker in args.tickers] or None,
+        workers=args.workers,
+        chunk_size=args.chunk_size
+    )
+
+    print("\n" + "=" * 60)
+    print(f"[OK] Scanned: {stats['scanned']} tickers in {stats['seconds']}s")
+    print(f"[FAIL] Failed: {stats['failed']}")
+    for ticker, error in stats["errors"].items():
+        print(f"   - {ticker}: {error}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Live indicators seeded from daily history and advanced with 1-minute bars
+must match the batch engine over daily closes.
+Run from backend/: python -m pytest tests
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.indicators import calculate_bollinger, calculate_macd, calculate_rsi, ema
+from app.services.streaming_indicators import EMA_PERIOD, TickerIndicators
+
+
+def daily_bars(n: int = 120, last_day: date = date(2024, 3, 14)):
+    rng = np.random.default_rng(7)
+    closes = 100 + np.cumsum(rng.normal(0, 1, n))
+    days = [(last_day - timedelta(days=n - 1 - i)).isoformat() for i in range(n)]
+    return list(zip(days, closes.tolist()))
+
+
+def batch_values(closes):
+    columns = {"close": np.asarray(closes, dtype=np.float64)}
+    macd = calculate_macd(columns)
+    bollinger = calculate_bollinger(columns)
+    return {
+        "rsi": calculate_rsi(columns)["rsi"][-1],
+        f"ema{EMA_PERIOD}": ema(columns["close"], EMA_PERIOD)[-1],
+        "macd": macd["macd"][-1],
+        "macdSignal": macd["macdSignal"][-1],
+        "macdHistogram": macd["macdHistogram"][-1],
+        "bbUpper": bollinger["bbUpper"][-1],
+        "bbMiddle": bollinger["bbMiddle"][-1],
+        "bbLower": bollinger["bbLower"][-1],
+    }
+
+
+def assert_matches(values, closes):
+    expected = batch_values(closes)
+    for name, value in expected.items():
+        assert values[name] == pytest.approx(value, rel=1e-9), name
+
+
+def test_minute_bars_of_the_stored_day_only_move_the_forming_close():
+    bars = daily_bars()
+    closes = [close for _, close in bars]
+    state = TickerIndicators()
+    state.seed(bars)
+
+    for minute, close in enumerate([101.5, 99.25, 100.75, 102.0]):
+        values = state.update(f"2024-03-14T10:{minute:02d}:00-04:00", close)
+        assert_matches(values, closes[:-1] + [close])
+    assert state.bars == len(bars) - 1
+
+
+def test_minute_bars_commit_a_day_only_when_the_date_rolls_over():
+    bars = daily_bars()
+    closes = [close for _, close in bars]
+    state = TickerIndicators()
+    state.seed(bars)
+
+    state.update("2024-03-14T15:58:00-04:00", 98.5)
+    state.update("2024-03-14T15:59:00-04:00", 98.0)
+    for minute, close in enumerate([97.0, 96.5, 97.25]):
+        values = state.update(f"2024-03-15T09:{30 + minute}:00-04:00", close)
+        assert_matches(values, closes[:-1] + [98.0, close])
+    assert state.bars == len(bars)
+
+
+def test_older_bars_do_not_replace_the_forming_close():
+    bars = daily_bars()
+    closes = [close for _, close in bars]
+    state = TickerIndicators()
+    state.seed(bars)
+
+    state.update("2024-03-14T14:00:00Z", 103.0)
+    values = state.update("2024-03-14T09:59:00-04:00", 90.0)
+    assert_matches(values, closes[:-1] + [103.0])
+    # A bar of the day before the stored forming day is ignored as well
+    fresh = TickerIndicators()
+    fresh.seed(bars)
+    assert_matches(fresh.update("2024-03-13T15:59:00-04:00", 90.0), closes)
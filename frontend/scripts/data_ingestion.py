@@ -1,17 +1,30 @@
-
 import os
-import csv
+import io
+import time
+import queue
 import logging
 import argparse
+import threading
 import psycopg2
-from psycopg2.extras import execute_values
-from datetime import datetime
+import pandas as pd
 from pathlib import Path
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("DataIngestion")
 
+# Rows parsed and written per chunk (one transaction per chunk)
+CHUNK_ROWS = int(os.environ.get("INGEST_CHUNK_ROWS", "100000"))
+
+# Parsed chunks buffered between the reader and the COPY writer
+QUEUE_DEPTH = int(os.environ.get("INGEST_QUEUE_DEPTH", "4"))
+
+# Compressed text inputs, decompressed on the fly (.zst requires zstandard)
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+COLUMNS = ["symbol", "date", "open", "high", "low", "close", "volume"]
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
 def get_db_connection():
     """Connect to the Postgres database."""
     # Assuming standard Supabase/Postgres env vars
@@ -21,7 +34,7 @@ def get_db_connection():
     db_name = os.environ.get("POSTGRES_DB", "postgres")
     db_user = os.environ.get("POSTGRES_USER", "postgres")
     db_pass = os.environ.get("POSTGRES_PASSWORD", "postgres")
-    
+
     conn = psycopg2.connect(
         host=db_host,
         port=db_port,
@@ -31,37 +44,258 @@ def get_db_connection():
     )
     return conn
 
-def parse_csv_line(line: dict) -> tuple:
-    """Parse a CSV row into a tuple for insertion."""
-    # Expected keys: symbol, date, open, high, low, close, volume
-    # Adjust based on actual CSV format found in project
+def clean_numeric(values: pd.Series) -> pd.Series:
+    """Vectorized currency cleanup ("$1,234.50" -> 1234.5); unparseable values become NaN."""
+    if values.dtype == object:
+        values = values.str.replace(r"[$,\s]", "", regex=True)
+    return pd.to_numeric(values, errors="coerce")
+
+def clean_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize a raw chunk to the prices columns.
+
+    Column names are matched case-insensitively (Symbol/symbol, Date/date...).
+    Rows without a symbol or a parseable date are dropped; duplicate
+    (symbol, date) rows keep the last occurrence.
+    """
+    chunk = chunk.rename(columns=lambda name: str(name).strip().lower())
+    missing = [column for column in ("symbol", "date") if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing required columns: {missing}")
+
+    df = pd.DataFrame({
+        "symbol": chunk["symbol"].astype("string").str.strip(),
+        "date": pd.to_datetime(chunk["date"], errors="coerce").dt.date,
+    })
+    for column in PRICE_COLUMNS:
+        df[column] = clean_numeric(chunk[column]) if column in chunk.columns else float("nan")
+    volume = clean_numeric(chunk["volume"]) if "volume" in chunk.columns else pd.Series(0, index=chunk.index)
+    df["volume"] = volume.fillna(0).astype("int64")
+
+    df = df[df["symbol"].notna() & (df["symbol"] != "") & df["date"].notna()]
+    return df.drop_duplicates(subset=["symbol", "date"], keep="last")
+
+def input_format(path: Path):
+    """
+    Detect (format, compression) from the file name.
+
+    Supported: .csv, .ndjson/.jsonl (optionally .gz/.zst compressed) and .parquet.
+    """
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    compression = None
+    if suffixes and suffixes[-1] in COMPRESSIONS:
+        compression = COMPRESSIONS[suffixes.pop()]
+    suffix = suffixes[-1] if suffixes else ""
+
+    if suffix in (".parquet", ".pq") and compression is None:
+        return "parquet", None
+    if suffix in (".ndjson", ".jsonl"):
+        return "ndjson", compression
+    if suffix == ".csv":
+        return "csv", compression
+    raise ValueError(f"Unsupported input file: {path.name} (expected .csv, .ndjson, .jsonl or .parquet)")
+
+def iter_parquet_chunks(path: Path, chunk_rows: int, symbols=None, start=None, end=None):
+    """
+    Yield Parquet record batches as DataFrames.
+
+    Symbol and date filters are pushed down to the Parquet reader, so row
+    groups whose statistics rule them out are never decoded.
+    """
     try:
-        symbol = line.get('Symbol') or line.get('symbol')
-        date_str = line.get('Date') or line.get('date')
-        
-        # Helper to clean currency strings if needed "$100.00"
-        def clean_float(val):
-            if not val: return None
-            if isinstance(val, (int, float)): return val
-            return float(str(val).replace('$', '').replace(',', '').strip())
-
-        op = clean_float(line.get('Open') or line.get('open'))
-        hi = clean_float(line.get('High') or line.get('high'))
-        lo = clean_float(line.get('Low') or line.get('low'))
-        cl = clean_float(line.get('Close') or line.get('close'))
-        vol = int(clean_float(line.get('Volume') or line.get('volume')) or 0)
-        
-        return (symbol, date_str, op, hi, lo, cl, vol)
-    except Exception as e:
-        logger.warning(f"Error parsing line {line}: {e}")
-        return None
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ImportError("Parquet input requires pyarrow (pip install pyarrow)")
+
+    dataset = ds.dataset(str(path), format="parquet")
+    names = {name.lower(): name for name in dataset.schema.names}
+    predicate = None
+    if symbols and "symbol" in names:
+        predicate = ds.field(names["symbol"]).isin(symbols)
+    if "date" in names:
+        date_type = dataset.schema.field(names["date"]).type
+        for bound, op in ((start, "ge"), (end, "le")):
+            if bound is None:
+                continue
+            value = pd.Timestamp(bound)
+            if str(date_type) in ("string", "large_string"):
+                value = value.isoformat()[:10]
+            elif str(date_type).startswith("date"):
+                value = value.date()
+            else:
+                value = value.to_pydatetime()
+            expression = ds.field(names["date"]) >= value if op == "ge" else ds.field(names["date"]) <= value
+            predicate = expression if predicate is None else predicate & expression
+
+    for batch in dataset.to_batches(filter=predicate, batch_size=chunk_rows):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+def iter_chunks(path: Path, chunk_rows: int, skip_rows: int = 0, symbols=None, start=None, end=None):
+    """
+    Yield raw DataFrame chunks of the input file, skipping rows already ingested.
+
+    CSV and NDJSON files are streamed with pandas (gzip/zstd decompressed on
+    the fly); Parquet files are read batch by batch with filters pushed down.
+    """
+    fmt, compression = input_format(path)
+
+    if fmt == "csv":
+        reader = pd.read_csv(
+            path,
+            dtype=str,
+            chunksize=chunk_rows,
+            compression=compression,
+            skiprows=range(1, skip_rows + 1) if skip_rows else None,
+        )
+    elif fmt == "ndjson":
+        reader = pd.read_json(
+            path,
+            lines=True,
+            dtype=False,
+            chunksize=chunk_rows,
+            compression=compression,
+        )
+    else:
+        reader = iter_parquet_chunks(path, chunk_rows, symbols, start, end)
+
+    # NDJSON and Parquet readers cannot seek, so skip already ingested rows here
+    to_skip = skip_rows if fmt != "csv" else 0
+    for chunk in reader:
+        if to_skip:
+            dropped = min(to_skip, len(chunk))
+            chunk = chunk.iloc[dropped:]
+            to_skip -= dropped
+        if len(chunk):
+            yield chunk
 
-def ingest_data(file_path: str):
-    """Read CSV/JSON and bulk insert to DB."""
+def filter_chunk(df: pd.DataFrame, symbols=None, start=None, end=None) -> pd.DataFrame:
+    """Apply the symbol/date filters to a cleaned chunk (Parquet already pushed them down)."""
+    if symbols:
+        df = df[df["symbol"].isin(symbols)]
+    if start:
+        df = df[df["date"] >= pd.Timestamp(start).date()]
+    if end:
+        df = df[df["date"] <= pd.Timestamp(end).date()]
+    return df
+
+def ensure_progress_table(cur):
+    """Create the table that records committed chunks per input file."""
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS public.ingestion_progress (
+            file_key TEXT PRIMARY KEY,
+            rows_read BIGINT NOT NULL DEFAULT 0,
+            rows_written BIGINT NOT NULL DEFAULT 0,
+            chunks INTEGER NOT NULL DEFAULT 0,
+            completed BOOLEAN NOT NULL DEFAULT FALSE,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+
+def file_key(path: Path, symbols=None, start=None, end=None) -> str:
+    """Identify an input file (path, size, modification time) and the filters applied to it."""
+    stat = path.stat()
+    key = f"{path.resolve()}:{stat.st_size}:{int(stat.st_mtime)}"
+    if symbols or start or end:
+        key += f":{','.join(sorted(symbols or []))}:{start or ''}:{end or ''}"
+    return key
+
+class CopyWriter(threading.Thread):
+    """
+    Single writer thread: COPYs each parsed chunk into a staging table, upserts
+    it into public.prices and records progress, all in one transaction per chunk.
+    """
+
+    def __init__(self, conn, key: str, chunks: queue.Queue):
+        super().__init__(name="copy-writer", daemon=True)
+        self.conn = conn
+        self.key = key
+        self.chunks = chunks
+        self.rows_written = 0
+        self.error = None
+
+    def run(self):
+        cur = self.conn.cursor()
+        cur.execute("""
+            CREATE TEMP TABLE prices_staging
+            (LIKE public.prices INCLUDING DEFAULTS)
+            ON COMMIT DELETE ROWS
+        """)
+        self.conn.commit()
+
+        while True:
+            item = self.chunks.get()
+            if item is None:
+                break
+            if self.error:
+                # Keep draining so the reader never blocks on a full queue
+                continue
+
+            index, rows_read, df = item
+            try:
+                buffer = io.StringIO()
+                df.to_csv(buffer, index=False, header=False, columns=COLUMNS)
+                buffer.seek(0)
+                cur.copy_expert(
+                    f"COPY prices_staging ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+                cur.execute("""
+                    INSERT INTO public.prices (symbol, date, open, high, low, close, volume)
+                    SELECT symbol, date, open, high, low, close, volume FROM prices_staging
+                    ON CONFLICT (symbol, date) DO UPDATE
+                    SET open = EXCLUDED.open,
+                        high = EXCLUDED.high,
+                        low = EXCLUDED.low,
+                        close = EXCLUDED.close,
+                        volume = EXCLUDED.volume
+                """)
+                cur.execute("""
+                    INSERT INTO public.ingestion_progress (file_key, rows_read, rows_written, chunks)
+                    VALUES (%s, %s, %s, 1)
+                    ON CONFLICT (file_key) DO UPDATE
+                    SET rows_read = ingestion_progress.rows_read + EXCLUDED.rows_read,
+                        rows_written = ingestion_progress.rows_written + EXCLUDED.rows_written,
+                        chunks = ingestion_progress.chunks + 1,
+                        updated_at = NOW()
+                """, (self.key, rows_read, len(df)))
+                self.conn.commit()
+                self.rows_written += len(df)
+                logger.info(f"Committed chunk {index} ({len(df)} rows, {self.rows_written} written this run)")
+            except Exception as e:
+                self.conn.rollback()
+                self.error = e
+                logger.error(f"Chunk {index} failed, stopping (rerun to resume): {e}")
+        cur.close()
+
+def ingest_data(
+    file_path: str,
+    chunk_rows: int = CHUNK_ROWS,
+    restart: bool = False,
+    symbols=None,
+    start=None,
+    end=None
+):
+    """
+    Stream a CSV, NDJSON or Parquet file into public.prices.
+
+    Optional symbol and date (inclusive) filters limit what is loaded; for
+    Parquet they are pushed down to the reader. The file is read in chunks of `chunk_rows`, cleaned with vectorized pandas
+    operations and handed through a bounded queue to a COPY writer, so memory
+    stays constant regardless of file size. Every chunk commits together with
+    its progress record; rerunning the same file resumes after the last
+    committed chunk.
+    """
     path = Path(file_path)
     if not path.exists():
         logger.error(f"File not found: {file_path}")
         return
+    try:
+        fmt, compression = input_format(path)
+    except ValueError as e:
+        logger.error(str(e))
+        return
+    symbols = [symbol.upper() for symbol in symbols] if symbols else None
 
     logger.info(f"Connecting to database...")
     try:
@@ -72,50 +306,78 @@ def ingest_data(file_path: str):
         logger.info("Ensure the Docker stack is running (docker compose up -d)")
         return
 
-    logger.info(f"Reading file {file_path}...")
-    
-    rows_to_insert = []
-    
-    # Very basic CSV support
-    if path.suffix.lower() == '.csv':
-        with open(path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                parsed = parse_csv_line(row)
-                if parsed:
-                    rows_to_insert.append(parsed)
-    
-    if not rows_to_insert:
-        logger.warning("No valid rows found to insert.")
+    key = file_key(path, symbols, start, end)
+    ensure_progress_table(cur)
+    if restart:
+        cur.execute("DELETE FROM public.ingestion_progress WHERE file_key = %s", (key,))
+    cur.execute(
+        "SELECT rows_read, chunks, completed FROM public.ingestion_progress WHERE file_key = %s",
+        (key,)
+    )
+    progress = cur.fetchone()
+    conn.commit()
+    cur.close()
+
+    rows_done, chunks_done, completed = progress or (0, 0, False)
+    if completed:
+        logger.info(f"{file_path} was already ingested completely (use --restart to load it again)")
+        conn.close()
         return
+    if rows_done:
+        logger.info(f"Resuming {file_path} after {rows_done} rows ({chunks_done} chunks committed)")
 
-    logger.info(f"Inserting {len(rows_to_insert)} rows...")
-    
-    insert_query = """
-    INSERT INTO public.prices (symbol, date, open, high, low, close, volume)
-    VALUES %s
-    ON CONFLICT (symbol, date) DO UPDATE 
-    SET open = EXCLUDED.open,
-        high = EXCLUDED.high,
-        low = EXCLUDED.low,
-        close = EXCLUDED.close,
-        volume = EXCLUDED.volume;
-    """
-    
+    logger.info(f"Streaming {file_path} ({fmt}{', ' + compression if compression else ''}) in chunks of {chunk_rows} rows...")
+    chunks = queue.Queue(maxsize=QUEUE_DEPTH)
+    writer = CopyWriter(conn, key, chunks)
+    writer.start()
+
+    started = time.perf_counter()
+    rows_read = 0
     try:
-        execute_values(cur, insert_query, rows_to_insert)
-        conn.commit()
-        logger.info("Ingestion successful.")
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Error during bulk insert: {e}")
+        raw_chunks = iter_chunks(path, chunk_rows, rows_done, symbols, start, end)
+        for index, raw in enumerate(raw_chunks, start=chunks_done + 1):
+            if writer.error:
+                break
+            df = filter_chunk(clean_chunk(raw), symbols, start, end)
+            chunks.put((index, len(raw), df))
+            rows_read += len(raw)
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Parsed chunk {index}: {len(df)}/{len(raw)} valid rows, "
+                f"{rows_read / elapsed if elapsed else 0:,.0f} rows/s"
+            )
     finally:
-        cur.close()
+        chunks.put(None)
+        writer.join()
+
+    elapsed = time.perf_counter() - started
+    if writer.error:
+        logger.error(f"Ingestion stopped after {writer.rows_written} rows; rerun to resume from the last committed chunk")
         conn.close()
+        return
+
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE public.ingestion_progress SET completed = TRUE, updated_at = NOW() WHERE file_key = %s",
+        (key,)
+    )
+    conn.commit()
+    cur.close()
+    conn.close()
+    logger.info(
+        f"Ingestion successful: {writer.rows_written} rows in {elapsed:.1f}s "
+        f"({writer.rows_written / elapsed if elapsed else 0:,.0f} rows/s)"
+    )
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Bulk Data Ingestion")
-    parser.add_argument("file", help="Path to CSV file containing market data")
+    parser.add_argument("file", help="Market data file: .csv, .ndjson/.jsonl (optionally .gz/.zst) or .parquet")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="Rows per chunk/transaction")
+    parser.add_argument("--restart", action="store_true", help="Ignore saved progress and load the whole file")
+    parser.add_argument("--symbols", help="Only load these symbols (comma separated)")
+    parser.add_argument("--start", help="Only load rows on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Only load rows on or before this date (YYYY-MM-DD)")
     args = parser.parse_args()
-    
-    ingest_data(args.file)
+
+    symbols = [symbol.strip() for symbol in args.symbols.split(",") if symbol.strip()] if args.symbols else None
+    ingest_data(args.file, args.chunk_rows, args.restart, symbols, args.start, args.end)
@@ -1,4 +1,4 @@
-import { DataQuality, DataQualityIssue } from '@/lib/api';
+import { DataQuality, DataQualityIssue, issueCount } from '@/lib/api';
 import { useState } from 'react';
 
 interface DataQualityPanelProps {
@@ -33,14 +33,24 @@ export function DataQualityPanel({ quality, ticker, onClose }: DataQualityPanelP
     }
   };
 
+  // Record range covered by a run of consecutive records
+  const getRunLabel = (issue: DataQualityIssue) => {
+    const { record_index, end_index, issues, truncated } = issue.details;
+    if (end_index === undefined || end_index === record_index) return null;
+    return `${truncated ? 'Up to ' : ''}records ${record_index}–${end_index} · ${issues} issues`;
+  };
+
   const renderIssueGroup = (issues: DataQualityIssue[], title: string, severity: string) => {
     if (issues.length === 0) return null;
 
+    // Runs stand for several issues; count those so the total matches the summary
+    const total = issues.reduce((sum, issue) => sum + issueCount(issue), 0);
+
     return (
       <div className="mb-6">
         <h3 className="text-lg font-semibold mb-3 flex items-center gap-2">
           {getSeverityIcon(severity)}
-          {title} ({issues.length})
+          {title} ({total})
         </h3>
         <div className="space-y-2">
           {issues.map((issue, idx) => (
@@ -56,6 +66,9 @@ export function DataQualityPanel({ quality, ticker, onClose }: DataQualityPanelP
                   <div className="flex-1">
                     <p className="font-semibold text-sm">{issue.category.replace(/_/g, ' ').toUpperCase()}</p>
                     <p className="text-sm mt-1">{issue.message}</p>
+                    {getRunLabel(issue) && (
+                      <p className="text-xs mt-1 opacity-75">{getRunLabel(issue)}</p>
+                    )}
                   </div>
                   <button className="ml-2 text-xs px-2 py-1 rounded bg-white bg-opacity-50">
                     {expandedIssue === idx ? '▼' : '▶'}
@@ -65,10 +78,25 @@ export function DataQualityPanel({ quality, ticker, onClose }: DataQualityPanelP
 
               {expandedIssue === idx && (
                 <div className="px-3 pb-3 pt-2 bg-white bg-opacity-30 border-t border-current border-opacity-20">
-                  <p className="text-xs font-semibold mb-2">Details:</p>
-                  <pre className="text-xs bg-white bg-opacity-50 p-2 rounded overflow-x-auto">
-                    {JSON.stringify(issue.details, null, 2)}
-                  </pre>
+                  {issue.details.samples ? (
+                    <>
+                      <p className="text-xs font-semibold mb-2">
+                        Sample records ({issue.details.samples.length} of {issue.details.issues}):
+                      </p>
+                      {issue.details.samples.map((sample, sampleIdx) => (
+                        <pre key={sampleIdx} className="text-xs bg-white bg-opacity-50 p-2 rounded overflow-x-auto mb-2">
+                          {JSON.stringify(sample, null, 2)}
+                        </pre>
+                      ))}
+                    </>
+                  ) : (
+                    <>
+                      <p className="text-xs font-semibold mb-2">Details:</p>
+                      <pre className="text-xs bg-white bg-opacity-50 p-2 rounded overflow-x-auto">
+                        {JSON.stringify(issue.details, null, 2)}
+                      </pre>
+                    </>
+                  )}
                   <p className="text-xs mt-2 opacity-75">
                     Detected at: {new Date(issue.timestamp).toLocaleString()}
                   </p>
@@ -9,14 +9,33 @@ export interface StockData {
   volume: number;
 }
 
+// Per-record issues arrive merged into runs of consecutive records:
+// record_index..end_index with the number of issues and a few sample details.
+// A truncated entry sums up the runs beyond the per-category cap.
+export interface DataQualityIssueDetails {
+  record_index?: number;
+  end_index?: number;
+  records?: number;
+  issues?: number;
+  samples?: Record<string, any>[];
+  runs?: number;
+  truncated?: boolean;
+  [key: string]: any;
+}
+
 export interface DataQualityIssue {
   severity: string;
   category: string;
   message: string;
-  details: Record<string, any>;
+  details: DataQualityIssueDetails;
   timestamp: string;
 }
 
+// Number of underlying issues an entry stands for (1 unless it is a run)
+export function issueCount(issue: DataQualityIssue): number {
+  return issue.details.issues ?? 1;
+}
+
 export interface DataQuality {
   is_valid: boolean;
   total_issues: number;